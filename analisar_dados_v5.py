@@ -13,8 +13,19 @@ import seaborn as sns
 import jinja2
 import base64
 from io import BytesIO
+import sys
+
+# Módulos compartilhados de leitura ficam em app/
+sys.path.append(str(Path(__file__).parent / 'app'))
+from carregador_planilhas import obter_carregador
+from base_contratos import BaseContratos
+from vocabulario_status import contar_status, status_categorico
 
 class AnalisadorInteligente:
+    # Colunas lidas de cada aba (nomes canônicos de config/colunas_config.json ou literais).
+    # Hora e tipo são localizados por substring em identificar_melhores_praticas.
+    COLUNAS_LEITURA = ['SITUACAO', 'STATUS', 'DATA', 'TEMPO_PROCESSAMENTO', '*HORA*', '*TIPO*', '*CATEGORIA*']
+    
     def __init__(self):
         self.diretorios = [
             Path('F:/okok/data'),
@@ -49,6 +60,9 @@ class AnalisadorInteligente:
         self.horas_trabalho = 8
         
         self.modelos = {}
+        
+        # Registros de todos os grupos em uma única tabela compacta
+        self.base_contratos = BaseContratos()
         warnings.filterwarnings('ignore')
         
     def calcular_metricas_avancadas(self, dados_grupos):
@@ -195,13 +209,8 @@ class AnalisadorInteligente:
                 recomendacoes.append(f"Implementar processo de acompanhamento diário para reduzir tempo médio de {tempo_medio:.1f} dias")
         
         # 5. Recomendações baseadas em padrões de dados
-        todos_dados = pd.DataFrame()
-        for grupo, dados in dados_grupos.items():
-            for colaborador, df in dados['colaboradores'].items():
-                if not df.empty:
-                    df['GRUPO'] = grupo
-                    df['COLABORADOR'] = colaborador
-                    todos_dados = pd.concat([todos_dados, df])
+        # (a base já tem os registros de todos os colaboradores, com GRUPO e COLABORADOR)
+        todos_dados = self.base_contratos.registros(grupo=list(dados_grupos))
         
         if not todos_dados.empty:
             # Verificar horários mais produtivos
@@ -538,20 +547,16 @@ class AnalisadorInteligente:
             
             print(f"\nCarregando dados do grupo {grupo}...")
             try:
-                xls = pd.ExcelFile(caminho)
-                abas = [aba for aba in xls.sheet_names if aba not in ["TESTE", "RELATÓRIO GERAL"]]
+                # Arquivo aberto uma única vez para todas as abas
+                carregador = obter_carregador(caminho)
+                abas = carregador.abas_colaboradores(ignorar=["TESTE", "RELATÓRIO GERAL"])
                 
-                dados_colaboradores = {}
                 metricas_colaboradores = {}
                 
                 # Processamento das abas
                 for aba in abas:
                     try:
-                        df = pd.read_excel(
-                            caminho, 
-                            sheet_name=aba,
-                            parse_dates=True
-                        )
+                        df = carregador.ler_aba(aba, self.COLUNAS_LEITURA)
                         
                         if df.empty:
                             continue
@@ -564,27 +569,17 @@ class AnalisadorInteligente:
                         
                         if col_status:
                             df = df.rename(columns={col_status: 'STATUS'})
-                            df['STATUS'] = df['STATUS'].fillna('PENDENTE').str.upper().str.strip()
                             
-                            # Mapear status
-                            mapeamento_status = {
-                                'VERIFICADO': 'VERIFICADO',
-                                'ANÁLISE': 'ANÁLISE',
-                                'ANALISE': 'ANÁLISE',
-                                'PENDENTE': 'PENDENTE',
-                                'APROVADO': 'APROVADO',
-                                'QUITADO': 'QUITADO',
-                                'CANCELADO': 'CANCELADO'
-                            }
-                            df['STATUS'] = df['STATUS'].map(lambda x: mapeamento_status.get(x, x))
+                            # Normalizar status (acentos, ANALISE/ANÁLISE, variações) pelos valores distintos
+                            df['STATUS'] = status_categorico(df['STATUS'].fillna('PENDENTE'))
                             
                             # Adicionar data de processamento
                             df['DIA'] = pd.to_datetime('today').date()
                             
-                            dados_colaboradores[aba] = df
+                            self.base_contratos.adicionar(grupo, aba, df)
                             
                             # Calcular métricas básicas
-                            status_counts = df['STATUS'].value_counts().to_dict()
+                            status_counts = self.contar_status_especificos(df)
                             
                             # Calcular métricas diárias
                             metricas_diarias = {
@@ -616,7 +611,8 @@ class AnalisadorInteligente:
                         continue
                 
                 dados_grupos[grupo] = {
-                    'colaboradores': dados_colaboradores,
+                    # Registros consultados na base, sem uma cópia por aba
+                    'colaboradores': self.base_contratos.visao(grupo),
                     'metricas': metricas_colaboradores
                 }
                 
@@ -626,6 +622,12 @@ class AnalisadorInteligente:
         
         return dados_grupos
 
+    def contar_status_especificos(self, df):
+        """Contagem de registros por status normalizado (maior contagem primeiro)"""
+        if 'STATUS' not in df.columns:
+            return {}
+        return contar_status(df['STATUS'])
+    
     def normalizar_valor(self, valor):
         if isinstance(valor, (int, float)):
             return str(valor)
@@ -41,19 +41,19 @@ class AnalisadorAvancado:
                 continue
                 
             # Eficiência
-            if 'taxa_eficiencia' in metricas:
+            if metricas.get('taxa_eficiencia') is not None:
                 self.tendencias['eficiencia'][nome] = metricas['taxa_eficiencia'] * 100
                 
             # Volume
-            if 'total_registros' in metricas:
+            if metricas.get('total_registros') is not None:
                 self.tendencias['volume'][nome] = metricas['total_registros']
                 
             # Tempo de resolução
-            if 'tempo_medio_resolucao' in metricas:
+            if metricas.get('tempo_medio_resolucao') is not None:
                 self.tendencias['tempo_resolucao'][nome] = metricas['tempo_medio_resolucao']
         
         # Calcular médias e medianas
-        for metrica, dados in self.tendencias.items():
+        for metrica, dados in list(self.tendencias.items()):
             if dados:
                 valores = list(dados.values())
                 self.tendencias[f'{metrica}_media'] = np.mean(valores)
@@ -86,9 +86,9 @@ class AnalisadorAvancado:
         todas_metricas.update(self.metricas_leandro)
         
         # Calcular limiares
-        tempos = [m.get('tempo_medio_resolucao', 0) for m in todas_metricas.values() if m and 'tempo_medio_resolucao' in m]
-        eficiencias = [m.get('taxa_eficiencia', 0) for m in todas_metricas.values() if m and 'taxa_eficiencia' in m]
-        volumes = [m.get('total_registros', 0) for m in todas_metricas.values() if m and 'total_registros' in m]
+        tempos = [m.get('tempo_medio_resolucao', 0) for m in todas_metricas.values() if m and m.get('tempo_medio_resolucao') is not None]
+        eficiencias = [m.get('taxa_eficiencia', 0) for m in todas_metricas.values() if m and m.get('taxa_eficiencia') is not None]
+        volumes = [m.get('total_registros', 0) for m in todas_metricas.values() if m and m.get('total_registros') is not None]
         
         if tempos:
             limiar_tempo = np.percentile(tempos, 75)  # 75º percentil
@@ -111,7 +111,7 @@ class AnalisadorAvancado:
                 continue
                 
             # Tempo de resolução alto
-            if 'tempo_medio_resolucao' in metricas and metricas['tempo_medio_resolucao'] > limiar_tempo:
+            if metricas.get('tempo_medio_resolucao') is not None and metricas['tempo_medio_resolucao'] > limiar_tempo:
                 self.gargalos['tempo_resolucao'].append({
                     'nome': nome,
                     'valor': metricas['tempo_medio_resolucao'],
@@ -119,7 +119,7 @@ class AnalisadorAvancado:
                 })
                 
             # Eficiência baixa
-            if 'taxa_eficiencia' in metricas and metricas['taxa_eficiencia'] < limiar_eficiencia:
+            if metricas.get('taxa_eficiencia') is not None and metricas['taxa_eficiencia'] < limiar_eficiencia:
                 self.gargalos['eficiencia_baixa'].append({
                     'nome': nome,
                     'valor': metricas['taxa_eficiencia'] * 100,  # percentual
@@ -127,7 +127,7 @@ class AnalisadorAvancado:
                 })
                 
             # Volume alto
-            if 'total_registros' in metricas and metricas['total_registros'] > limiar_volume:
+            if metricas.get('total_registros') is not None and metricas['total_registros'] > limiar_volume:
                 self.gargalos['volume_alto'].append({
                     'nome': nome,
                     'valor': metricas['total_registros'],
@@ -176,7 +176,7 @@ class AnalisadorAvancado:
                 }
                 
             # Eficiência projetada
-            if 'taxa_eficiencia' in metricas and 'tendencia' in metricas:
+            if metricas.get('taxa_eficiencia') is not None and 'tendencia' in metricas:
                 eficiencia_atual = metricas['taxa_eficiencia']
                 
                 # Ajuste baseado na tendência
@@ -197,11 +197,11 @@ class AnalisadorAvancado:
                 }
                 
             # Tempo de resolução projetado
-            if 'tempo_medio_resolucao' in metricas:
+            if metricas.get('tempo_medio_resolucao') is not None:
                 tempo_atual = metricas['tempo_medio_resolucao']
                 
                 # Ajuste baseado na eficiência
-                if 'taxa_eficiencia' in metricas:
+                if metricas.get('taxa_eficiencia') is not None:
                     eficiencia = metricas['taxa_eficiencia']
                     
                     if eficiencia > 0.25:  # alta eficiência
@@ -459,6 +459,25 @@ class AnalisadorAvancado:
         """
         return html
     
+    def atualizar_metricas(self, grupo, metricas_alteradas, removidos=()):
+        """
+        Incorpora métricas recalculadas de alguns colaboradores de um grupo,
+        mantendo as dos demais, e recalcula os agregados (tendências, gargalos
+        e previsões), que são derivados do conjunto completo.
+        """
+        metricas_grupo = {'julio': self.metricas_julio, 'leandro': self.metricas_leandro}.get(grupo.lower())
+        if metricas_grupo is None:
+            raise ValueError(f"Grupo desconhecido: {grupo}")
+
+        for nome in removidos:
+            metricas_grupo.pop(nome, None)
+        metricas_grupo.update(metricas_alteradas or {})
+        self.ultima_analise = datetime.now()
+
+        self.analisar_tendencias()
+        self.identificar_gargalos()
+        self.gerar_previsoes()
+
     def analisar_dados(self, metricas_julio, metricas_leandro):
         """Executa a análise completa dos dados"""
         self.metricas_julio = metricas_julio or {}
@@ -8,6 +8,11 @@ from dataclasses import dataclass
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 from collections import defaultdict
+import sys
+
+# Módulos compartilhados ficam em app/
+sys.path.append(str(Path(__file__).parent / 'app'))
+from vocabulario_status import contar_status, status_categorico
 
 @dataclass
 class ResultadoColaborador:
@@ -79,19 +84,18 @@ class AnalisadorResultados:
             if not coluna_situacao or not coluna_resolucao:
                 raise ValueError(f"Colunas necessárias não encontradas. Disponíveis: {list(dados.columns)}")
             
-            # Limpar e padronizar dados
-            dados[coluna_situacao] = dados[coluna_situacao].astype(str).str.strip().str.upper()
+            # Limpar e padronizar dados (vocabulário de status, uma busca por valor distinto)
+            dados[coluna_situacao] = status_categorico(dados[coluna_situacao])
             
             # Tratar datas
             dados[coluna_resolucao] = dados[coluna_resolucao].apply(self.converter_data_excel)
             
             # Obter contagem de status
-            status_counts = dados[coluna_situacao].value_counts()
+            status_counts = contar_status(dados[coluna_situacao])
             
             # Métricas básicas
             metricas = defaultdict(int)
-            for status in status_counts.index:
-                metricas[status] = int(status_counts[status])
+            metricas.update(status_counts)
             
             total = sum(metricas.values())
             metricas['TOTAL'] = total
@@ -7,8 +7,12 @@ from datetime import datetime
 from pathlib import Path
 import warnings
 from typing import Dict, List, Any
+from carregador_planilhas import obter_carregador
 
 class AnalisadorEficiencia:
+    # Colunas lidas de cada aba (nomes canônicos de config/colunas_config.json -> dtype)
+    COLUNAS_LEITURA = {'DATA': None, 'RESOLUCAO': None, 'SITUACAO': 'category'}
+    
     def __init__(self):
         # Configurar logging
         self.setup_logging()
@@ -292,15 +296,12 @@ class AnalisadorEficiencia:
                 'status': 'sucesso'
             }
             
-            xls = pd.ExcelFile(arquivo)
+            carregador = obter_carregador(arquivo)
             colaboradores = []
             
-            for aba in xls.sheet_names:
-                if aba in ['RELATÓRIO GERAL', 'TESTE', 'RESUMO']:
-                    continue
-                    
+            for aba in carregador.abas_colaboradores(ignorar=['RELATÓRIO GERAL', 'TESTE', 'RESUMO']):
                 try:
-                    dados = pd.read_excel(arquivo, sheet_name=aba)
+                    dados = carregador.ler_aba(aba, self.COLUNAS_LEITURA)
                     
                     if not dados.empty:
                         metricas_avancadas = self.calcular_metricas_avancadas(dados)
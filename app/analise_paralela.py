@@ -12,31 +12,42 @@ import os
 import pandas as pd
 import numpy as np
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 from collections import defaultdict, Counter
 import traceback
 
 # Importações locais
 from debug_excel import AnalisadorExcel
+from carregador_planilhas import limpar_carregadores, obter_carregador
+from graficos_situacao import dados_grafico_situacao, renderizar_graficos_resultados
+from transicoes import analisar_transicoes, combinar_matrizes, transicoes_mais_comuns
+from vocabulario_status import STATUS_CANONICOS, contar_status, status_categorico
 from analise_360 import Analise360
 from data_analysis_pipeline import DataAnalysisPipeline
 
-def analisar_situacao_colaborador(nome_arquivo, nome_aba):
+# Versão do resultado de analisar_situacao_colaborador. Incrementar sempre que
+# o cálculo mudar, para descartar as métricas gravadas (ver metricas_incrementais)
+# 2: status comparados com o vocabulário canônico (vocabulario_status)
+VERSAO_ANALISE_SITUACAO = 2
+
+def analisar_situacao_colaborador(nome_arquivo, nome_aba, df=None):
     """
     Analisa a qualidade dos registros na coluna SITUAÇÃO para um colaborador específico.
     
     Args:
         nome_arquivo (str): Caminho para o arquivo Excel
         nome_aba (str): Nome da aba/colaborador a ser analisada
+        df (DataFrame, optional): Dados da aba já carregados. Se não informado,
+            a aba é lida pelo carregador compartilhado do arquivo.
         
     Returns:
         dict: Dicionário com métricas de qualidade dos registros
     """
     try:
         # Carregar dados do colaborador
-        df = pd.read_excel(nome_arquivo, sheet_name=nome_aba)
+        if df is None:
+            df = obter_carregador(nome_arquivo).ler_aba(nome_aba)
         
         # Normalizar nomes das colunas
         colunas_normalizadas = []
@@ -61,11 +72,13 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
         total_registros = len(df)
         registros_vazios = df['SITUACAO'].isna().sum()
         valores_unicos = df['SITUACAO'].dropna().unique()
-        contagem_valores = df['SITUACAO'].value_counts().to_dict()
         
-        # Verificar padrões de preenchimento
-        valores_padronizados = ['PENDENTE', 'VERIFICADO', 'APROVADO', 'QUITADO', 'CANCELADO', 'EM ANÁLISE']
-        valores_nao_padronizados = [v for v in valores_unicos if v not in valores_padronizados]
+        # Verificar padrões de preenchimento: só a grafia do vocabulário é padronizada
+        valores_nao_padronizados = [v for v in valores_unicos if v not in STATUS_CANONICOS]
+        
+        # Contagens e transições usam a situação normalizada (variações de grafia juntas)
+        df['SITUACAO'] = status_categorico(df['SITUACAO'])
+        contagem_valores = contar_status(df['SITUACAO'])
         
         # Verificar se há atualizações diárias
         tem_data = False
@@ -107,68 +120,18 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             0.3 * consistencia_diaria   # 30% para consistência diária
         ) * 100
         
-        # Análise de transições de estado (se houver coluna de data)
-        analise_transicoes = {}
-        if tem_data and coluna_data and not df[coluna_data].isna().all():
-            # Ordenar por data
-            df_ordenado = df.sort_values(by=coluna_data)
-            
-            # Verificar transições de estado
-            if 'SITUACAO' in df_ordenado.columns and len(df_ordenado) > 1:
-                transicoes = []
-                situacao_anterior = None
-                
-                for idx, row in df_ordenado.iterrows():
-                    situacao_atual = row['SITUACAO']
-                    if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
-                        transicoes.append((situacao_anterior, situacao_atual))
-                    situacao_anterior = situacao_atual
-                
-                # Contar transições
-                contagem_transicoes = Counter(transicoes)
-                analise_transicoes = {f"{de} -> {para}": contagem for (de, para), contagem in contagem_transicoes.items()}
-        
-        # Análise de tempo médio em cada situação
+        # Transições de estado e tempo em cada situação (se houver coluna de data),
+        # calculados juntos sobre uma única ordenação por data
+        transicoes = None
         tempos_medios = {}
         if tem_data and coluna_data and not df[coluna_data].isna().all():
-            # Agrupar por situação e calcular tempo médio
-            df_ordenado = df.sort_values(by=coluna_data)
-            df_ordenado['data_anterior'] = df_ordenado[coluna_data].shift(1)
-            df_ordenado['tempo_no_estado'] = (df_ordenado[coluna_data] - df_ordenado['data_anterior']).dt.days
-            
-            # Calcular tempo médio por situação
-            tempos_por_situacao = df_ordenado.groupby('SITUACAO')['tempo_no_estado'].mean()
-            tempos_medios = tempos_por_situacao.to_dict()
+            analise = analisar_transicoes(df, coluna_data)
+            transicoes = analise.compacta()
+            tempos_medios = analise.tempos_medios()
         
-        # Gerar visualização da distribuição de situações
-        grafico_path = None
-        try:
-            if contagem_valores:
-                plt.figure(figsize=(10, 6))
-                sns.barplot(x=list(contagem_valores.keys()), y=list(contagem_valores.values()))
-                plt.title(f'Distribuição de Situações - {nome_aba}')
-                plt.xlabel('Situação')
-                plt.ylabel('Quantidade')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                
-                # Salvar gráfico
-                diretorio_graficos = 'graficos_situacao'
-                if not os.path.exists(diretorio_graficos):
-                    try:
-                        os.makedirs(diretorio_graficos)
-                    except FileExistsError:
-                        # Diretório já existe, podemos continuar
-                        pass
-                
-                # Garantir que o nome do arquivo seja único
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                nome_arquivo_grafico = f'situacao_{nome_aba.replace(" ", "_")}_{timestamp}.png'
-                grafico_path = os.path.join(diretorio_graficos, nome_arquivo_grafico)
-                plt.savefig(grafico_path)
-                plt.close()
-        except Exception as e:
-            print(f"Erro ao gerar gráfico para {nome_aba}: {str(e)}")
+        # Só os dados do gráfico: a renderização é feita depois, em lote
+        # (ver renderizar_graficos_resultados), fora dos processos de análise
+        grafico = dados_grafico_situacao(nome_aba, contagem_valores)
         
         # Identificar problemas e sugestões
         problemas = []
@@ -179,8 +142,8 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             sugestoes.append("Preencher todos os campos de SITUACAO")
             
         if valores_nao_padronizados:
-            problemas.append(f"{len(valores_nao_padronizados)} valores não padronizados: {', '.join(valores_nao_padronizados)}")
-            sugestoes.append("Padronizar valores de SITUACAO para: PENDENTE, VERIFICADO, APROVADO, QUITADO, CANCELADO, EM ANÁLISE")
+            problemas.append(f"{len(valores_nao_padronizados)} valores não padronizados: {', '.join(map(str, valores_nao_padronizados))}")
+            sugestoes.append(f"Padronizar valores de SITUACAO para: {', '.join(STATUS_CANONICOS)}")
             
         if not tem_data:
             problemas.append("Não há coluna de DATA para análise temporal")
@@ -202,9 +165,10 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             'atualizacoes_diarias': atualizacoes_diarias,
             'consistencia_diaria': consistencia_diaria * 100,
             'score_qualidade': score_qualidade,
-            'analise_transicoes': analise_transicoes,
+            'transicoes': transicoes,
             'tempos_medios': tempos_medios,
-            'grafico_path': grafico_path,
+            'grafico': grafico,
+            'grafico_path': None,
             'problemas': problemas,
             'sugestoes': sugestoes,
             'status': 'SUCESSO'
@@ -218,39 +182,121 @@ def analisar_situacao_colaborador(nome_arquivo, nome_aba):
             'status': 'FALHA'
         }
 
-def analisar_arquivo_paralelo(arquivos):
+# Abas de resumo que não são analisadas como colaboradores
+ABAS_NAO_COLABORADORES = ['resumo', 'índice', 'index', 'summary']
+
+
+def _analisar_aba_worker(arquivo, aba):
     """
-    Analisa os arquivos Excel em paralelo.
-    
-    Args:
-        arquivos (dict): Dicionário com os caminhos dos arquivos
-            {'julio': caminho_arquivo_julio, 'leandro': caminho_arquivo_leandro}
-    
-    Returns:
-        dict: Resultados da análise
+    Tarefa executada em um processo do pool.
+
+    Cada processo mantém o próprio carregador do arquivo (ver
+    ``obter_carregador``), então o workbook é aberto uma vez por processo e
+    reaproveitado para todas as abas que aquele processo receber.
     """
-    resultados = {}
-    
+    return analisar_situacao_colaborador(arquivo, aba)
+
+
+def _listar_tarefas(arquivos):
+    """Monta a lista ordenada de (chave, grupo, arquivo, aba) a analisar"""
+    tarefas = []
     for nome, arquivo in arquivos.items():
         print(f"Analisando arquivo: {os.path.basename(arquivo)}")
         try:
             if not os.path.exists(arquivo):
                 print(f"Arquivo não encontrado: {arquivo}")
                 continue
-                
-            xls = pd.ExcelFile(arquivo)
-            for sheet in xls.sheet_names:
-                if sheet.lower() not in ['resumo', 'índice', 'index', 'summary']:
-                    df = pd.read_excel(arquivo, sheet_name=sheet)
-                    resultados[f"{nome}_{sheet}"] = {
-                        'grupo': nome,
-                        'colaborador': sheet,
-                        'dados': analisar_situacao_colaborador(arquivo, sheet)
-                    }
-                    
+
+            carregador = obter_carregador(arquivo)
+            for sheet in carregador.abas_colaboradores(ignorar=ABAS_NAO_COLABORADORES):
+                tarefas.append((f"{nome}_{sheet}", nome, arquivo, sheet))
         except Exception as e:
             print(f"Erro ao analisar {arquivo}: {str(e)}")
             traceback.print_exc()
+    return tarefas
+
+
+def _executar_em_paralelo(tarefas, max_workers):
+    """
+    Distribui as abas entre processos e coleta os resultados com as_completed.
+
+    Retorna um dicionário {posição da tarefa: resultado}. Se o pool quebrar
+    (processo morto, ambiente sem suporte a multiprocessing), as tarefas que
+    ainda não terminaram ficam de fora e são refeitas sequencialmente.
+    """
+    concluidos = {}
+    # O pai abriu os arquivos para listar as abas. Com fork, os processos
+    # herdariam esses handles e leriam pelo mesmo offset de arquivo; fechando
+    # antes, cada processo abre o seu.
+    limpar_carregadores()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=limpar_carregadores) as executor:
+            futuros = {
+                executor.submit(_analisar_aba_worker, arquivo, sheet): posicao
+                for posicao, (_, _, arquivo, sheet) in enumerate(tarefas)
+            }
+            for futuro in as_completed(futuros):
+                posicao = futuros[futuro]
+                chave = tarefas[posicao][0]
+                try:
+                    concluidos[posicao] = futuro.result()
+                    print(f"Concluído: {chave} ({len(concluidos)}/{len(tarefas)})")
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    _, _, arquivo, sheet = tarefas[posicao]
+                    concluidos[posicao] = {
+                        'colaborador': sheet,
+                        'arquivo': arquivo,
+                        'erro': str(e),
+                        'status': 'FALHA'
+                    }
+    except (BrokenProcessPool, OSError, NotImplementedError) as e:
+        print(f"Execução paralela interrompida ({str(e)}), continuando sequencialmente")
+    return concluidos
+
+
+def analisar_arquivo_paralelo(arquivos, max_workers=None):
+    """
+    Analisa os arquivos Excel em paralelo.
+    
+    Cada aba (colaborador) de cada arquivo é uma tarefa independente enviada
+    para um ProcessPoolExecutor. Os resultados são devolvidos na ordem dos
+    arquivos e das abas, independentemente da ordem em que os processos
+    terminam.
+    
+    Args:
+        arquivos (dict): Dicionário com os caminhos dos arquivos
+            {'julio': caminho_arquivo_julio, 'leandro': caminho_arquivo_leandro}
+        max_workers (int, optional): Número de processos. Padrão: número de
+            CPUs. Com 1 (ou uma única aba) a análise roda sequencialmente no
+            processo atual.
+    
+    Returns:
+        dict: Resultados da análise
+    """
+    tarefas = _listar_tarefas(arquivos)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(tarefas)))
+
+    concluidos = {}
+    if max_workers > 1:
+        print(f"Analisando {len(tarefas)} abas com {max_workers} processos")
+        concluidos = _executar_em_paralelo(tarefas, max_workers)
+
+    # Execução sequencial: modo com 1 processo ou tarefas que o pool não concluiu
+    for posicao, (_, _, arquivo, sheet) in enumerate(tarefas):
+        if posicao not in concluidos:
+            concluidos[posicao] = analisar_situacao_colaborador(arquivo, sheet)
+
+    resultados = {}
+    for posicao, (chave, grupo, _, sheet) in enumerate(tarefas):
+        resultados[chave] = {
+            'grupo': grupo,
+            'colaborador': sheet,
+            'dados': concluidos[posicao]
+        }
     
     return resultados
 
@@ -275,7 +321,7 @@ def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
     colaboradores_com_problemas = 0
     todos_problemas = []
     todas_sugestoes = []
-    todas_transicoes = {}
+    matrizes_transicoes = []
     todos_tempos_medios = defaultdict(list)
     
     for nome, r in todos_resultados.items():
@@ -288,17 +334,20 @@ def gerar_relatorio_melhorias(resultados_julio, resultados_leandro):
             if r.get('sugestoes'):
                 todas_sugestoes.extend(r.get('sugestoes', []))
             
-            if r.get('analise_transicoes'):
-                for transicao, contagem in r.get('analise_transicoes', {}).items():
-                    if transicao in todas_transicoes:
-                        todas_transicoes[transicao] += contagem
-                    else:
-                        todas_transicoes[transicao] = contagem
+            if r.get('transicoes'):
+                matrizes_transicoes.append(r['transicoes'])
             
             if r.get('tempos_medios'):
                 for situacao, tempo in r.get('tempos_medios', {}).items():
                     todos_tempos_medios[situacao].append(tempo)
     
+    # Somar as matrizes de transição de todos os colaboradores
+    estados, contagens = combinar_matrizes(matrizes_transicoes)
+    todas_transicoes = {
+        f"{de} -> {para}": contagem
+        for de, para, contagem in transicoes_mais_comuns(estados, contagens)
+    }
+    
     # Contar problemas e sugestões
     contagem_problemas = Counter(todos_problemas)
     contagem_sugestoes = Counter(todas_sugestoes)
@@ -772,7 +821,7 @@ def gerar_relatorio_html(todos_resultados, colaboradores_validos, contagem_probl
         print(f"Erro ao gerar relatório HTML: {str(e)}")
         traceback.print_exc()
 
-def main():
+def main(max_workers=None):
     """Função principal para executar a análise em paralelo"""
     print("Iniciando análise paralela dos arquivos Excel...")
     
@@ -784,7 +833,10 @@ def main():
     resultados_julio = analisar_arquivo_paralelo({
         'julio': arquivo_julio,
         'leandro': arquivo_leandro
-    })
+    }, max_workers=max_workers)
+    
+    # Gráficos de todos os colaboradores em lote, depois da análise
+    renderizar_graficos_resultados(resultados_julio)
     
     # Gerar relatório de melhorias
     relatorio = gerar_relatorio_melhorias(resultados_julio, resultados_julio)
@@ -6,6 +6,7 @@ from datetime import datetime
 import logging
 from dataclasses import dataclass
 from collections import defaultdict
+from vocabulario_status import CODIGOS_STATUS, codificar_status, contagem_por_codigo
 
 @dataclass
 class ResultadoColaborador:
@@ -40,20 +41,14 @@ class AnalisadorResultados:
     def analisar_colaborador(self, dados: pd.DataFrame, nome: str) -> ResultadoColaborador:
         """Analisa resultados detalhados de um colaborador"""
         try:
-            # Obter contagem de status
-            status_counts = dados['SITUAÇÃO'].value_counts()
+            # Obter contagem de status (normalizados pelo vocabulário de status)
+            status_counts = contagem_por_codigo(codificar_status(dados['SITUAÇÃO']))
             
             # Métricas básicas
             metricas = {
-                'VERIFICADO': int(status_counts.get('VERIFICADO', 0)),
-                'ANÁLISE': int(status_counts.get('ANÁLISE', 0)),
-                'PENDENTE': int(status_counts.get('PENDENTE', 0)),
-                'PRIORIDADE': int(status_counts.get('PRIORIDADE', 0)),
-                'PRIORIDADE TOTAL': int(status_counts.get('PRIORIDADE TOTAL', 0)),
-                'APROVADO': int(status_counts.get('APROVADO', 0)),
-                'QUITADO': int(status_counts.get('QUITADO', 0)),
-                'APREENDIDO': int(status_counts.get('APREENDIDO', 0)),
-                'CANCELADO': int(status_counts.get('CANCELADO', 0))
+                status: int(status_counts[CODIGOS_STATUS[status]])
+                for status in ['VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE', 'PRIORIDADE TOTAL',
+                               'APROVADO', 'QUITADO', 'APREENDIDO', 'CANCELADO']
             }
             
             total = sum(metricas.values())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Base de Contratos
+=================
+Registros de todos os grupos e colaboradores em um único DataFrame compacto.
+
+Em vez de cada analisador guardar um dicionário de DataFrames por aba, com
+colunas de texto em ``object``, as abas são adicionadas a uma
+:class:`BaseContratos`, que guarda uma única tabela onde:
+
+- GRUPO, COLABORADOR, STATUS e as demais colunas de texto com poucos valores
+  distintos (banco, situação, tipo...) são categóricas;
+- colunas só com datas viram ``datetime64``;
+- contadores inteiros usam ``int32``.
+
+Os analisadores consultam a base (:meth:`BaseContratos.registros`,
+:meth:`BaseContratos.contagem_status`) ou usam :meth:`BaseContratos.visao`,
+que se comporta como o antigo ``{colaborador: DataFrame}`` de um grupo sem
+manter cópias.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUNA_GRUPO = 'GRUPO'
+COLUNA_COLABORADOR = 'COLABORADOR'
+
+# Colunas de texto viram categóricas quando os valores distintos não passam
+# desta fração das linhas
+LIMITE_CATEGORIAS = 0.5
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _compactar_coluna(serie: pd.Series) -> pd.Series:
+    """Converte uma coluna para o tipo mais compacto que não perde informação"""
+    if pd.api.types.is_integer_dtype(serie) and serie.dtype.itemsize > 4 and not pd.api.types.is_extension_array_dtype(serie):
+        if serie.empty or (serie.min() >= _INT32.min and serie.max() <= _INT32.max):
+            return serie.astype(np.int32)
+        return serie
+
+    if serie.dtype != object:
+        return serie
+
+    tipo = pd.api.types.infer_dtype(serie, skipna=True)
+    if tipo in ('datetime', 'datetime64', 'date'):
+        try:
+            return pd.to_datetime(serie)
+        except (ValueError, TypeError, OverflowError):
+            return serie
+    if tipo == 'empty':
+        return serie
+    if serie.nunique(dropna=True) <= max(1, len(serie) * LIMITE_CATEGORIAS):
+        try:
+            return serie.astype('category')
+        except TypeError:
+            return serie
+    return serie
+
+
+def compactar_registros(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cópia compacta dos registros de uma aba.
+
+    Args:
+        df (DataFrame): Registros lidos da planilha
+
+    Returns:
+        DataFrame: Mesmos valores, com colunas categóricas, datetime64 e int32
+    """
+    return pd.DataFrame({coluna: _compactar_coluna(df[coluna]) for coluna in df.columns}, index=df.index)
+
+
+def _valores_distintos(serie: pd.Series) -> np.ndarray:
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return np.asarray(serie.cat.categories, dtype=object)
+    return np.asarray(serie.dropna().unique(), dtype=object)
+
+
+def _concatenar(partes: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena as partes mantendo como categóricas as colunas categóricas"""
+    colunas: List[Any] = list(dict.fromkeys(c for parte in partes for c in parte.columns))
+    total = sum(len(parte) for parte in partes)
+
+    # Categorias unificadas: pd.concat de categóricas com categorias
+    # diferentes resultaria em object
+    categorias: Dict[Any, pd.Index] = {}
+    for coluna in colunas:
+        series = [parte[coluna] for parte in partes if coluna in parte.columns]
+        if not any(isinstance(s.dtype, pd.CategoricalDtype) for s in series):
+            continue
+        if not all(isinstance(s.dtype, pd.CategoricalDtype) or s.dtype == object for s in series):
+            continue
+        valores = pd.unique(np.concatenate([_valores_distintos(s) for s in series]))
+        if coluna in (COLUNA_GRUPO, COLUNA_COLABORADOR) or len(valores) <= max(1, total * LIMITE_CATEGORIAS):
+            categorias[coluna] = pd.Index(valores, dtype=object)
+
+    # Inteiros ausentes de alguma parte viram Int32 (com nulos) em vez de float
+    inteiras = [
+        coluna for coluna in colunas
+        if any(coluna not in parte.columns for parte in partes)
+        and all(pd.api.types.is_integer_dtype(parte[coluna]) for parte in partes if coluna in parte.columns)
+    ]
+
+    alinhadas = []
+    for parte in partes:
+        convertidas = {}
+        for coluna, valores in categorias.items():
+            serie = parte[coluna] if coluna in parte.columns else pd.Series(None, index=parte.index, dtype=object)
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                convertidas[coluna] = serie.cat.set_categories(valores)
+            else:
+                convertidas[coluna] = pd.Series(pd.Categorical(serie, categories=valores), index=parte.index)
+        for coluna in inteiras:
+            if coluna in parte.columns:
+                convertidas[coluna] = parte[coluna].astype('Int32')
+            else:
+                convertidas[coluna] = pd.Series(pd.NA, index=parte.index, dtype='Int32')
+        alinhadas.append(parte.assign(**convertidas) if convertidas else parte)
+
+    return pd.concat(alinhadas, ignore_index=True)[colunas]
+
+
+class BaseContratos:
+    """Tabela única com os registros de contratos de todos os colaboradores"""
+
+    def __init__(self):
+        # Abas adicionadas e ainda não consolidadas
+        self._partes: List[pd.DataFrame] = []
+        self._chaves_pendentes: List[Tuple[Any, Any]] = []
+        self._dados = _concatenar([_parte_vazia()])
+        # (grupo, colaborador) -> (início, fim) das linhas na tabela consolidada
+        self._intervalos: Dict[Tuple[Any, Any], Tuple[int, int]] = {}
+
+    def adicionar(self, grupo, colaborador, df: pd.DataFrame):
+        """
+        Adiciona (ou substitui) os registros de um colaborador.
+
+        Args:
+            grupo (str): Grupo do colaborador (ex.: 'julio')
+            colaborador (str): Nome do colaborador (aba)
+            df (DataFrame): Registros já normalizados; a base guarda uma cópia
+                compacta, então o DataFrame original pode ser descartado
+        """
+        chave = (grupo, colaborador)
+        if chave in self._intervalos or chave in self._chaves_pendentes:
+            self.remover(grupo, colaborador)
+
+        parte = compactar_registros(df.drop(columns=[COLUNA_GRUPO, COLUNA_COLABORADOR], errors='ignore'))
+        parte = parte.reset_index(drop=True)
+        parte.insert(0, COLUNA_COLABORADOR, pd.Categorical([colaborador] * len(parte)))
+        parte.insert(0, COLUNA_GRUPO, pd.Categorical([grupo] * len(parte)))
+        self._partes.append(parte)
+        self._chaves_pendentes.append(chave)
+
+    def remover(self, grupo, colaborador):
+        """Remove os registros de um colaborador"""
+        dados = self.dados
+        if (grupo, colaborador) not in self._intervalos:
+            return
+        inicio, fim = self._intervalos[(grupo, colaborador)]
+        self._definir_dados(_concatenar([dados.iloc[:inicio], dados.iloc[fim:]]))
+
+    def _definir_dados(self, dados: pd.DataFrame):
+        self._dados = dados
+        self._partes = []
+        self._chaves_pendentes = []
+        self._intervalos = _calcular_intervalos(dados)
+
+    @property
+    def dados(self) -> pd.DataFrame:
+        """Tabela consolidada (as abas adicionadas são concatenadas de uma vez, na primeira consulta)"""
+        if self._partes:
+            partes = [self._dados] + self._partes if len(self._dados) else self._partes
+            self._definir_dados(_concatenar(partes))
+        return self._dados
+
+    def __len__(self) -> int:
+        return len(self.dados)
+
+    def chaves(self) -> List[Tuple[Any, Any]]:
+        """Pares (grupo, colaborador) na ordem em que foram adicionados"""
+        self.dados
+        return list(self._intervalos)
+
+    def grupos(self) -> List[Any]:
+        """Grupos na ordem em que foram adicionados"""
+        return list(dict.fromkeys(grupo for grupo, _ in self.chaves()))
+
+    def colaboradores(self, grupo=None) -> List[Any]:
+        """Colaboradores de um grupo (ou de todos)"""
+        return [colaborador for g, colaborador in self.chaves() if grupo is None or g == grupo]
+
+    def _selecao(self, grupo, colaborador) -> pd.DataFrame:
+        dados = self.dados
+        if colaborador is not None:
+            inicio, fim = self._intervalos.get((grupo, colaborador), (0, 0))
+            return dados.iloc[inicio:fim]
+        if grupo is not None:
+            grupos = list(grupo) if isinstance(grupo, (list, tuple, set)) else [grupo]
+            return dados[dados[COLUNA_GRUPO].isin(grupos).to_numpy()]
+        return dados
+
+    def registros(self, grupo=None, colaborador=None, colunas: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Registros filtrados por grupo e/ou colaborador.
+
+        Args:
+            grupo: Grupo ou lista de grupos (None para todos)
+            colaborador: Colaborador (junto com o seu ``grupo``); None para todos
+            colunas (list, optional): Só estas colunas
+
+        Returns:
+            DataFrame: Cópia dos registros com as categorias sem uso removidas.
+            Para um colaborador, só as colunas que têm algum valor (as colunas
+            das outras abas ficam de fora).
+        """
+        selecao = self._selecao(grupo, colaborador)
+        if colunas is not None:
+            selecao = selecao[list(colunas)]
+        elif colaborador is not None:
+            selecao = selecao.loc[:, selecao.notna().any().to_numpy()]
+
+        resultado = selecao.reset_index(drop=True)
+        for coluna in resultado.columns:
+            if isinstance(resultado[coluna].dtype, pd.CategoricalDtype):
+                resultado[coluna] = resultado[coluna].cat.remove_unused_categories()
+        return resultado
+
+    def contagem_status(self, grupo=None, colaborador=None, coluna: str = 'STATUS') -> Dict[Any, int]:
+        """Quantidade de registros por status (maior primeiro), sem copiar os registros"""
+        if coluna not in self.dados.columns:
+            return {}
+        serie = self._selecao(grupo, colaborador)[coluna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            return {k: int(v) for k, v in serie.value_counts().items()}
+
+        codigos = serie.cat.codes.to_numpy()
+        contagem = np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories))
+        return {serie.cat.categories[i]: int(contagem[i])
+                for i in np.argsort(-contagem, kind='stable') if contagem[i]}
+
+    def visao(self, grupo) -> 'VisaoGrupo':
+        """Mapeamento ``{colaborador: DataFrame}`` de um grupo, lido da base sob demanda"""
+        return VisaoGrupo(self, grupo)
+
+    def memoria(self) -> int:
+        """Bytes ocupados pela tabela consolidada"""
+        return int(self.dados.memory_usage(deep=True).sum())
+
+
+def _parte_vazia() -> pd.DataFrame:
+    return pd.DataFrame({COLUNA_GRUPO: pd.Categorical([]), COLUNA_COLABORADOR: pd.Categorical([])})
+
+
+def _calcular_intervalos(dados: pd.DataFrame) -> Dict[Tuple[Any, Any], Tuple[int, int]]:
+    """Linhas de cada (grupo, colaborador), que ficam sempre contíguas na tabela"""
+    if dados.empty:
+        return {}
+    grupos = dados[COLUNA_GRUPO].cat.codes.to_numpy()
+    colaboradores = dados[COLUNA_COLABORADOR].cat.codes.to_numpy()
+    mudou = (grupos[1:] != grupos[:-1]) | (colaboradores[1:] != colaboradores[:-1])
+    inicios = np.flatnonzero(np.r_[True, mudou])
+    fins = np.r_[inicios[1:], len(dados)]
+    nomes_grupo = dados[COLUNA_GRUPO].cat.categories
+    nomes_colaborador = dados[COLUNA_COLABORADOR].cat.categories
+    return {
+        (nomes_grupo[grupos[i]], nomes_colaborador[colaboradores[i]]): (int(i), int(f))
+        for i, f in zip(inicios, fins)
+    }
+
+
+class VisaoGrupo(Mapping):
+    """Acesso por colaborador aos registros de um grupo, sem guardar DataFrames"""
+
+    def __init__(self, base: BaseContratos, grupo):
+        self.base = base
+        self.grupo = grupo
+
+    def __getitem__(self, colaborador) -> pd.DataFrame:
+        if colaborador not in self.base.colaboradores(self.grupo):
+            raise KeyError(colaborador)
+        return self.base.registros(self.grupo, colaborador)
+
+    def __iter__(self):
+        return iter(self.base.colaboradores(self.grupo))
+
+    def __len__(self) -> int:
+        return len(self.base.colaboradores(self.grupo))
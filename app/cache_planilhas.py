@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Planilhas
+==================
+Guarda em disco as abas já convertidas em DataFrame, indexadas pela impressão
+digital do arquivo Excel (tamanho, data de modificação e hash do conteúdo).
+
+Uma segunda execução sobre o mesmo arquivo carrega as abas do cache em vez de
+reprocessar o .xlsx com openpyxl. Qualquer edição no arquivo muda a impressão
+digital e descarta o cache daquele arquivo automaticamente.
+
+As abas são gravadas em Parquet quando o ``pyarrow`` está instalado e todas as
+colunas têm tipo homogêneo; caso contrário (ou sem ``pyarrow``) usa-se pickle,
+que preserva qualquer DataFrame exatamente.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    PARQUET_DISPONIVEL = False
+
+DIRETORIO_CACHE = Path('cache') / 'planilhas'
+
+VERSAO_CACHE = 1
+
+
+def hash_arquivo(caminho, tamanho_bloco: int = 1 << 20) -> str:
+    """Calcula o SHA-256 do conteúdo do arquivo"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def impressao_digital(caminho) -> Dict[str, Any]:
+    """Retorna tamanho, data de modificação e hash do conteúdo do arquivo"""
+    stat = os.stat(caminho)
+    return {
+        'tamanho': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hash_arquivo(caminho)
+    }
+
+
+def _colunas_homogeneas(df: pd.DataFrame) -> bool:
+    """Verifica se o DataFrame pode ir para Parquet sem mudar tipos ou valores"""
+    if not all(isinstance(col, str) for col in df.columns) or df.columns.duplicated().any():
+        return False
+    for col in df.columns:
+        if df[col].dtype == object:
+            if pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+                return False
+    return True
+
+
+class CachePlanilhas:
+    """
+    Cache em disco das abas de arquivos Excel.
+
+    Cada arquivo tem um diretório próprio com um ``manifesto.json`` (impressão
+    digital, lista de abas e formato de cada aba) e um arquivo por aba.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_CACHE):
+        self.diretorio = Path(diretorio)
+        self._manifestos: Dict[str, Dict[str, Any]] = {}
+
+    def _diretorio_arquivo(self, caminho) -> Path:
+        chave = hashlib.sha1(os.path.abspath(str(caminho)).encode('utf-8')).hexdigest()
+        return self.diretorio / chave
+
+    def _gravar_manifesto(self, caminho, manifesto: Dict[str, Any]):
+        destino = self._diretorio_arquivo(caminho)
+        destino.mkdir(parents=True, exist_ok=True)
+        temporario = destino / f'manifesto.json.{os.getpid()}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, destino / 'manifesto.json')
+        self._manifestos[os.path.abspath(str(caminho))] = manifesto
+
+    def _ler_manifesto(self, caminho) -> Optional[Dict[str, Any]]:
+        chave = os.path.abspath(str(caminho))
+        if chave in self._manifestos:
+            return self._manifestos[chave]
+        arquivo = self._diretorio_arquivo(caminho) / 'manifesto.json'
+        if not arquivo.exists():
+            return None
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifesto.get('versao') != VERSAO_CACHE:
+            return None
+        self._manifestos[chave] = manifesto
+        return manifesto
+
+    def manifesto_valido(self, caminho) -> Dict[str, Any]:
+        """
+        Retorna o manifesto do arquivo, recriando-o se o arquivo mudou.
+
+        Tamanho e data de modificação iguais bastam para aceitar o cache. Se
+        algum deles mudou, o hash do conteúdo decide: conteúdo igual apenas
+        atualiza o manifesto; conteúdo diferente descarta as abas gravadas.
+        """
+        stat = os.stat(caminho)
+        manifesto = self._ler_manifesto(caminho)
+
+        if manifesto is not None:
+            digital = manifesto['impressao_digital']
+            if digital['tamanho'] == stat.st_size and digital['mtime_ns'] == stat.st_mtime_ns:
+                return manifesto
+            sha256 = hash_arquivo(caminho)
+            if digital['sha256'] == sha256:
+                manifesto['impressao_digital'].update(tamanho=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                self._gravar_manifesto(caminho, manifesto)
+                return manifesto
+
+        self.invalidar(caminho)
+        manifesto = {
+            'versao': VERSAO_CACHE,
+            'arquivo': os.path.abspath(str(caminho)),
+            'impressao_digital': impressao_digital(caminho),
+            'abas': None,
+            'arquivos_abas': {}
+        }
+        self._gravar_manifesto(caminho, manifesto)
+        return manifesto
+
+    def abas(self, caminho) -> Optional[List[str]]:
+        """Lista de abas gravada no cache, ou None se ainda não foi registrada"""
+        return self.manifesto_valido(caminho)['abas']
+
+    def registrar_abas(self, caminho, abas: List[str]):
+        manifesto = self.manifesto_valido(caminho)
+        manifesto['abas'] = list(abas)
+        self._gravar_manifesto(caminho, manifesto)
+
+    def ler(self, caminho, aba: str) -> Optional[pd.DataFrame]:
+        """Lê uma aba do cache; retorna None se ela não estiver gravada"""
+        manifesto = self.manifesto_valido(caminho)
+        info = manifesto['arquivos_abas'].get(aba)
+        if info is None:
+            return None
+        arquivo = self._diretorio_arquivo(caminho) / info['arquivo']
+        try:
+            if info['formato'] == 'parquet':
+                return pd.read_parquet(arquivo)
+            return pd.read_pickle(arquivo)
+        except Exception as e:
+            print(f"Cache da aba {aba} ilegível, relendo do Excel: {str(e)}")
+            return None
+
+    def salvar(self, caminho, aba: str, df: pd.DataFrame):
+        """
+        Grava uma aba no cache do arquivo.
+
+        Vários processos podem gravar abas diferentes do mesmo arquivo ao mesmo
+        tempo (ver ``analise_paralela``): o nome do arquivo da aba depende só do
+        nome da aba e o manifesto é relido do disco antes de ser atualizado.
+        """
+        self.manifesto_valido(caminho)
+        destino = self._diretorio_arquivo(caminho)
+        nome_base = 'aba_' + hashlib.sha1(aba.encode('utf-8')).hexdigest()[:16]
+        formato = 'pickle'
+
+        try:
+            if PARQUET_DISPONIVEL and _colunas_homogeneas(df):
+                arquivo = destino / f'{nome_base}.parquet'
+                df.to_parquet(arquivo)
+                formato = 'parquet'
+            else:
+                arquivo = destino / f'{nome_base}.pkl'
+                df.to_pickle(arquivo)
+        except Exception:
+            arquivo = destino / f'{nome_base}.pkl'
+            df.to_pickle(arquivo)
+            formato = 'pickle'
+
+        self._manifestos.pop(os.path.abspath(str(caminho)), None)
+        manifesto = self.manifesto_valido(caminho)
+        manifesto['arquivos_abas'][aba] = {'arquivo': arquivo.name, 'formato': formato}
+        self._gravar_manifesto(caminho, manifesto)
+
+    def invalidar(self, caminho):
+        """Remove todo o cache de um arquivo"""
+        self._manifestos.pop(os.path.abspath(str(caminho)), None)
+        shutil.rmtree(self._diretorio_arquivo(caminho), ignore_errors=True)
+
+
+_cache_padrao: Optional[CachePlanilhas] = None
+
+
+def obter_cache_padrao() -> CachePlanilhas:
+    """Cache compartilhado, gravado em cache/planilhas no diretório de trabalho"""
+    global _cache_padrao
+    if _cache_padrao is None:
+        _cache_padrao = CachePlanilhas()
+    return _cache_padrao
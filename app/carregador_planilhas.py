@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Carregador de Planilhas
+=======================
+Abre cada arquivo Excel de listas individuais uma única vez e entrega os
+DataFrames de cada aba (colaborador) para todos os analisadores.
+
+Antes, cada analisador abria um ``pd.ExcelFile`` só para listar as abas e
+depois chamava ``pd.read_excel(caminho, sheet_name=...)`` por aba, o que
+reprocessava o zip/XML inteiro do arquivo para cada colaborador.
+
+Quando um cache em disco é informado (ver ``cache_planilhas``), as abas já
+convertidas em execuções anteriores são lidas do cache e o arquivo Excel só é
+aberto se alguma aba ainda não estiver gravada.
+
+Um analisador que usa só algumas colunas pode pedi-las pelo nome canônico
+(``colunas``): os nomes são resolvidos pelas alternativas de
+``config/colunas_config.json`` (ver ``resolvedor_colunas``), incluindo todo
+cabeçalho que corresponda a alguma alternativa do nome, e só essas colunas
+são passadas ao pandas (``usecols``), com o tipo pedido (``dtype``). Nomes que
+não estão na configuração (ex.: ``STATUS``, ``BANCO``) são procurados pelo
+próprio nome normalizado. Um nome entre asteriscos (ex.: ``*HORA*``) pega
+todas as colunas cujo nome normalizado contém o trecho, para analisadores que
+localizam colunas por substring. As colunas mantêm o nome original da planilha.
+
+O arquivo é aberto pelo motor configurado (ver ``motores_excel``): calamine
+quando instalado, com volta automática para o openpyxl em caso de erro.
+"""
+
+import os
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from cache_planilhas import CachePlanilhas, obter_cache_padrao
+from motores_excel import abrir_planilha
+from resolvedor_colunas import normalizar_nome_coluna, obter_resolvedor
+
+# Abas que não correspondem a colaboradores
+ABAS_IGNORADAS = ['RESUMO', 'ÍNDICE', 'INDEX', 'SUMMARY', 'TESTE', 'RELATÓRIO GERAL']
+
+
+# Colunas pedidas por um analisador: nomes canônicos, ou nome -> dtype (None = inferido).
+# '*TRECHO*' pede todas as colunas cujo nome contém o trecho.
+Colunas = Union[Sequence[str], Mapping[str, Optional[str]]]
+
+
+def aba_ignorada(aba: str, ignorar: Optional[Iterable[str]] = None) -> bool:
+    """Indica se a aba deve ser ignorada (comparação sem diferenciar maiúsculas)"""
+    ignorar = ABAS_IGNORADAS if ignorar is None else ignorar
+    return aba.strip().upper() in {nome.strip().upper() for nome in ignorar}
+
+
+def _especificacao(colunas: Colunas) -> Tuple[Tuple[str, Optional[str]], ...]:
+    itens = colunas.items() if isinstance(colunas, Mapping) else ((nome, None) for nome in colunas)
+    return tuple((nome, tipo) for nome, tipo in itens)
+
+
+def projetar_colunas(cabecalhos: List, colunas: Colunas) -> Tuple[List[int], Dict]:
+    """
+    Localiza as colunas pedidas em um cabeçalho.
+
+    Args:
+        cabecalhos (list): Nomes das colunas da aba
+        colunas: Nomes canônicos (ou nome -> dtype) pedidos pelo analisador;
+            ``*TRECHO*`` corresponde a todo cabeçalho que contém o trecho
+
+    Returns:
+        tuple: Posições encontradas, em ordem, e dtypes pelo nome original
+        (colunas que não existem na aba são ignoradas)
+    """
+    resolvedor = obter_resolvedor()
+    mapeamento = resolvedor.resolver(cabecalhos)
+    posicoes, tipos = set(), {}
+    for nome, tipo in _especificacao(colunas):
+        if len(nome) > 2 and nome.startswith('*') and nome.endswith('*'):
+            trecho = normalizar_nome_coluna(nome[1:-1])
+            encontradas = [idx for idx, cabecalho in enumerate(resolvedor.normalizar(cabecalhos))
+                           if trecho in cabecalho]
+        elif nome in mapeamento:
+            # Todos os cabeçalhos do nome canônico: o analisador pode ler
+            # qualquer um deles pelo nome literal (ex.: DATA e DATA CADASTRO)
+            encontradas = resolvedor.posicoes(cabecalhos, nome)
+        else:
+            idx = resolvedor.encontrar(cabecalhos, [nome])
+            encontradas = [] if idx is None else [idx]
+        for idx in encontradas:
+            posicoes.add(idx)
+            if tipo:
+                tipos[cabecalhos[idx]] = tipo
+    return sorted(posicoes), tipos
+
+
+class CarregadorPlanilhas:
+    """
+    Mantém um único handle aberto para o arquivo Excel e guarda as abas já
+    lidas, de forma que cada aba seja convertida em DataFrame no máximo uma vez.
+    """
+
+    def __init__(self, caminho, cache: Optional[CachePlanilhas] = None, motor: Optional[str] = None):
+        self.caminho = str(caminho)
+        self.cache = cache
+        self.motor = motor
+        self.assinatura = self._assinatura_arquivo()
+        self._xls = None
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._projecoes: Dict[Tuple, pd.DataFrame] = {}
+
+    def _assinatura_arquivo(self) -> Tuple[int, int]:
+        """Tamanho e data de modificação do arquivo, usados para detectar edições"""
+        stat = os.stat(self.caminho)
+        return stat.st_size, stat.st_mtime_ns
+
+    def desatualizado(self) -> bool:
+        """Verifica se o arquivo foi alterado desde que foi aberto"""
+        try:
+            return self._assinatura_arquivo() != self.assinatura
+        except OSError:
+            return True
+
+    @property
+    def xls(self):
+        """Handle do arquivo (``pd.ExcelFile`` ou equivalente do motor escolhido)"""
+        if self._xls is None:
+            self._xls = abrir_planilha(self.caminho, self.motor)
+        return self._xls
+
+    @property
+    def abas(self):
+        """Lista todas as abas do arquivo, na ordem original"""
+        if self.cache is not None:
+            abas = self.cache.abas(self.caminho)
+            if abas is not None:
+                return list(abas)
+            abas = list(self.xls.sheet_names)
+            self.cache.registrar_abas(self.caminho, abas)
+            return abas
+        return list(self.xls.sheet_names)
+
+    def abas_colaboradores(self, ignorar: Optional[Iterable[str]] = None):
+        """Lista as abas de colaboradores, sem as abas de resumo"""
+        return [aba for aba in self.abas if not aba_ignorada(aba, ignorar)]
+
+    def ler_aba(self, aba: str, colunas: Optional[Colunas] = None) -> pd.DataFrame:
+        """
+        Retorna o DataFrame de uma aba.
+
+        A aba é lida a partir do handle já aberto e guardada; cada chamada
+        devolve uma cópia, para que um analisador não altere os dados de outro.
+
+        Args:
+            aba (str): Nome da aba
+            colunas (optional): Só estas colunas (nomes canônicos, ou
+                nome -> dtype); sem elas, a aba inteira
+        """
+        if colunas is not None:
+            return self._ler_projecao(aba, _especificacao(colunas)).copy()
+        if aba not in self._frames:
+            df = self.cache.ler(self.caminho, aba) if self.cache is not None else None
+            if df is None:
+                df = self.xls.parse(aba)
+                if self.cache is not None:
+                    self.cache.salvar(self.caminho, aba, df)
+            self._frames[aba] = df
+        return self._frames[aba].copy()
+
+    def _ler_projecao(self, aba: str, especificacao: Tuple) -> pd.DataFrame:
+        """
+        Lê só as colunas pedidas, aproveitando o que já estiver carregado: a
+        aba inteira em memória ou no cache, ou a mesma projeção no cache; só
+        então o Excel é lido, com ``usecols``/``dtype``.
+        """
+        chave = (aba, especificacao)
+        if chave in self._projecoes:
+            return self._projecoes[chave]
+
+        chave_cache = aba + '|' + ','.join(f'{nome}:{tipo or ""}' for nome, tipo in especificacao)
+        df = self._frames.get(aba)
+        if df is None and self.cache is not None:
+            projetado = self.cache.ler(self.caminho, chave_cache)
+            if projetado is not None:
+                self._projecoes[chave] = projetado
+                return projetado
+            df = self.cache.ler(self.caminho, aba)
+            if df is not None:
+                self._frames[aba] = df
+
+        if df is not None:
+            posicoes, tipos = projetar_colunas(list(df.columns), dict(especificacao))
+            projetado = df.iloc[:, posicoes].astype(tipos)
+        else:
+            # Só o cabeçalho para resolver as colunas; depois só as colunas usadas
+            cabecalhos = list(self.xls.parse(aba, nrows=0).columns)
+            posicoes, tipos = projetar_colunas(cabecalhos, dict(especificacao))
+            if posicoes:
+                projetado = self.xls.parse(aba, usecols=posicoes, dtype=tipos or None)
+            else:
+                projetado = pd.DataFrame()
+            if self.cache is not None:
+                self.cache.salvar(self.caminho, chave_cache, projetado)
+
+        self._projecoes[chave] = projetado
+        return projetado
+
+    def iterar_abas(self, ignorar: Optional[Iterable[str]] = None,
+                    colunas: Optional[Colunas] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Percorre as abas de colaboradores, lendo uma de cada vez"""
+        for aba in self.abas_colaboradores(ignorar):
+            yield aba, self.ler_aba(aba, colunas)
+
+    def ler_abas(self, ignorar: Optional[Iterable[str]] = None,
+                 colunas: Optional[Colunas] = None) -> Dict[str, pd.DataFrame]:
+        """Lê todas as abas de colaboradores em uma única passada"""
+        return dict(self.iterar_abas(ignorar, colunas))
+
+    def fechar(self):
+        """Fecha o handle do arquivo (as abas já lidas continuam disponíveis)"""
+        if self._xls is not None:
+            self._xls.close()
+            self._xls = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.fechar()
+
+
+# Carregadores compartilhados por processo, indexados pelo caminho absoluto
+_carregadores: Dict[str, CarregadorPlanilhas] = {}
+
+
+def obter_carregador(caminho, usar_cache: bool = True, motor: Optional[str] = None) -> CarregadorPlanilhas:
+    """
+    Retorna o carregador compartilhado do arquivo.
+
+    Todos os analisadores do mesmo processo recebem o mesmo carregador, então
+    o arquivo é aberto uma vez só. Se o arquivo tiver sido alterado em disco,
+    um novo carregador é criado. Com ``usar_cache`` as abas também são lidas
+    e gravadas no cache em disco padrão. Sem ``motor``, vale o motor padrão
+    (ver ``motores_excel.definir_motor_padrao``).
+    """
+    chave = os.path.abspath(str(caminho))
+    carregador = _carregadores.get(chave)
+    if carregador is None or carregador.desatualizado():
+        if carregador is not None:
+            carregador.fechar()
+        carregador = CarregadorPlanilhas(chave, cache=obter_cache_padrao() if usar_cache else None, motor=motor)
+        _carregadores[chave] = carregador
+    return carregador
+
+
+def carregar_planilha(caminho, ignorar: Optional[Iterable[str]] = None,
+                      usar_cache: bool = True, colunas: Optional[Colunas] = None) -> Dict[str, pd.DataFrame]:
+    """Atalho para ler todas as abas de colaboradores de um arquivo"""
+    return obter_carregador(caminho, usar_cache).ler_abas(ignorar, colunas)
+
+
+def limpar_carregadores():
+    """Fecha e descarta todos os carregadores compartilhados"""
+    for carregador in _carregadores.values():
+        carregador.fechar()
+    _carregadores.clear()
@@ -1,5 +1,8 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, Float, DateTime, JSON, Index
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from datetime import datetime, time
+from typing import Any, Dict, List, Optional
 import os
 
 # Criar diretório para o banco de dados
@@ -29,6 +32,12 @@ class Colaborador(Base):
     data_analise = Column(DateTime)
     metricas_detalhadas = Column(JSON)  # Armazena métricas adicionais em JSON
 
+    # Um snapshot por colaborador, grupo e dia de análise: novas execuções no
+    # mesmo dia atualizam a linha existente (ver salvar_colaboradores)
+    __table_args__ = (
+        Index('uq_colaborador_snapshot', 'nome', 'grupo', 'data_analise', unique=True),
+    )
+
 class RelatorioSemanal(Base):
     __tablename__ = "relatorios_semanais"
 
@@ -39,5 +48,73 @@ class RelatorioSemanal(Base):
     dados_relatorio = Column(JSON)
     metricas_gerais = Column(JSON)
 
+# Colunas atualizadas quando o snapshot do dia já existe
+COLUNAS_SNAPSHOT = [
+    'score', 'taxa_preenchimento', 'taxa_padronizacao', 'consistencia', 'metricas_detalhadas'
+]
+
+# Linhas por comando INSERT ... VALUES (...), (...) no modo em lote
+TAMANHO_LOTE = 500
+
+
+def data_snapshot(data: Optional[datetime] = None) -> datetime:
+    """Data de análise normalizada para o dia (chave do snapshot)"""
+    return datetime.combine((data or datetime.now()).date(), time.min)
+
+
+def salvar_colaboradores(db: Session, colaboradores: List[Dict[str, Any]],
+                         data_analise: Optional[datetime] = None) -> int:
+    """
+    Grava os snapshots dos colaboradores em lote, sem criar objetos ORM.
+
+    Usa INSERT ... ON CONFLICT DO UPDATE na chave (nome, grupo, data_analise):
+    rodar a análise de novo no mesmo dia atualiza as linhas em vez de
+    duplicá-las. Não faz commit; a transação fica a cargo de quem chama.
+
+    Returns:
+        int: Número de colaboradores gravados
+    """
+    data = data_snapshot(data_analise)
+    linhas = [{
+        'nome': colaborador['nome'],
+        'grupo': colaborador['grupo'],
+        'score': colaborador.get('score', 0.0),
+        'taxa_preenchimento': colaborador.get('taxa_preenchimento', 0.0),
+        'taxa_padronizacao': colaborador.get('taxa_padronizacao', 0.0),
+        'consistencia': colaborador.get('consistencia', 0.0),
+        'data_analise': data,
+        'metricas_detalhadas': colaborador.get('metricas_detalhadas', {})
+    } for colaborador in colaboradores]
+
+    for inicio in range(0, len(linhas), TAMANHO_LOTE):
+        stmt = sqlite_insert(Colaborador).values(linhas[inicio:inicio + TAMANHO_LOTE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['nome', 'grupo', 'data_analise'],
+            set_={coluna: stmt.excluded[coluna] for coluna in COLUNAS_SNAPSHOT}
+        )
+        db.execute(stmt)
+
+    return len(linhas)
+
+
+def criar_indice_snapshot(bind=engine):
+    """
+    Cria o índice único dos snapshots em bancos criados antes dele existir.
+
+    Se houver linhas repetidas para a mesma chave, mantém só a mais recente.
+    """
+    indices = {indice['name'] for indice in inspect(bind).get_indexes(Colaborador.__tablename__)}
+    if 'uq_colaborador_snapshot' in indices:
+        return
+    with bind.begin() as conn:
+        conn.execute(text(
+            "DELETE FROM colaboradores WHERE id NOT IN "
+            "(SELECT MAX(id) FROM colaboradores GROUP BY nome, grupo, data_analise)"
+        ))
+        indice = next(i for i in Colaborador.__table__.indexes if i.name == 'uq_colaborador_snapshot')
+        indice.create(conn)
+
+
 # Criar tabelas
-Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+Base.metadata.create_all(bind=engine) 
+criar_indice_snapshot()
\ No newline at end of file
@@ -9,10 +9,25 @@ import json
 import streamlit as st
 import base64
 
+from carregador_planilhas import obter_carregador
+from normalizacao_datas import converter_datas
+from metricas_colaboradores import calcular_metricas_colaboradores
+
 # Suprimir avisos específicos do pandas
 warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
 
+# Colunas sem as quais as métricas de um colaborador não são calculadas
+COLUNAS_NECESSARIAS = ['DATA', 'STATUS']
+
+# Versão do resultado de AnalisadorExcel.calcular_metricas_aba. Incrementar
+# sempre que o cálculo mudar, para descartar as métricas gravadas (ver
+# metricas_incrementais)
+VERSAO_METRICAS_ABA = 1
+
 class AnalisadorExcel:
+    # Colunas lidas de cada aba: só as usadas pelas métricas
+    COLUNAS_LEITURA = ['DATA', 'STATUS', 'RESOLUCAO']
+    
     def __init__(self, file_path):
         self.file_path = file_path
         self.colaboradores = {}
@@ -30,7 +45,12 @@ class AnalisadorExcel:
         return nome_normalizado
     
     def corrigir_formato_data(self, valor):
-        """Tenta converter um valor para data em formato padrão"""
+        """
+        Tenta converter um valor para data em formato padrão.
+
+        Para colunas inteiras use ``converter_datas`` (normalizacao_datas),
+        que produz o mesmo resultado sem processar valor a valor.
+        """
         if pd.isna(valor) or valor is None:
             return None
             
@@ -86,7 +106,12 @@ class AnalisadorExcel:
             return None
     
     def calcular_metricas_colaborador(self, df, nome_colaborador):
-        """Calcula métricas para um colaborador específico"""
+        """
+        Calcula métricas para um colaborador específico.
+
+        Para vários colaboradores use ``calcular_metricas_colaboradores``
+        (metricas_colaboradores), que calcula todos de uma vez.
+        """
         try:
             # Verificar se há dados suficientes
             if df.empty:
@@ -94,214 +119,13 @@ class AnalisadorExcel:
                 return None
                 
             # Verificar colunas necessárias
-            colunas_necessarias = ['DATA', 'STATUS']
-            colunas_presentes = [col for col in colunas_necessarias if col in df.columns]
-            
-            if len(colunas_presentes) < len(colunas_necessarias):
-                colunas_faltantes = set(colunas_necessarias) - set(colunas_presentes)
+            colunas_faltantes = set(COLUNAS_NECESSARIAS) - set(df.columns)
+            if colunas_faltantes:
                 print(f"Erro ao processar dados de {nome_colaborador}: {colunas_faltantes}")
                 return None
             
-            # Criar cópia segura do DataFrame para evitar SettingWithCopyWarning
-            df_analise = df.copy()
-            
-            # Converter colunas de data
-            try:
-                # Usar .loc para evitar SettingWithCopyWarning
-                df_analise.loc[:, 'DATA'] = df_analise['DATA'].apply(self.corrigir_formato_data)
-                
-                # Verificar se a conversão funcionou
-                if df_analise['DATA'].isna().all():
-                    print(f"Erro: Todas as datas são nulas para {nome_colaborador}")
-                    return None
-                
-                # Remover linhas com datas nulas
-                df_analise = df_analise.dropna(subset=['DATA'])
-                
-                # Converter coluna RESOLUCAO se existir
-                if 'RESOLUCAO' in df_analise.columns:
-                    df_analise.loc[:, 'RESOLUCAO'] = df_analise['RESOLUCAO'].apply(self.corrigir_formato_data)
-            except Exception as e:
-                print(f"Erro ao processar datas para {nome_colaborador}: {str(e)}")
-                traceback.print_exc()
-                return None
-            
-            # Calcular total de registros
-            total_registros = len(df_analise)
-            
-            # Calcular distribuição de status
-            try:
-                distribuicao_status = df_analise['STATUS'].value_counts().to_dict()
-                # Converter para porcentagens
-                distribuicao_percentual = {k: round(v / total_registros * 100, 1) for k, v in distribuicao_status.items()}
-            except Exception as e:
-                print(f"Erro ao calcular distribuição de status: {str(e)}")
-                distribuicao_status = {}
-                distribuicao_percentual = {}
-            
-            # Calcular tempo médio de resolução
-            tempo_medio_resolucao = None
-            tempo_mediano_resolucao = None
-            outliers_resolucao = 0
-            
-            try:
-                if 'RESOLUCAO' in df_analise.columns:
-                    # Calcular diferença entre data de resolução e data de criação
-                    df_resolvidos = df_analise.dropna(subset=['RESOLUCAO'])
-                    
-                    if not df_resolvidos.empty:
-                        # Usar método seguro para calcular a diferença
-                        try:
-                            # Converter para datetime se ainda não for
-                            if not pd.api.types.is_datetime64_dtype(df_resolvidos['DATA']):
-                                df_resolvidos.loc[:, 'DATA'] = pd.to_datetime(df_resolvidos['DATA'])
-                            if not pd.api.types.is_datetime64_dtype(df_resolvidos['RESOLUCAO']):
-                                df_resolvidos.loc[:, 'RESOLUCAO'] = pd.to_datetime(df_resolvidos['RESOLUCAO'])
-                            
-                            # Calcular diferença em dias
-                            df_resolvidos.loc[:, 'tempo_resolucao'] = (df_resolvidos['RESOLUCAO'] - df_resolvidos['DATA']).dt.days
-                            
-                            # Remover valores negativos ou extremamente altos (provavelmente erros)
-                            df_resolvidos = df_resolvidos[(df_resolvidos['tempo_resolucao'] >= 0) & (df_resolvidos['tempo_resolucao'] <= 365)]
-                            
-                            if not df_resolvidos.empty:
-                                tempo_medio_resolucao = round(df_resolvidos['tempo_resolucao'].mean(), 1)
-                                tempo_mediano_resolucao = round(df_resolvidos['tempo_resolucao'].median(), 1)
-                                
-                                # Identificar outliers (método IQR)
-                                Q1 = df_resolvidos['tempo_resolucao'].quantile(0.25)
-                                Q3 = df_resolvidos['tempo_resolucao'].quantile(0.75)
-                                IQR = Q3 - Q1
-                                outliers_resolucao = len(df_resolvidos[(df_resolvidos['tempo_resolucao'] < (Q1 - 1.5 * IQR)) | 
-                                                                      (df_resolvidos['tempo_resolucao'] > (Q3 + 1.5 * IQR))])
-                        except Exception as e:
-                            print(f"Erro ao calcular tempo de resolução: {str(e)}")
-                            traceback.print_exc()
-            except Exception as e:
-                print(f"Erro ao processar tempos de resolução: {str(e)}")
-                traceback.print_exc()
-            
-            # Calcular taxa de eficiência (registros resolvidos / total)
-            taxa_eficiencia = None
-            try:
-                if 'STATUS' in df_analise.columns:
-                    # Considerar como resolvidos os status diferentes de PENDENTE, ANÁLISE, PRIORIDADE
-                    status_pendentes = ['PENDENTE', 'ANÁLISE', 'PRIORIDADE', 'PRIORIDADE TOTAL']
-                    resolvidos = df_analise[~df_analise['STATUS'].isin(status_pendentes)]
-                    taxa_eficiencia = round(len(resolvidos) / total_registros, 3) if total_registros > 0 else 0
-            except Exception as e:
-                print(f"Erro ao calcular taxa de eficiência: {str(e)}")
-            
-            # Calcular médias diárias por status
-            medias_diarias = {}
-            try:
-                if 'DATA' in df_analise.columns and 'STATUS' in df_analise.columns:
-                    # Agrupar por data e status
-                    df_analise.loc[:, 'data_apenas'] = df_analise['DATA'].dt.date
-                    agrupado = df_analise.groupby(['data_apenas', 'STATUS']).size().reset_index(name='contagem')
-                    
-                    # Calcular média por status
-                    for status in df_analise['STATUS'].unique():
-                        status_data = agrupado[agrupado['STATUS'] == status]
-                        if not status_data.empty:
-                            media = round(status_data['contagem'].mean(), 1)
-                            medias_diarias[status] = media
-            except Exception as e:
-                print(f"Erro ao calcular médias diárias: {str(e)}")
-                traceback.print_exc()
-            
-            # Analisar tendência
-            tendencia = {}
-            try:
-                if 'DATA' in df_analise.columns:
-                    # Agrupar por data
-                    df_analise.loc[:, 'data_apenas'] = df_analise['DATA'].dt.date
-                    contagem_diaria = df_analise.groupby('data_apenas').size().reset_index(name='contagem')
-                    
-                    if len(contagem_diaria) > 1:
-                        # Converter datas para números (dias desde a primeira data)
-                        primeira_data = contagem_diaria['data_apenas'].min()
-                        contagem_diaria.loc[:, 'dias'] = (contagem_diaria['data_apenas'] - primeira_data).dt.days
-                        
-                        # Calcular coeficiente de correlação
-                        corr = np.corrcoef(contagem_diaria['dias'], contagem_diaria['contagem'])[0, 1]
-                        
-                        # Determinar direção da tendência
-                        if corr > 0.1:
-                            direcao = 'crescente'
-                        elif corr < -0.1:
-                            direcao = 'decrescente'
-                        else:
-                            direcao = 'estável'
-                            
-                            # Calcular R²
-                            if len(contagem_diaria) > 2:
-                                x = contagem_diaria['dias'].values.reshape(-1, 1)
-                                y = contagem_diaria['contagem'].values
-                                
-                                # Calcular regressão linear manualmente
-                                n = len(x)
-                                x_mean = np.mean(x)
-                                y_mean = np.mean(y)
-                                
-                                numerator = np.sum((x - x_mean) * (y - y_mean))
-                                denominator = np.sum((x - x_mean) ** 2)
-                                
-                                if denominator != 0:
-                                    slope = numerator / denominator
-                                    intercept = y_mean - slope * x_mean
-                                    
-                                    y_pred = slope * x + intercept
-                                    r2 = max(0, 1 - np.sum((y - y_pred.flatten()) ** 2) / np.sum((y - y_mean) ** 2))
-                                else:
-                                    slope = 0
-                                    intercept = y_mean
-                                    r2 = 0
-                            else:
-                                slope = 0
-                                intercept = 0
-                                r2 = 0
-                            
-                            tendencia = {
-                                'direcao': direcao,
-                                'correlacao': round(corr, 2),
-                                'r2': round(r2, 2),
-                                'slope': round(float(slope), 4),
-                                'intercept': round(float(intercept), 2)
-                            }
-            except Exception as e:
-                print(f"Erro ao analisar tendência: {str(e)}")
-                traceback.print_exc()
-                tendencia = {'direcao': 'estável', 'r2': 0}
-            
-            # Analisar padrão semanal
-            padrao_semanal = {}
-            try:
-                if 'DATA' in df_analise.columns:
-                    # Extrair dia da semana
-                    df_analise.loc[:, 'dia_semana'] = df_analise['DATA'].dt.day_name()
-                    
-                    # Contar registros por dia da semana
-                    padrao_semanal = df_analise['dia_semana'].value_counts().to_dict()
-            except Exception as e:
-                print(f"Erro ao analisar padrão semanal: {str(e)}")
-            
-            # Compilar todas as métricas
-            metricas = {
-                'nome': nome_colaborador,
-                'total_registros': total_registros,
-                'distribuicao_status': distribuicao_status,
-                'distribuicao_percentual': distribuicao_percentual,
-                'tempo_medio_resolucao': tempo_medio_resolucao,
-                'tempo_mediano_resolucao': tempo_mediano_resolucao,
-                'outliers_resolucao': outliers_resolucao,
-                'taxa_eficiencia': taxa_eficiencia,
-                'medias_diarias': medias_diarias,
-                'tendencia': tendencia,
-                'padrao_semanal': padrao_semanal
-            }
-            
-            return metricas
+            nomes = np.full(len(df), nome_colaborador, dtype=object)
+            return calcular_metricas_colaboradores(df, nomes).get(nome_colaborador)
         except Exception as e:
             print(f"Erro ao calcular métricas para {nome_colaborador}: {str(e)}")
             traceback.print_exc()
@@ -354,6 +178,55 @@ class AnalisadorExcel:
             for dia, count in sorted(metricas['padrao_semanal'].items(), key=lambda x: x[1], reverse=True):
                 print(f"  {dia}: {count}")
     
+    def preparar_aba(self, df, sheet_name):
+        """Normaliza as colunas de uma aba já lida e verifica se ela pode ser analisada"""
+        # Verificar se há dados
+        if df.empty:
+            print(f"Aba {sheet_name} está vazia.")
+            return None
+            
+        # Normalizar nomes das colunas
+        df.columns = [self.normalizar_coluna(col) for col in df.columns]
+        
+        colunas_faltantes = set(COLUNAS_NECESSARIAS) - set(df.columns)
+        if colunas_faltantes:
+            print(f"Erro ao processar dados de {sheet_name}: {colunas_faltantes}")
+            return None
+        return df
+    
+    def calcular_metricas_aba(self, df, sheet_name):
+        """Normaliza as colunas de uma aba já lida e calcula as métricas do colaborador"""
+        df = self.preparar_aba(df, sheet_name)
+        if df is None:
+            return None
+        return self.calcular_metricas_abas({sheet_name: df}).get(sheet_name)
+    
+    def calcular_metricas_abas(self, abas):
+        """
+        Calcula de uma vez as métricas de várias abas (uma por colaborador).
+
+        Args:
+            abas (dict): DataFrames já preparados (``preparar_aba``) por nome da aba
+
+        Returns:
+            dict: Métricas por nome da aba (None quando não há datas válidas)
+        """
+        if not abas:
+            return {}
+        try:
+            colunas = list(COLUNAS_NECESSARIAS)
+            if any('RESOLUCAO' in df.columns for df in abas.values()):
+                colunas.append('RESOLUCAO')
+            
+            # Um único DataFrame com as colunas usadas pelas métricas de todas as abas
+            partes = [df.loc[:, ~df.columns.duplicated()].reindex(columns=colunas) for df in abas.values()]
+            nomes = np.repeat(np.array(list(abas), dtype=object), [len(parte) for parte in partes])
+            return calcular_metricas_colaboradores(pd.concat(partes, ignore_index=True), nomes)
+        except Exception as e:
+            print(f"Erro ao calcular métricas das abas: {str(e)}")
+            traceback.print_exc()
+            return {}
+    
     def analisar_arquivo(self):
         """Analisa todas as abas do arquivo Excel"""
         try:
@@ -368,9 +241,10 @@ class AnalisadorExcel:
                 })
                 return []
                 
-            # Ler o arquivo Excel com tratamento de erros
+            # Abrir o arquivo Excel uma única vez (compartilhado entre analisadores)
             try:
-                xls = pd.ExcelFile(self.file_path)
+                carregador = obter_carregador(self.file_path)
+                abas = carregador.abas
             except Exception as e:
                 print(f"Erro ao abrir arquivo Excel: {str(e)}")
                 self.erros.append({
@@ -379,16 +253,16 @@ class AnalisadorExcel:
                 })
                 return []
                 
-            # Processar cada aba
-            nomes_colaboradores = []
+            # Ler e preparar cada aba
+            abas_preparadas = {}
             
-            for sheet_name in xls.sheet_names:
+            for sheet_name in abas:
                 print(f"Analisando dados de: {sheet_name}")
                 
                 try:
                     # Ler a aba com tratamento de erros
                     try:
-                        df = pd.read_excel(self.file_path, sheet_name=sheet_name)
+                        df = carregador.ler_aba(sheet_name, self.COLUNAS_LEITURA)
                     except Exception as e:
                         print(f"Erro ao ler aba {sheet_name}: {str(e)}")
                         self.erros.append({
@@ -397,21 +271,9 @@ class AnalisadorExcel:
                         })
                         continue
                     
-                    # Verificar se há dados
-                    if df.empty:
-                        print(f"Aba {sheet_name} está vazia.")
-                        continue
-                        
-                    # Normalizar nomes das colunas
-                    df.columns = [self.normalizar_coluna(col) for col in df.columns]
-                    
-                    # Calcular métricas para o colaborador
-                    metricas = self.calcular_metricas_colaborador(df, sheet_name)
-                    
-                    if metricas:
-                        self.colaboradores[sheet_name] = metricas
-                        nomes_colaboradores.append(sheet_name)
-                        self.exibir_metricas_colaborador(metricas)
+                    df = self.preparar_aba(df, sheet_name)
+                    if df is not None:
+                        abas_preparadas[sheet_name] = df
                         
                 except Exception as e:
                     print(f"Erro ao processar aba {sheet_name}: {str(e)}")
@@ -422,6 +284,17 @@ class AnalisadorExcel:
                     })
                     continue
             
+            # Calcular as métricas de todos os colaboradores de uma vez
+            metricas_abas = self.calcular_metricas_abas(abas_preparadas)
+            nomes_colaboradores = []
+            
+            for sheet_name in abas_preparadas:
+                metricas = metricas_abas.get(sheet_name)
+                if metricas:
+                    self.colaboradores[sheet_name] = metricas
+                    nomes_colaboradores.append(sheet_name)
+                    self.exibir_metricas_colaborador(metricas)
+            
             # Calcular métricas comparativas
             self.calcular_metricas_comparativas()
             
@@ -987,16 +860,13 @@ class AnalisadorExcel:
                 print("Coluna de colaborador não encontrada")
                 return
             
-            # Agrupar por colaborador
-            colaboradores_unicos = df[coluna_colaborador].dropna().unique()
+            colunas_faltantes = set(COLUNAS_NECESSARIAS) - set(df.columns)
+            if colunas_faltantes:
+                print(f"Erro ao processar dados dos colaboradores: {colunas_faltantes}")
+                return
             
-            for colaborador in colaboradores_unicos:
-                # Filtrar dados do colaborador
-                df_colaborador = df[df[coluna_colaborador] == colaborador]
-                
-                # Calcular métricas
-                metricas = self.calcular_metricas_colaborador(df_colaborador, colaborador)
-                
+            # Calcular as métricas de todos os colaboradores de uma vez
+            for colaborador, metricas in calcular_metricas_colaboradores(df, coluna_colaborador).items():
                 if metricas:
                     self.colaboradores[colaborador] = metricas
             
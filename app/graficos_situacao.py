@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Gráficos de Distribuição de Situações
+=====================================
+Etapa de gráficos separada da análise dos colaboradores.
+
+A análise (``analisar_situacao_colaborador``, ``analisar_colaborador``)
+devolve só os dados do gráfico, via :func:`dados_grafico_situacao`, e não
+importa o matplotlib. Depois, :func:`renderizar_graficos_situacao` desenha
+todos os gráficos de uma vez, em um único processo e reaproveitando uma única
+figura. O nome de cada arquivo inclui um hash dos dados, então um gráfico
+cuja distribuição não mudou já existe em disco e não é desenhado de novo.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+DIRETORIO_GRAFICOS = 'graficos_situacao'
+
+
+def dados_grafico_situacao(colaborador, contagem: Dict[Any, int]) -> Optional[Dict[str, Any]]:
+    """
+    Dados do gráfico de barras da distribuição de situações de um colaborador.
+
+    Args:
+        colaborador (str): Nome do colaborador (aba)
+        contagem (dict): Quantidade por situação, na ordem das barras
+
+    Returns:
+        dict: ``colaborador``, ``situacoes`` e ``quantidades``, ou None se não
+        houver situações
+    """
+    if not contagem:
+        return None
+    return {
+        'colaborador': str(colaborador),
+        'situacoes': [str(situacao) for situacao in contagem],
+        'quantidades': [int(quantidade) for quantidade in contagem.values()]
+    }
+
+
+def caminho_grafico(grafico: Dict[str, Any], diretorio=DIRETORIO_GRAFICOS) -> str:
+    """Caminho do PNG de um gráfico, com o hash do seu conteúdo no nome"""
+    conteudo = json.dumps(grafico, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16]
+    nome = grafico['colaborador'].replace(' ', '_').replace(os.sep, '_')
+    return os.path.join(str(diretorio), f'situacao_{nome}_{digest}.png')
+
+
+def renderizar_graficos_situacao(graficos: Iterable[Optional[Dict[str, Any]]],
+                                 diretorio=DIRETORIO_GRAFICOS) -> List[Optional[str]]:
+    """
+    Desenha em lote os gráficos que ainda não existem em disco.
+
+    Args:
+        graficos (list): Dados de cada gráfico (itens None são ignorados)
+        diretorio (str): Diretório de saída
+
+    Returns:
+        list: Caminho do PNG de cada gráfico (None para itens None ou falhas),
+        na mesma ordem da entrada
+    """
+    graficos = list(graficos)
+    caminhos = [caminho_grafico(g, diretorio) if g else None for g in graficos]
+    pendentes = [(g, c) for g, c in zip(graficos, caminhos) if c is not None and not os.path.exists(c)]
+    if not pendentes:
+        return caminhos
+
+    # Importado só aqui: quem apenas analisa os dados não carrega o matplotlib
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    os.makedirs(diretorio, exist_ok=True)
+    figura = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figura)
+    ax = figura.add_subplot()
+    falhas = set()
+
+    for grafico, caminho in pendentes:
+        try:
+            ax.clear()
+            sns.barplot(x=grafico['situacoes'], y=grafico['quantidades'], ax=ax)
+            ax.set_title(f"Distribuição de Situações - {grafico['colaborador']}")
+            ax.set_xlabel('Situação')
+            ax.set_ylabel('Quantidade')
+            ax.tick_params(axis='x', labelrotation=45)
+            figura.tight_layout()
+
+            # Grava com nome temporário: um PNG incompleto nunca é tomado como pronto
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            figura.savefig(temporario, format='png')
+            os.replace(temporario, caminho)
+        except Exception as e:
+            print(f"Erro ao gerar gráfico para {grafico['colaborador']}: {str(e)}")
+            falhas.add(caminho)
+
+    print(f"Gráficos de situação: {len(pendentes) - len(falhas)} gerados, "
+          f"{sum(1 for c in caminhos if c) - len(pendentes)} reaproveitados")
+    return [None if c in falhas else c for c in caminhos]
+
+
+def renderizar_graficos_resultados(resultados: Dict[str, Dict[str, Any]], diretorio=DIRETORIO_GRAFICOS):
+    """
+    Gera os gráficos dos resultados de ``analisar_arquivo_paralelo`` e
+    preenche ``grafico_path`` de cada colaborador.
+    """
+    itens = [item['dados'] for item in resultados.values() if isinstance(item.get('dados'), dict)]
+    caminhos = renderizar_graficos_situacao([dados.get('grafico') for dados in itens], diretorio)
+    for dados, caminho in zip(itens, caminhos):
+        dados['grafico_path'] = caminho
+    return resultados
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Jobs em Segundo Plano
+=====================
+Executa tarefas demoradas (como a análise disparada por ``POST /analisar/``)
+fora do event loop da API, em um pool de threads, e guarda o estado de cada
+job para consulta posterior em ``GET /jobs/{id}``.
+
+Cada job recebe um objeto :class:`Job` por onde informa a etapa atual e o
+progresso por aba; o resultado (ou o erro) fica disponível quando termina.
+"""
+
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+
+
+class Job:
+    """Estado de um job: situação, etapa, progresso por aba, resultado e erro"""
+
+    def __init__(self, descricao: str = ''):
+        self.id = uuid.uuid4().hex
+        self.descricao = descricao
+        self.status = PENDENTE
+        self.etapa = None
+        self.criado_em = datetime.now()
+        self.iniciado_em = None
+        self.concluido_em = None
+        self.resultado = None
+        self.erro = None
+        self._arquivos: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def finalizado(self) -> bool:
+        return self.status in (CONCLUIDO, ERRO)
+
+    def definir_etapa(self, etapa: str):
+        """Registra a etapa atual do job (ex.: 'gerando dashboard')"""
+        with self._lock:
+            self.etapa = etapa
+
+    def registrar_aba(self, grupo: str, aba: str, concluidas: int, total: int):
+        """Registra uma aba concluída; compatível com o ``progresso`` do pipeline"""
+        with self._lock:
+            arquivo = self._arquivos.setdefault(grupo, {'abas_concluidas': 0, 'total_abas': 0, 'abas': []})
+            arquivo['abas_concluidas'] = concluidas
+            arquivo['total_abas'] = total
+            arquivo['aba_atual'] = aba
+            arquivo['abas'].append(aba)
+
+    def progresso(self) -> Dict[str, Any]:
+        """Progresso total e por arquivo (grupo)"""
+        with self._lock:
+            arquivos = {grupo: {**dados, 'abas': list(dados['abas'])} for grupo, dados in self._arquivos.items()}
+        concluidas = sum(dados['abas_concluidas'] for dados in arquivos.values())
+        total = sum(dados['total_abas'] for dados in arquivos.values())
+        return {
+            'abas_concluidas': concluidas,
+            'total_abas': total,
+            'percentual': round(100.0 * concluidas / total, 1) if total else (100.0 if self.status == CONCLUIDO else 0.0),
+            'arquivos': arquivos
+        }
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Representação do job para a API (sem o resultado)"""
+        return {
+            'id': self.id,
+            'descricao': self.descricao,
+            'status': self.status,
+            'etapa': self.etapa,
+            'criado_em': self.criado_em.isoformat(),
+            'iniciado_em': self.iniciado_em.isoformat() if self.iniciado_em else None,
+            'concluido_em': self.concluido_em.isoformat() if self.concluido_em else None,
+            'progresso': self.progresso(),
+            'erro': self.erro
+        }
+
+
+class GerenciadorJobs:
+    """
+    Fila de jobs executados em um pool de threads.
+
+    O padrão é um único worker: as análises escrevem nos mesmos caches e no
+    mesmo banco SQLite, então rodar uma de cada vez evita disputa sem travar a
+    API, que continua respondendo enquanto o job roda.
+    """
+
+    def __init__(self, max_workers: int = 1, limite_historico: int = 100):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.limite_historico = limite_historico
+
+    def submeter(self, funcao: Callable[[Job], Any], descricao: str = '') -> Job:
+        """
+        Enfileira ``funcao(job)`` e retorna o job imediatamente.
+
+        O valor retornado pela função vira o resultado do job; uma exceção
+        marca o job com erro.
+        """
+        job = Job(descricao)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._descartar_antigos()
+        self._executor.submit(self._executar, job, funcao)
+        return job
+
+    def _executar(self, job: Job, funcao: Callable[[Job], Any]):
+        job.status = EXECUTANDO
+        job.iniciado_em = datetime.now()
+        try:
+            job.resultado = funcao(job)
+            job.status = CONCLUIDO
+        except Exception as e:
+            print(f"Erro no job {job.id}: {str(e)}")
+            traceback.print_exc()
+            job.erro = str(e)
+            job.status = ERRO
+        finally:
+            job.concluido_em = datetime.now()
+
+    def _descartar_antigos(self):
+        """Remove os jobs finalizados mais antigos além do limite do histórico"""
+        excedentes = len(self._jobs) - self.limite_historico
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finalizado][:max(excedentes, 0)]:
+            del self._jobs[job_id]
+
+    def obter(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def listar(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def encerrar(self, aguardar: bool = True):
+        self._executor.shutdown(wait=aguardar)
+
+
+gerenciador_jobs = GerenciadorJobs()
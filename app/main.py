@@ -9,8 +9,9 @@ from typing import List, Dict, Any
 from pathlib import Path
 
 # Importar módulos locais
-from database import SessionLocal, engine, Colaborador, RelatorioSemanal
+from database import SessionLocal, engine, Colaborador, RelatorioSemanal, salvar_colaboradores
 from pipeline_dashboard import DashboardPipeline
+from jobs import Job, gerenciador_jobs, CONCLUIDO, ERRO
 from schemas import ColaboradorCreate, RelatorioCreate
 from analise_eficiencia import AnalisadorEficiencia
 from validacao_dados import ExcelLeitor
@@ -52,64 +53,77 @@ async def read_root():
     </html>
     """
 
-@app.post("/analisar/", response_model=Dict[str, Any])
-async def analisar_dados(db: Session = Depends(get_db)):
-    """Executa análise e salva no banco de dados"""
+def executar_analise(job: Job) -> Dict[str, Any]:
+    """Executa o pipeline e salva os resultados; roda no worker do job"""
+    pipeline = DashboardPipeline()
+    job.definir_etapa("processando planilhas")
+    resultados = pipeline.executar_pipeline(progresso=job.registrar_aba)
+
+    if not resultados or 'colaboradores' not in resultados:
+        raise ValueError("Nenhum resultado encontrado na análise")
+
+    # Gerar relatório semanal
+    relatorio = RelatorioSemanal(
+        semana=datetime.now().isocalendar()[1],
+        ano=datetime.now().year,
+        data_geracao=datetime.now(),
+        dados_relatorio=resultados.get('relatorio', {}),
+        metricas_gerais=resultados.get('metricas_gerais', {})
+    )
+
+    # Sessão própria: a sessão da requisição já foi fechada quando o job roda
+    job.definir_etapa("salvando no banco de dados")
+    db = SessionLocal()
     try:
-        pipeline = DashboardPipeline()
-        resultados = pipeline.executar_pipeline()
-        
-        if not resultados or 'colaboradores' not in resultados:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"message": "Nenhum resultado encontrado na análise"}
-            )
-
-        # Salvar resultados no banco
-        for colaborador in resultados['colaboradores']:
-            db_colaborador = Colaborador(
-                nome=colaborador['nome'],
-                grupo=colaborador['grupo'],
-                score=colaborador.get('score', 0.0),
-                taxa_preenchimento=colaborador.get('taxa_preenchimento', 0.0),
-                taxa_padronizacao=colaborador.get('taxa_padronizacao', 0.0),
-                consistencia=colaborador.get('consistencia', 0.0),
-                data_analise=datetime.now(),
-                metricas_detalhadas=colaborador.get('metricas_detalhadas', {})
-            )
-            db.add(db_colaborador)
-        
-        # Gerar relatório semanal
-        relatorio = RelatorioSemanal(
-            semana=datetime.now().isocalendar()[1],
-            ano=datetime.now().year,
-            data_geracao=datetime.now(),
-            dados_relatorio=resultados.get('relatorio', {}),
-            metricas_gerais=resultados.get('metricas_gerais', {})
-        )
+        # Snapshots dos colaboradores em lote (upsert por nome, grupo e dia)
+        salvar_colaboradores(db, resultados['colaboradores'])
         db.add(relatorio)
-        
-        try:
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Erro ao salvar no banco de dados: {str(e)}"
-            )
-
-        return {
-            "message": "Análise concluída e dados salvos",
-            "dashboard_path": str(pipeline.output_file),
-            "colaboradores": len(resultados['colaboradores']),
-            "data_analise": datetime.now().isoformat()
-        }
-        
+        db.commit()
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+        db.rollback()
+        raise RuntimeError(f"Erro ao salvar no banco de dados: {str(e)}")
+    finally:
+        db.close()
+
+    job.definir_etapa("concluido")
+    return {
+        "message": "Análise concluída e dados salvos",
+        "dashboard_path": str(pipeline.output_file),
+        "colaboradores": len(resultados['colaboradores']),
+        "data_analise": datetime.now().isoformat()
+    }
+
+@app.post("/analisar/", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def analisar_dados():
+    """Enfileira a análise e retorna o id do job para acompanhamento"""
+    job = gerenciador_jobs.submeter(executar_analise, descricao="Análise de colaboradores")
+    return {
+        "message": "Análise enfileirada",
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}",
+        "resultado_url": f"/jobs/{job.id}/resultado"
+    }
+
+@app.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def status_job(job_id: str):
+    """Situação, etapa e progresso por aba de um job"""
+    job = gerenciador_jobs.obter(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado")
+    return job.para_dict()
+
+@app.get("/jobs/{job_id}/resultado", response_model=Dict[str, Any])
+async def resultado_job(job_id: str):
+    """Resultado de um job concluído (202 enquanto ainda está em execução)"""
+    job = gerenciador_jobs.obter(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado")
+    if job.status == ERRO:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=job.erro)
+    if job.status != CONCLUIDO:
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.para_dict())
+    return job.resultado
 
 @app.get("/colaboradores/", response_model=List[ColaboradorCreate])
 async def listar_colaboradores(db: Session = Depends(get_db)):
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Métricas por Colaborador
+========================
+Cálculo das métricas de ``AnalisadorExcel.calcular_metricas_colaborador``
+para vários colaboradores de uma vez.
+
+Os registros de todos os colaboradores ficam em um único DataFrame (ex.: as
+abas de uma planilha concatenadas) e cada métrica sai de uma agregação
+agrupada sobre ele: as datas são convertidas uma vez, a data sem horário é
+calculada uma vez e distribuição de status, médias diárias, tempos de
+resolução (com outliers pelo IQR) e padrão semanal são obtidos sem laços por
+colaborador ou por status, e as tendências de todos os colaboradores são
+ajustadas juntas (ver ``tendencias``).
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from normalizacao_datas import converter_datas
+from tendencias import ajustar_tendencias, empilhar_series
+
+# Status considerados em aberto no cálculo da taxa de eficiência
+STATUS_PENDENTES = ['PENDENTE', 'ANÁLISE', 'PRIORIDADE', 'PRIORIDADE TOTAL']
+
+# Nomes de Series.dt.day_name(), na ordem de Series.dt.dayofweek
+DIAS_SEMANA = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Tempos de resolução fora desta faixa (em dias) são tratados como erro de digitação
+RESOLUCAO_MAXIMA_DIAS = 365
+
+DIA_NS = 86_400 * 10**9
+
+
+def _para_datas(serie: pd.Series, verbose: bool) -> pd.Series:
+    return pd.to_datetime(converter_datas(serie, verbose=verbose), errors='coerce')
+
+
+def _dicionarios_por_grupo(contagens: pd.Series, n_grupos: int, ordenar: bool = True) -> list:
+    """Converte uma Series indexada por (grupo, chave) em um dict por grupo"""
+    resultado = [{} for _ in range(n_grupos)]
+    if ordenar:
+        # Como em value_counts: maior contagem primeiro
+        contagens = contagens.sort_values(ascending=False, kind='stable')
+    for (grupo, chave), valor in contagens.items():
+        resultado[grupo][chave] = valor
+    return resultado
+
+
+def _tendencias(grupo_dia: np.ndarray, dias: np.ndarray, contagem: np.ndarray, n_grupos: int) -> list:
+    """
+    Tendência da contagem diária de cada grupo.
+
+    Args:
+        grupo_dia (ndarray): Grupo de cada dia com registros
+        dias (ndarray): Dias desde o primeiro dia do grupo
+        contagem (ndarray): Registros no dia
+        n_grupos (int): Quantidade de grupos
+
+    Returns:
+        list: Dicionário de tendência por grupo (vazio com menos de dois dias)
+    """
+    x, y = empilhar_series(grupo_dia, dias, contagem, n_grupos=n_grupos)
+    ajuste = ajustar_tendencias(y, x)
+    n = ajuste.pontos
+
+    tendencias = []
+    for i in range(n_grupos):
+        if n[i] <= 1:
+            tendencias.append({})
+            continue
+
+        corr = ajuste.correlacao[i]
+        if corr > 0.1:
+            direcao = 'crescente'
+        elif corr < -0.1:
+            direcao = 'decrescente'
+        else:
+            direcao = 'estável'
+
+        slope, intercept = ajuste.inclinacao[i], ajuste.intercepto[i]
+        # Com só dois dias a reta passa pelos dois pontos: o R² não diz nada
+        r2_grupo = ajuste.r2[i] if n[i] > 2 and ajuste.r2[i] > 0 else 0
+
+        tendencias.append({
+            'direcao': direcao,
+            'correlacao': round(corr, 2),
+            'r2': round(r2_grupo, 2),
+            'slope': round(float(slope), 4),
+            'intercept': round(float(intercept), 2)
+        })
+    return tendencias
+
+
+def calcular_metricas_colaboradores(df: pd.DataFrame, colaboradores,
+                                    verbose: bool = True) -> Dict[Any, Optional[Dict[str, Any]]]:
+    """
+    Calcula as métricas de todos os colaboradores de um DataFrame.
+
+    Args:
+        df (DataFrame): Registros com as colunas DATA, STATUS e, opcionalmente,
+            RESOLUCAO (nomes já normalizados)
+        colaboradores: Nome da coluna com o colaborador de cada registro, ou
+            uma sequência com um valor por linha. Registros sem colaborador
+            são ignorados.
+        verbose (bool): Exibe os resumos da conversão de datas
+
+    Returns:
+        dict: Métricas de cada colaborador, na ordem em que aparecem, no mesmo
+        formato de ``AnalisadorExcel.calcular_metricas_colaborador`` (None para
+        colaboradores sem nenhuma data válida)
+    """
+    if isinstance(colaboradores, str):
+        colaboradores = df[colaboradores]
+    grupos, nomes = pd.factorize(pd.Series(np.asarray(colaboradores, dtype=object), index=df.index),
+                                 sort=False)
+    n_grupos = len(nomes)
+
+    datas = _para_datas(df['DATA'], verbose)
+    validos = (grupos >= 0) & datas.notna().to_numpy()
+
+    g = grupos[validos]
+    datas = datas[validos]
+    status = df['STATUS'][validos]
+    total = np.bincount(g, minlength=n_grupos)
+
+    # Distribuição de status
+    contagem_status = status.groupby([g, status.to_numpy()], sort=False).size()
+    distribuicao = _dicionarios_por_grupo(contagem_status, n_grupos)
+
+    # Taxa de eficiência: registros fora dos status em aberto / total
+    resolvidos = np.bincount(g[~status.isin(STATUS_PENDENTES).to_numpy()], minlength=n_grupos)
+
+    # Tempo de resolução, com outliers pelo método IQR
+    tempo_medio = [None] * n_grupos
+    tempo_mediano = [None] * n_grupos
+    outliers = np.zeros(n_grupos, dtype=int)
+    if 'RESOLUCAO' in df.columns:
+        resolucao = _para_datas(df['RESOLUCAO'], verbose)[validos]
+        tempo = (resolucao - datas).dt.days
+        dentro = (tempo >= 0) & (tempo <= RESOLUCAO_MAXIMA_DIAS)
+        tempo, g_tempo = tempo[dentro], g[dentro.to_numpy()]
+        if len(tempo):
+            por_grupo = tempo.groupby(g_tempo)
+            estatisticas = pd.DataFrame({
+                'media': por_grupo.mean(),
+                'mediana': por_grupo.median(),
+                'q1': por_grupo.quantile(0.25),
+                'q3': por_grupo.quantile(0.75)
+            })
+            iqr = estatisticas['q3'] - estatisticas['q1']
+            limite_inferior = (estatisticas['q1'] - 1.5 * iqr).reindex(range(n_grupos)).to_numpy()
+            limite_superior = (estatisticas['q3'] + 1.5 * iqr).reindex(range(n_grupos)).to_numpy()
+            valores = tempo.to_numpy()
+            fora = (valores < limite_inferior[g_tempo]) | (valores > limite_superior[g_tempo])
+            outliers = np.bincount(g_tempo[fora], minlength=n_grupos)
+            for i, linha in estatisticas.iterrows():
+                tempo_medio[i] = round(linha['media'], 1)
+                tempo_mediano[i] = round(linha['mediana'], 1)
+
+    # Médias diárias por status: registros por (dia, status), média por status
+    dia = datas.dt.normalize().to_numpy()
+    por_dia_status = status.groupby([g, dia, status.to_numpy()], sort=False).size()
+    medias = por_dia_status.groupby(level=[0, 2], sort=False).mean().round(1)
+    medias_diarias = _dicionarios_por_grupo(medias, n_grupos, ordenar=False)
+
+    # Tendência da contagem diária
+    por_dia = pd.Series(g).groupby([g, dia]).size()
+    grupo_dia = por_dia.index.get_level_values(0).to_numpy()
+    dia_ns = por_dia.index.get_level_values(1).to_numpy().view('i8')
+    primeiro_dia = np.full(n_grupos, np.iinfo(np.int64).max)
+    np.minimum.at(primeiro_dia, grupo_dia, dia_ns)
+    dias = ((dia_ns - primeiro_dia[grupo_dia]) // DIA_NS).astype(float)
+    tendencias = _tendencias(grupo_dia, dias, por_dia.to_numpy().astype(float), n_grupos)
+
+    # Padrão semanal
+    semana = np.bincount(g * 7 + datas.dt.dayofweek.to_numpy(), minlength=n_grupos * 7).reshape(n_grupos, 7)
+
+    resultados = {}
+    for i, nome in enumerate(nomes):
+        if total[i] == 0:
+            print(f"Erro: Todas as datas são nulas para {nome}")
+            resultados[nome] = None
+            continue
+
+        registros = int(total[i])
+        padrao = {DIAS_SEMANA[d]: int(semana[i, d]) for d in np.argsort(-semana[i], kind='stable') if semana[i, d]}
+        resultados[nome] = {
+            'nome': nome,
+            'total_registros': registros,
+            'distribuicao_status': {k: int(v) for k, v in distribuicao[i].items()},
+            'distribuicao_percentual': {k: round(int(v) / registros * 100, 1) for k, v in distribuicao[i].items()},
+            'tempo_medio_resolucao': tempo_medio[i],
+            'tempo_mediano_resolucao': tempo_mediano[i],
+            'outliers_resolucao': int(outliers[i]),
+            'taxa_eficiencia': round(int(resolvidos[i]) / registros, 3),
+            'medias_diarias': medias_diarias[i],
+            'tendencia': tendencias[i],
+            'padrao_semanal': padrao
+        }
+    return resultados
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Métricas Incrementais
+=====================
+Guarda as métricas já calculadas de cada aba (colaborador) junto com uma
+assinatura do conteúdo da aba, para que uma nova análise recalcule apenas os
+colaboradores cujas abas foram alteradas desde a última execução.
+
+A verificação é feita em três níveis, do mais barato para o mais caro:
+
+1. Tamanho e data de modificação do arquivo: se não mudaram, todas as
+   métricas gravadas são reaproveitadas sem abrir o Excel.
+2. CRC do XML da aba dentro do .xlsx (lido do índice do zip, sem
+   descompactar): abas cujo XML não mudou nem são lidas.
+3. Número de linhas e digest do DataFrame lido: cobre arquivos que não são
+   .xlsx e abas cujo XML mudou sem alterar os dados.
+
+O store também guarda a versão da função de cálculo (``versao_calculo``):
+quando a função muda de comportamento, basta incrementar a versão para que
+todas as métricas sejam recalculadas. Resultados ``None`` ou com
+``status: 'FALHA'`` não são gravados, então a aba é calculada de novo na
+execução seguinte.
+"""
+
+import hashlib
+import os
+import pickle
+import zipfile
+import xml.etree.ElementTree as ET
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from carregador_planilhas import obter_carregador
+
+DIRETORIO_METRICAS = Path('cache') / 'metricas'
+
+VERSAO_METRICAS = 2
+
+_NS_PLANILHA = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_RELACOES = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PACOTE = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Partes compartilhadas do .xlsx que mudam o valor lido das células
+_PARTES_COMPARTILHADAS = ['xl/sharedStrings.xml', 'xl/styles.xml']
+
+
+def digest_aba(df: pd.DataFrame) -> Dict[str, Any]:
+    """Número de linhas e digest do conteúdo (colunas e valores) de uma aba"""
+    sha = hashlib.sha1()
+    sha.update(repr(list(df.columns)).encode('utf-8'))
+    sha.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return {'linhas': len(df), 'digest': sha.hexdigest()}
+
+
+def assinaturas_xml_abas(caminho) -> Dict[str, str]:
+    """
+    Assinatura do XML de cada aba de um arquivo .xlsx, a partir dos CRCs
+    gravados no índice do zip.
+
+    A assinatura de cada aba inclui as partes compartilhadas (textos e
+    estilos), já que uma alteração nelas pode mudar os valores lidos. Para
+    arquivos que não são .xlsx retorna um dicionário vazio.
+    """
+    try:
+        with zipfile.ZipFile(caminho) as pacote:
+            infos = {info.filename: info for info in pacote.infolist()}
+            workbook = ET.fromstring(pacote.read('xl/workbook.xml'))
+            relacoes = ET.fromstring(pacote.read('xl/_rels/workbook.xml.rels'))
+    except (zipfile.BadZipFile, KeyError, OSError, ET.ParseError):
+        return {}
+
+    destinos = {}
+    for relacao in relacoes.iter(f'{_NS_PACOTE}Relationship'):
+        destino = relacao.get('Target', '')
+        destino = destino.lstrip('/') if destino.startswith('/') else f'xl/{destino}'
+        destinos[relacao.get('Id')] = destino
+
+    compartilhadas = ';'.join(
+        f"{infos[parte].CRC}:{infos[parte].file_size}" for parte in _PARTES_COMPARTILHADAS if parte in infos
+    )
+
+    assinaturas = {}
+    for aba in workbook.iter(f'{_NS_PLANILHA}sheet'):
+        info = infos.get(destinos.get(aba.get(f'{_NS_RELACOES}id'), ''))
+        if info is not None:
+            assinaturas[aba.get('name')] = f"{info.CRC}:{info.file_size}|{compartilhadas}"
+    return assinaturas
+
+
+def _falhou(metricas) -> bool:
+    """Resultado de cálculo que não deve ser gravado (sem métricas ou com falha)"""
+    return metricas is None or (isinstance(metricas, dict) and metricas.get('status') == 'FALHA')
+
+
+class MetricasIncrementais:
+    """
+    Armazena métricas por arquivo e aba e recalcula só o que mudou.
+
+    Cada tipo de cálculo (pipeline de análise, dashboard, ...) usa um ``nome``
+    próprio, gravado em ``cache/metricas/<nome>.pkl``, e a ``versao_calculo``
+    da função que produz as métricas: um store gravado com outra versão é
+    descartado.
+    """
+
+    def __init__(self, nome: str, diretorio=DIRETORIO_METRICAS, versao_calculo: Any = None):
+        self.nome = nome
+        self.arquivo_store = Path(diretorio) / f'{nome}.pkl'
+        self.versao = (VERSAO_METRICAS, versao_calculo)
+        self._store = self._carregar()
+
+    def _carregar(self) -> Dict[str, Any]:
+        try:
+            with open(self.arquivo_store, 'rb') as f:
+                store = pickle.load(f)
+            if store.get('versao') == self.versao:
+                return store
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Store de métricas {self.arquivo_store} ilegível, recalculando: {str(e)}")
+        return {'versao': self.versao, 'arquivos': {}}
+
+    def _gravar(self):
+        self.arquivo_store.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.arquivo_store.with_name(f'{self.arquivo_store.name}.{os.getpid()}.tmp')
+        with open(temporario, 'wb') as f:
+            pickle.dump(self._store, f)
+        os.replace(temporario, self.arquivo_store)
+
+    def metricas(self, arquivo) -> Dict[str, Any]:
+        """Métricas gravadas de um arquivo, por aba"""
+        registro = self._store['arquivos'].get(os.path.abspath(str(arquivo)), {})
+        return {aba: item['metricas'] for aba, item in registro.get('abas', {}).items()}
+
+    def atualizar(self, arquivo, calcular: Callable[[pd.DataFrame, str], Any],
+                  ignorar: Optional[Iterable[str]] = None,
+                  progresso: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Atualiza as métricas de um arquivo, recalculando só as abas alteradas.
+
+        Args:
+            arquivo (str): Caminho do arquivo Excel
+            calcular (callable): Função ``calcular(df, aba)`` que devolve as
+                métricas de uma aba
+            ignorar (list, optional): Abas que não são de colaboradores
+            progresso (callable, optional): Chamada como
+                ``progresso(aba, concluidas, total)`` a cada aba concluída,
+                recalculada ou reaproveitada
+
+        Returns:
+            dict: ``metricas`` (todas as abas, na ordem do arquivo),
+            ``alteradas`` (abas recalculadas) e ``removidas`` (abas que não
+            existem mais no arquivo)
+        """
+        chave = os.path.abspath(str(arquivo))
+        stat = os.stat(chave)
+        assinatura_arquivo = (stat.st_size, stat.st_mtime_ns)
+        registro = self._store['arquivos'].get(chave)
+
+        if registro is not None and registro['assinatura'] == assinatura_arquivo:
+            metricas = self.metricas(chave)
+            if progresso is not None:
+                for posicao, aba in enumerate(metricas, 1):
+                    progresso(aba, posicao, len(metricas))
+            return {'metricas': metricas, 'alteradas': [], 'removidas': []}
+
+        anteriores = registro['abas'] if registro is not None else {}
+        assinaturas_xml = assinaturas_xml_abas(chave)
+        carregador = obter_carregador(chave)
+
+        abas = {}
+        metricas = {}
+        alteradas = []
+        falhas = []
+        nomes_abas = list(carregador.abas_colaboradores(ignorar))
+        for posicao, aba in enumerate(nomes_abas, 1):
+            anterior = anteriores.get(aba)
+            xml = assinaturas_xml.get(aba)
+
+            if anterior is not None and xml is not None and anterior['xml'] == xml:
+                abas[aba] = anterior
+            else:
+                df = carregador.ler_aba(aba)
+                conteudo = digest_aba(df)
+                if anterior is not None and anterior['conteudo'] == conteudo:
+                    abas[aba] = {**anterior, 'xml': xml}
+                else:
+                    calculadas = calcular(df, aba)
+                    alteradas.append(aba)
+                    if _falhou(calculadas):
+                        # Não grava: a aba é recalculada na próxima execução
+                        metricas[aba] = calculadas
+                        falhas.append(aba)
+                    else:
+                        abas[aba] = {'xml': xml, 'conteudo': conteudo, 'metricas': calculadas}
+            if aba in abas:
+                metricas[aba] = abas[aba]['metricas']
+
+            if progresso is not None:
+                progresso(aba, posicao, len(nomes_abas))
+
+        removidas = [aba for aba in anteriores if aba not in nomes_abas]
+        # Com falhas o arquivo não é dado como conferido, senão a próxima
+        # execução reaproveitaria tudo pelo tamanho e data de modificação
+        self._store['arquivos'][chave] = {'assinatura': None if falhas else assinatura_arquivo, 'abas': abas}
+        self._gravar()
+
+        if alteradas or removidas:
+            print(f"{os.path.basename(chave)}: {len(alteradas)} abas recalculadas, "
+                  f"{len(nomes_abas) - len(alteradas)} reaproveitadas")
+        if falhas:
+            print(f"{os.path.basename(chave)}: {len(falhas)} abas com falha não foram gravadas: {', '.join(falhas)}")
+
+        return {
+            'metricas': metricas,
+            'alteradas': alteradas,
+            'removidas': removidas
+        }
+
+    def limpar(self, arquivo=None):
+        """Descarta as métricas de um arquivo (ou de todos)"""
+        if arquivo is None:
+            self._store['arquivos'].clear()
+        else:
+            self._store['arquivos'].pop(os.path.abspath(str(arquivo)), None)
+        self._gravar()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Motores de Leitura Excel
+========================
+Escolha do motor usado para abrir as planilhas no ``CarregadorPlanilhas``.
+
+- ``openpyxl``: ``pd.ExcelFile`` com o motor padrão do pandas (openpyxl
+  para .xlsx, xlrd para .xls);
+- ``calamine``: leitor em Rust do pacote ``python-calamine``, bem mais
+  rápido para arquivos grandes. É opcional: só é usado se estiver instalado;
+- ``auto`` (padrão): calamine quando disponível e a extensão é suportada,
+  senão openpyxl.
+
+O calamine é exposto com a mesma interface de ``pd.ExcelFile`` usada pelo
+carregador (``sheet_names``, ``parse`` e ``close``) e as linhas passam pelo
+mesmo ``TextParser`` do pandas, então cabeçalho, ``usecols``, ``dtype`` e
+``nrows`` se comportam igual nos dois motores. Um erro do próprio calamine
+(``CalamineError``: zip/XML que ele não entende, senha, ...) ao abrir ou ao
+ler uma aba faz o arquivo passar para o openpyxl; os demais erros (arquivo
+inexistente, ``usecols`` inválido, ...) são propagados, como no openpyxl.
+"""
+
+import os
+from datetime import date
+from typing import List
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+try:
+    from python_calamine import CalamineError, CalamineWorkbook
+    CALAMINE_DISPONIVEL = True
+    # Erros que fazem o arquivo passar para o openpyxl
+    ERROS_CALAMINE = (CalamineError,)
+except ImportError:
+    CalamineWorkbook = None
+    CALAMINE_DISPONIVEL = False
+    ERROS_CALAMINE = ()
+
+MOTORES = ['auto', 'calamine', 'openpyxl']
+
+EXTENSOES_CALAMINE = ('.xlsx', '.xlsm', '.xlsb', '.xls', '.ods')
+
+_motor_padrao = 'auto'
+
+
+def definir_motor_padrao(motor: str):
+    """Define o motor usado pelos carregadores criados sem motor explícito"""
+    global _motor_padrao
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de leitura desconhecido: {motor} (opções: {', '.join(MOTORES)})")
+    _motor_padrao = motor
+
+
+def obter_motor_padrao() -> str:
+    return _motor_padrao
+
+
+def escolher_motor(caminho, motor: str = None) -> str:
+    """
+    Motor efetivo para um arquivo.
+
+    Args:
+        caminho (str): Arquivo Excel
+        motor (str, optional): ``auto``, ``calamine`` ou ``openpyxl`` (padrão:
+            o definido em ``definir_motor_padrao``)
+
+    Returns:
+        str: ``calamine`` ou ``openpyxl``
+    """
+    motor = motor or _motor_padrao
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de leitura desconhecido: {motor} (opções: {', '.join(MOTORES)})")
+    extensao_suportada = os.path.splitext(str(caminho))[1].lower() in EXTENSOES_CALAMINE
+    if motor == 'openpyxl' or not CALAMINE_DISPONIVEL or not extensao_suportada:
+        return 'openpyxl'
+    return 'calamine'
+
+
+def _converter_celula(valor):
+    """Mesmas conversões do leitor openpyxl do pandas"""
+    if valor == '':
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if isinstance(valor, date):
+        return pd.Timestamp(valor)
+    return valor
+
+
+class PlanilhaCalamine:
+    """Arquivo aberto pelo python-calamine com a interface de ``pd.ExcelFile``"""
+
+    def __init__(self, caminho):
+        self._workbook = CalamineWorkbook.from_path(str(caminho))
+        self.sheet_names: List[str] = list(self._workbook.sheet_names)
+
+    def parse(self, sheet_name=0, header=0, nrows=None, usecols=None, dtype=None, **kwargs) -> pd.DataFrame:
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        linhas = self._workbook.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+        if nrows is not None and isinstance(header, int):
+            # Só as linhas necessárias (o TextParser não trata nrows=0)
+            linhas = linhas[:header + 1 + nrows]
+        linhas = [[_converter_celula(valor) for valor in linha] for linha in linhas]
+
+        # Linhas vazias no fim da aba são descartadas, como no openpyxl
+        while linhas and all(valor is None for valor in linhas[-1]):
+            linhas.pop()
+        if not linhas:
+            return pd.DataFrame()
+        return TextParser(linhas, header=header, nrows=nrows, usecols=usecols, dtype=dtype, **kwargs).read()
+
+    def close(self):
+        fechar = getattr(self._workbook, 'close', None)
+        if fechar is not None:
+            fechar()
+
+
+class PlanilhaComReserva:
+    """
+    Lê com o calamine e, em um erro do calamine (``ERROS_CALAMINE``), passa a
+    usar ``pd.ExcelFile`` (openpyxl) no restante do arquivo.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = str(caminho)
+        self.motor = 'calamine'
+        self._reserva = None
+        self._principal = None
+        try:
+            self._principal = PlanilhaCalamine(self.caminho)
+        except ERROS_CALAMINE as e:
+            self._usar_reserva(e)
+
+    def _usar_reserva(self, erro: Exception):
+        print(f"Aviso: calamine falhou em {os.path.basename(self.caminho)} "
+              f"({type(erro).__name__}: {erro}); usando openpyxl")
+        if self._principal is not None:
+            try:
+                self._principal.close()
+            except Exception:
+                pass
+        self._principal = None
+        self.motor = 'openpyxl'
+
+    def _openpyxl(self) -> pd.ExcelFile:
+        if self._reserva is None:
+            self._reserva = pd.ExcelFile(self.caminho)
+        return self._reserva
+
+    @property
+    def sheet_names(self) -> List[str]:
+        if self._principal is not None:
+            return self._principal.sheet_names
+        return self._openpyxl().sheet_names
+
+    def parse(self, *args, **kwargs) -> pd.DataFrame:
+        if self._principal is not None:
+            try:
+                return self._principal.parse(*args, **kwargs)
+            except ERROS_CALAMINE as e:
+                self._usar_reserva(e)
+        return self._openpyxl().parse(*args, **kwargs)
+
+    def close(self):
+        for planilha in (self._principal, self._reserva):
+            if planilha is not None:
+                planilha.close()
+        self._principal = self._reserva = None
+
+
+def abrir_planilha(caminho, motor: str = None):
+    """
+    Abre um arquivo Excel com o motor escolhido (ver ``escolher_motor``).
+
+    Returns:
+        ``pd.ExcelFile`` ou ``PlanilhaComReserva``: objeto com ``sheet_names``,
+        ``parse`` e ``close``
+    """
+    if escolher_motor(caminho, motor) == 'calamine':
+        return PlanilhaComReserva(caminho)
+    return pd.ExcelFile(caminho)
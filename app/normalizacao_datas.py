@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Normalização de Datas
+=====================
+Conversão de colunas inteiras de datas vindas das planilhas, com o mesmo
+resultado de ``AnalisadorExcel.corrigir_formato_data`` aplicado valor a valor.
+
+Em vez de tentar até dez ``pd.to_datetime`` por célula, a coluna é separada
+por tipo uma única vez (datas, textos, números de série do Excel) e cada
+formato de texto é convertido de uma vez só sobre a máscara dos valores que
+ainda não foram reconhecidos.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# Mesma ordem de tentativa de AnalisadorExcel.corrigir_formato_data
+FORMATOS_DATA = [
+    '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d/%m/%y',
+    '%d-%m-%y', '%Y/%m/%d', '%d/%m/%Y %H:%M:%S',
+    '%d-%m-%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S'
+]
+
+# Origem dos números de série do Excel (com o bug do ano bissexto de 1900)
+ORIGEM_EXCEL = pd.Timestamp('1899-12-30')
+
+# Faixa de números de série convertida de forma vetorizada; fora dela o
+# resultado pode estourar os limites de pd.Timedelta/pd.Timestamp e é tratado
+# valor a valor
+_SERIE_MINIMA = -80000
+_SERIE_MAXIMA = 106000
+
+# Nanossegundos por dia, na mesma sequência de multiplicações feita por
+# pd.Timedelta(days=...), para que frações de dia arredondem igual
+_NS_POR_DIA = (24, 3600, 1e9)
+
+_RE_NAO_DATA = r'[^\d/\-:]'
+
+
+def _converter_numero(valor):
+    """Conversão individual de número de série (valores fora da faixa segura)"""
+    try:
+        return ORIGEM_EXCEL + pd.Timedelta(days=float(valor))
+    except Exception:
+        return None
+
+
+def _converter_texto_inferido(valor):
+    """Última tentativa para textos: deixar o pandas inferir o formato"""
+    try:
+        return pd.to_datetime(valor)
+    except Exception:
+        return None
+
+
+def converter_datas(serie: pd.Series, verbose: bool = True) -> pd.Series:
+    """
+    Converte uma coluna de datas de uma vez.
+
+    Aceita objetos datetime (mantidos como estão), textos nos formatos
+    dd/mm/aaaa e variações (ver ``FORMATOS_DATA``) e números de série do
+    Excel. Valores que não puderem ser convertidos viram nulos.
+
+    Args:
+        serie (Series): Coluna original da planilha
+        verbose (bool): Exibe um resumo dos valores não convertidos
+
+    Returns:
+        Series: Coluna convertida, com o mesmo índice da original
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.copy()
+
+    valores = serie.to_numpy(dtype=object)
+    resultado = np.full(len(valores), None, dtype=object)
+
+    # Classificação por tipo, feita uma única vez para a coluna
+    nulos = pd.isna(valores)
+    eh_data = np.fromiter((isinstance(v, (pd.Timestamp, datetime)) for v in valores), dtype=bool, count=len(valores))
+    eh_texto = np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=len(valores))
+    eh_numero = np.fromiter((isinstance(v, (int, float)) for v in valores), dtype=bool, count=len(valores))
+    eh_data &= ~nulos
+    eh_texto &= ~nulos
+    eh_numero &= ~nulos & ~eh_data
+
+    resultado[eh_data] = valores[eh_data]
+    nao_convertidos = 0
+
+    # Textos: limpeza vetorizada e uma conversão por formato
+    if eh_texto.any():
+        textos = pd.Series(valores[eh_texto])
+        limpos = textos.str.replace(_RE_NAO_DATA, '', regex=True).str.strip()
+        convertidos = np.full(len(textos), None, dtype=object)
+        restantes = (limpos != '').to_numpy()
+        nao_convertidos += int((~restantes).sum())
+
+        for formato in FORMATOS_DATA:
+            if not restantes.any():
+                break
+            tentativa = pd.to_datetime(limpos[restantes], format=formato, errors='coerce')
+            ok = tentativa.notna().to_numpy()
+            if ok.any():
+                posicoes = np.flatnonzero(restantes)[ok]
+                convertidos[posicoes] = list(tentativa[ok])
+                restantes[posicoes] = False
+
+        # O que sobrou passa pela inferência do pandas, valor a valor
+        for posicao in np.flatnonzero(restantes):
+            convertido = _converter_texto_inferido(textos.iat[posicao])
+            if convertido is None:
+                nao_convertidos += 1
+            convertidos[posicao] = convertido
+
+        resultado[eh_texto] = convertidos
+
+    # Números de série do Excel
+    if eh_numero.any():
+        numeros = valores[eh_numero].astype(float)
+        seguros = np.isfinite(numeros) & (numeros >= _SERIE_MINIMA) & (numeros <= _SERIE_MAXIMA)
+        convertidos = np.full(len(numeros), None, dtype=object)
+        if seguros.any():
+            nanos = numeros[seguros]
+            for fator in _NS_POR_DIA:
+                nanos = nanos * fator
+            datas = ORIGEM_EXCEL + pd.to_timedelta(nanos.astype(np.int64), unit='ns')
+            convertidos[seguros] = list(datas)
+        for posicao in np.flatnonzero(~seguros):
+            convertido = _converter_numero(numeros[posicao])
+            if convertido is None:
+                nao_convertidos += 1
+            convertidos[posicao] = convertido
+        resultado[eh_numero] = convertidos
+
+    # Tipos não reconhecidos (ex.: datetime.date) ficam nulos
+    outros = ~(nulos | eh_data | eh_texto | eh_numero)
+    nao_convertidos += int(outros.sum())
+
+    if verbose and nao_convertidos:
+        print(f"Erro ao converter datas: {nao_convertidos} valores não reconhecidos na coluna {serie.name}")
+
+    return pd.Series(resultado, index=serie.index, name=serie.name, dtype=object).infer_objects()
@@ -7,13 +7,15 @@ from pathlib import Path
 import json
 import webbrowser
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional
 
 # Importando os módulos criados anteriormente
 from validacao_metricas import validar_metricas_qualidade
 from analise_detalhada import analisar_detalhes_colaborador
-from analise_paralela import analisar_arquivo_paralelo
+from analise_paralela import (analisar_arquivo_paralelo, analisar_situacao_colaborador, ABAS_NAO_COLABORADORES,
+                              VERSAO_ANALISE_SITUACAO)
 from debug_excel import AnalisadorExcel
+from metricas_incrementais import MetricasIncrementais
 
 class DashboardPipeline:
     def __init__(self):
@@ -21,6 +23,7 @@ class DashboardPipeline:
         self.output_path = self.base_path / "dashboard_output"
         self.output_path.mkdir(exist_ok=True)
         self.output_file = None
+        self.metricas_store = MetricasIncrementais('dashboard', versao_calculo=VERSAO_ANALISE_SITUACAO)
         
         # Configuração de estilo CSS
         self.css = """
@@ -107,8 +110,14 @@ class DashboardPipeline:
         </style>
         """
     
-    def executar_pipeline(self) -> Dict[str, Any]:
-        """Executa o pipeline completo de análise"""
+    def executar_pipeline(self, progresso: Optional[Callable[[str, str, int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Executa o pipeline completo de análise
+
+        Args:
+            progresso (callable, optional): Chamada como
+                ``progresso(grupo, aba, concluidas, total)`` a cada aba processada
+        """
         try:
             # Inicializar resultados
             resultados = {
@@ -133,7 +142,7 @@ class DashboardPipeline:
                     continue
 
                 # Processar cada arquivo
-                dados_grupo = self.processar_arquivo(arquivo, grupo)
+                dados_grupo = self.processar_arquivo(arquivo, grupo, progresso)
                 if dados_grupo:
                     resultados['colaboradores'].extend(dados_grupo)
 
@@ -165,25 +174,29 @@ class DashboardPipeline:
                 }
             }
     
-    def processar_arquivo(self, arquivo: Path, grupo: str) -> List[Dict[str, Any]]:
+    def processar_arquivo(self, arquivo: Path, grupo: str,
+                          progresso: Optional[Callable[[str, str, int, int], None]] = None) -> List[Dict[str, Any]]:
         """Processa um arquivo Excel e retorna dados dos colaboradores"""
         try:
-            xls = pd.ExcelFile(arquivo)
+            # Só as abas alteradas desde a última análise são recalculadas
+            resultado = self.metricas_store.atualizar(
+                arquivo,
+                lambda df, sheet: self.calcular_metricas(df, sheet, arquivo),
+                ignorar=ABAS_NAO_COLABORADORES,
+                progresso=(lambda sheet, feitas, total: progresso(grupo, sheet, feitas, total)) if progresso else None
+            )
             colaboradores = []
 
-            for sheet in xls.sheet_names:
-                if sheet.lower() not in ['resumo', 'índice', 'index', 'summary']:
-                    df = pd.read_excel(arquivo, sheet_name=sheet)
-                    metricas = self.calcular_metricas(df)
-                    colaboradores.append({
-                        'nome': sheet,
-                        'grupo': grupo,
-                        'score': metricas['score'],
-                        'taxa_preenchimento': metricas['taxa_preenchimento'],
-                        'taxa_padronizacao': metricas['taxa_padronizacao'],
-                        'consistencia': metricas['consistencia'],
-                        'metricas_detalhadas': metricas
-                    })
+            for sheet, metricas in resultado['metricas'].items():
+                colaboradores.append({
+                    'nome': sheet,
+                    'grupo': grupo,
+                    'score': metricas['score'],
+                    'taxa_preenchimento': metricas['taxa_preenchimento'],
+                    'taxa_padronizacao': metricas['taxa_padronizacao'],
+                    'consistencia': metricas['consistencia'],
+                    'metricas_detalhadas': metricas
+                })
 
             return colaboradores
 
@@ -191,6 +204,20 @@ class DashboardPipeline:
             print(f"Erro ao processar arquivo {arquivo}: {str(e)}")
             return []
     
+    def calcular_metricas(self, df: pd.DataFrame, sheet: str, arquivo: Path) -> Dict[str, Any]:
+        """Calcula as métricas de qualidade da coluna SITUAÇÃO de uma aba"""
+        dados = analisar_situacao_colaborador(str(arquivo), sheet, df)
+        return {
+            'score': float(dados.get('score_qualidade', 0.0)),
+            'taxa_preenchimento': float(dados.get('taxa_preenchimento', 0.0)),
+            'taxa_padronizacao': float(dados.get('taxa_padronizacao', 0.0)),
+            'consistencia': float(dados.get('consistencia_diaria', 0.0)),
+            'total_registros': int(dados.get('total_registros', 0)),
+            'problemas': dados.get('problemas', []),
+            'sugestoes': dados.get('sugestoes', []),
+            'status': dados.get('status')
+        }
+    
     def gerar_dashboard_html(self, resultados):
         """Gera o dashboard HTML com todos os resultados"""
         print("Gerando dashboard...")
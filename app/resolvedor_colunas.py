@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Resolvedor de Colunas
+=====================
+Identifica as colunas essenciais (DATA, RESOLUCAO, CONTRATO, NEGOCIACAO,
+SITUACAO) nos cabeçalhos das planilhas a partir de ``config/colunas_config.json``.
+
+As alternativas de cada coluna são normalizadas uma única vez e compiladas em
+um dicionário nome normalizado -> coluna, então cada cabeçalho é resolvido
+com uma busca, em vez de normalizar todas as alternativas para cada
+cabeçalho. Como as abas de um arquivo costumam ter o mesmo cabeçalho, a
+resolução também fica guardada por tupla de cabeçalhos. Colunas cuja
+configuração inclui a estratégia ``fuzzy`` ainda são procuradas por
+semelhança (``difflib``) quando nenhum cabeçalho bate exatamente.
+"""
+
+import difflib
+import json
+import os
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Configuração compartilhada por ValidadorAvancado e ExcelLeitor
+CONFIG_COLUNAS = Path(__file__).resolve().parent.parent / 'config' / 'colunas_config.json'
+
+# Semelhança mínima (0 a 1) para a estratégia fuzzy
+LIMIAR_FUZZY = 0.85
+
+# Quantidade de tuplas de cabeçalho guardadas antes de esvaziar o cache
+LIMITE_CACHE = 4096
+
+
+def normalizar_nome_coluna(texto: Any) -> str:
+    """Nome sem acentos, em maiúsculas e sem espaços nem sublinhados"""
+    if not isinstance(texto, str):
+        texto = str(texto)
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = texto.encode('ASCII', 'ignore').decode('ASCII')
+    return texto.upper().strip().replace(' ', '').replace('_', '')
+
+
+class ResolvedorColunas:
+    """
+    Índice compilado das alternativas de ``colunas_essenciais``.
+
+    Quando a mesma alternativa aparece em mais de uma coluna, vale a coluna
+    declarada primeiro na configuração.
+    """
+
+    def __init__(self, colunas_essenciais: Dict[str, Dict[str, Any]],
+                 limiar_fuzzy: float = LIMIAR_FUZZY):
+        self.colunas = list(colunas_essenciais)
+        self.limiar_fuzzy = limiar_fuzzy
+        self.indice: Dict[str, str] = {}
+        self.alternativas: Dict[str, set] = {}
+        self.alternativas_fuzzy: Dict[str, list] = {}
+
+        for coluna, config in colunas_essenciais.items():
+            normalizadas = [normalizar_nome_coluna(alt) for alt in config.get('alternativas', [coluna])]
+            for nome in normalizadas:
+                self.indice.setdefault(nome, coluna)
+            self.alternativas[coluna] = set(normalizadas)
+            if 'fuzzy' in config.get('estrategias', []):
+                self.alternativas_fuzzy[coluna] = normalizadas
+
+        self._normalizados: Dict[Tuple, Tuple[str, ...]] = {}
+        self._resolvidos: Dict[Tuple, Dict[str, Optional[int]]] = {}
+
+    def _chave(self, cabecalhos: Iterable) -> Tuple:
+        return tuple(str(c) for c in cabecalhos)
+
+    def normalizar(self, cabecalhos: Iterable) -> Tuple[str, ...]:
+        """Cabeçalhos normalizados (calculados uma vez por tupla de cabeçalhos)"""
+        chave = self._chave(cabecalhos)
+        normalizados = self._normalizados.get(chave)
+        if normalizados is None:
+            if len(self._normalizados) >= LIMITE_CACHE:
+                self._normalizados.clear()
+            normalizados = tuple(normalizar_nome_coluna(c) for c in chave)
+            self._normalizados[chave] = normalizados
+        return normalizados
+
+    def resolver(self, cabecalhos: Sequence) -> Dict[str, Optional[int]]:
+        """
+        Localiza as colunas essenciais em um cabeçalho.
+
+        Args:
+            cabecalhos (list): Nomes das colunas, na ordem da planilha
+
+        Returns:
+            dict: Posição do primeiro cabeçalho de cada coluna essencial
+            (None se a coluna não existir), na ordem da configuração
+        """
+        chave = self._chave(cabecalhos)
+        mapeamento = self._resolvidos.get(chave)
+        if mapeamento is None:
+            if len(self._resolvidos) >= LIMITE_CACHE:
+                self._resolvidos.clear()
+            mapeamento = self._resolver(self.normalizar(chave))
+            self._resolvidos[chave] = mapeamento
+        return dict(mapeamento)
+
+    def _resolver(self, normalizados: Tuple[str, ...]) -> Dict[str, Optional[int]]:
+        mapeamento: Dict[str, Optional[int]] = dict.fromkeys(self.colunas)
+        usados = set()
+        for idx, nome in enumerate(normalizados):
+            coluna = self.indice.get(nome)
+            if coluna is not None and mapeamento[coluna] is None:
+                mapeamento[coluna] = idx
+                usados.add(idx)
+
+        # Semelhança só para o que não foi encontrado exatamente
+        for coluna, alternativas in self.alternativas_fuzzy.items():
+            if mapeamento[coluna] is not None:
+                continue
+            for idx, nome in enumerate(normalizados):
+                if idx not in usados and nome and difflib.get_close_matches(nome, alternativas, 1, self.limiar_fuzzy):
+                    mapeamento[coluna] = idx
+                    usados.add(idx)
+                    break
+        return mapeamento
+
+    def posicoes(self, cabecalhos: Sequence, coluna: str) -> List[int]:
+        """
+        Todas as posições de cabeçalhos que correspondem a uma coluna essencial.
+
+        Além do cabeçalho escolhido por ``resolver``, inclui os demais iguais
+        (normalizados) a qualquer alternativa da coluna, mesmo que tenham sido
+        atribuídos a outra coluna (ex.: ``DATA CADASTRO`` e ``DATA``, ou
+        ``STATUS`` e ``SITUAÇÃO``).
+        """
+        encontradas = {idx for idx, nome in enumerate(self.normalizar(cabecalhos))
+                       if nome in self.alternativas.get(coluna, ())}
+        resolvida = self.resolver(cabecalhos).get(coluna)
+        if resolvida is not None:
+            encontradas.add(resolvida)
+        return sorted(encontradas)
+
+    def encontrar(self, cabecalhos: Sequence, alternativas: Iterable[str]) -> Optional[int]:
+        """Posição do primeiro cabeçalho igual (normalizado) a uma das alternativas"""
+        procuradas = {normalizar_nome_coluna(alt) for alt in alternativas}
+        for idx, nome in enumerate(self.normalizar(cabecalhos)):
+            if nome in procuradas:
+                return idx
+        return None
+
+    def colunas_reconhecidas(self, valores: Sequence) -> int:
+        """Quantidade de colunas essenciais com correspondência exata nos valores"""
+        return len({self.indice[nome] for nome in self.normalizar(valores) if nome in self.indice})
+
+
+# Usadas quando o arquivo de configuração não existe
+COLUNAS_PADRAO = {
+    'DATA': {'alternativas': ['DATA', 'DT', 'DATA_', 'DATA CADASTRO'],
+             'estrategias': ['direto', 'normalizado', 'fuzzy']},
+    'RESOLUCAO': {'alternativas': ['RESOLUÇÃO', 'RESOLUCAO', 'RESOL', 'DT_RESOLUCAO'],
+                  'estrategias': ['direto', 'normalizado', 'fuzzy']},
+    'CONTRATO': {'alternativas': ['CONTRATO', 'NUM_CONTRATO', 'NÚMERO CONTRATO'],
+                 'estrategias': ['direto', 'normalizado']},
+    'NEGOCIACAO': {'alternativas': ['NEGOCIAÇÃO', 'NEGOCIACAO', 'DT_NEGOCIACAO'],
+                   'estrategias': ['direto', 'normalizado', 'fuzzy']},
+    'SITUACAO': {'alternativas': ['SITUAÇÃO', 'SITUACAO', 'STATUS'],
+                 'estrategias': ['direto', 'normalizado']},
+}
+
+
+_resolvedores: Dict[str, Tuple[float, ResolvedorColunas]] = {}
+
+
+def obter_resolvedor(caminho=None) -> ResolvedorColunas:
+    """
+    Retorna o resolvedor compartilhado de um arquivo de configuração.
+
+    O arquivo é lido e compilado uma vez por processo (de novo só se for
+    alterado em disco). Sem arquivo, usa as alternativas padrão.
+    """
+    caminho = os.path.abspath(str(caminho or CONFIG_COLUNAS))
+    try:
+        modificado = os.path.getmtime(caminho)
+    except OSError:
+        modificado = None
+
+    registro = _resolvedores.get(caminho)
+    if registro is None or registro[0] != modificado:
+        colunas = COLUNAS_PADRAO
+        if modificado is not None:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                colunas = json.load(f).get('colunas_essenciais', COLUNAS_PADRAO)
+        registro = (modificado, ResolvedorColunas(colunas))
+        _resolvedores[caminho] = registro
+    return registro[1]
+
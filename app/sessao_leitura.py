@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sessão de Leitura
+=================
+Leitura das abas de um arquivo Excel com várias estratégias (pandas,
+openpyxl, xlrd), abrindo o arquivo no máximo uma vez por estratégia.
+
+O ``ValidadorAvancado.ler_planilha`` chamava ``load_workbook`` (modo
+completo) ou ``xlrd.open_workbook`` para cada aba sempre que a estratégia
+anterior falhava, então um arquivo problemático era processado inteiro
+abas × estratégias vezes. A sessão guarda o handle de cada estratégia
+aberta (ou o erro de abertura, para não tentar de novo) e o reaproveita em
+todas as abas.
+
+A estratégia que funcionou para um arquivo fica registrada em disco pela
+impressão digital do conteúdo (ver ``cache_planilhas``) e é tentada primeiro
+nas execuções seguintes.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from cache_planilhas import hash_arquivo
+
+ESTRATEGIAS_PADRAO = ['pandas', 'openpyxl', 'xlrd']
+
+ARQUIVO_ESTRATEGIAS = Path('cache') / 'estrategias_leitura.json'
+
+
+class MemoriaEstrategias:
+    """Estratégia de leitura que funcionou para cada arquivo (pelo SHA-256)"""
+
+    def __init__(self, caminho=ARQUIVO_ESTRATEGIAS):
+        self.caminho = Path(caminho)
+        self._estrategias: Optional[Dict[str, str]] = None
+
+    def _carregar(self) -> Dict[str, str]:
+        if self._estrategias is None:
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    self._estrategias = json.load(f)
+            except (OSError, ValueError):
+                self._estrategias = {}
+        return self._estrategias
+
+    def obter(self, impressao: str) -> Optional[str]:
+        return self._carregar().get(impressao)
+
+    def registrar(self, impressao: str, estrategia: str):
+        estrategias = self._carregar()
+        if estrategias.get(impressao) == estrategia:
+            return
+        estrategias[impressao] = estrategia
+        try:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.caminho, 'w', encoding='utf-8') as f:
+                json.dump(estrategias, f, indent=2)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar {self.caminho}: {e}")
+
+
+class SessaoLeitura:
+    """
+    Handles abertos de um arquivo, um por estratégia, compartilhados entre
+    as abas.
+
+    Use como gerenciador de contexto (ou chame ``fechar``) para liberar os
+    arquivos e gravar a estratégia vencedora na memória.
+    """
+
+    def __init__(self, arquivo, estrategias: Sequence[str] = ESTRATEGIAS_PADRAO,
+                 memoria: Optional[MemoriaEstrategias] = None):
+        self.arquivo = arquivo
+        self.memoria = memoria
+        self.impressao = hash_arquivo(arquivo) if memoria is not None else None
+        self.estrategias = list(estrategias)
+
+        # A estratégia que funcionou da última vez vai para o início
+        lembrada = memoria.obter(self.impressao) if memoria is not None else None
+        if lembrada in self.estrategias:
+            self.estrategias.remove(lembrada)
+            self.estrategias.insert(0, lembrada)
+
+        self.estrategia: Optional[str] = None
+        self._handles: Dict[str, Any] = {}
+        self._falhas: Dict[str, str] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _abrir(self, estrategia: str):
+        if estrategia in self._falhas:
+            raise RuntimeError(self._falhas[estrategia])
+        if estrategia not in self._handles:
+            try:
+                if estrategia == 'pandas':
+                    handle = pd.ExcelFile(self.arquivo)
+                elif estrategia == 'openpyxl':
+                    from openpyxl import load_workbook
+                    handle = load_workbook(self.arquivo, data_only=True, read_only=True)
+                elif estrategia == 'xlrd':
+                    import xlrd
+                    handle = xlrd.open_workbook(self.arquivo)
+                else:
+                    raise ValueError(f"Estratégia desconhecida: {estrategia}")
+            except Exception as e:
+                self._falhas[estrategia] = f"não foi possível abrir o arquivo: {e}"
+                raise RuntimeError(self._falhas[estrategia])
+            self._handles[estrategia] = handle
+        return self._handles[estrategia]
+
+    def abas(self) -> List[str]:
+        """Nomes das abas, pela primeira estratégia que abrir o arquivo"""
+        erros = []
+        for estrategia in self.estrategias:
+            try:
+                handle = self._abrir(estrategia)
+            except Exception as e:
+                erros.append(f"{estrategia}: {e}")
+                continue
+            if estrategia == 'xlrd':
+                return handle.sheet_names()
+            return list(handle.sheet_names if estrategia == 'pandas' else handle.sheetnames)
+        raise Exception(f"Não foi possível abrir o arquivo: {'; '.join(erros)}")
+
+    def _ler(self, estrategia: str, aba: str) -> pd.DataFrame:
+        handle = self._abrir(estrategia)
+        if estrategia == 'pandas':
+            return handle.parse(aba)
+        if estrategia == 'openpyxl':
+            return pd.DataFrame(handle[aba].values)
+        ws = handle.sheet_by_name(aba)
+        return pd.DataFrame([ws.row_values(i) for i in range(ws.nrows)])
+
+    def ler(self, aba: str) -> Tuple[pd.DataFrame, str, List[str]]:
+        """
+        Lê uma aba, tentando as estratégias em ordem.
+
+        Args:
+            aba (str): Nome da aba
+
+        Returns:
+            tuple: (dados brutos, estratégia usada, erros das estratégias que falharam)
+        """
+        erros = []
+        dados, usada = None, None
+        for estrategia in self.estrategias:
+            try:
+                dados, usada = self._ler(estrategia, aba), estrategia
+            except Exception as e:
+                erros.append(f"Erro na estratégia {estrategia}: {str(e)}")
+                continue
+            if not dados.empty:
+                break
+
+        if dados is None:
+            raise Exception(f"Todas as estratégias falharam: {'; '.join(erros)}")
+        if not dados.empty and self.estrategia is None:
+            self.estrategia = usada
+        return dados, usada, erros
+
+    def fechar(self):
+        """Fecha os handles abertos e registra a estratégia que funcionou"""
+        for estrategia, handle in self._handles.items():
+            try:
+                if estrategia == 'xlrd':
+                    handle.release_resources()
+                else:
+                    handle.close()
+            except Exception:
+                pass
+        self._handles.clear()
+        if self.memoria is not None and self.estrategia is not None:
+            self.memoria.registrar(self.impressao, self.estrategia)
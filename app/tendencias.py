@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ajuste de Tendências em Lote
+============================
+Regressão linear simples (mínimos quadrados, forma fechada) de muitas séries
+de uma vez.
+
+As séries ficam empilhadas em um array ``(..., pontos)`` — por exemplo
+``(colaboradores, métricas, dias)`` — completado com NaN onde uma série é mais
+curta ou não tem valor. Inclinação, intercepto, R² e correlação de todas as
+séries saem de somas ao longo do último eixo, sem laço em Python e sem criar
+um modelo por série.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class AjusteTendencias:
+    """Resultado do ajuste; cada array tem a forma das séries sem o último eixo"""
+    pontos: np.ndarray      # pontos válidos em cada série
+    inclinacao: np.ndarray
+    intercepto: np.ndarray
+    r2: np.ndarray          # NaN quando a série é constante (variância nula)
+    correlacao: np.ndarray  # NaN quando x ou y é constante
+    x_medio: np.ndarray
+    y_medio: np.ndarray
+
+    def prever(self, x) -> np.ndarray:
+        """Valores da reta de cada série em ``x`` (escalar ou array ``(..., k)``)"""
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 0:
+            return self.inclinacao * x + self.intercepto
+        return self.inclinacao[..., None] * x + self.intercepto[..., None]
+
+
+def ajustar_tendencias(y, x=None) -> AjusteTendencias:
+    """
+    Ajusta ``y = inclinacao * x + intercepto`` em cada série.
+
+    Args:
+        y (array): Séries empilhadas ``(..., pontos)``; NaN marca ausência
+        x (array, optional): Abscissas com forma compatível com ``y`` (NaN
+            também marca ausência). Sem ``x``, usa 0, 1, 2, ... no último eixo.
+
+    Returns:
+        AjusteTendencias: Coeficientes de todas as séries. Séries com menos de
+        dois pontos, ou com x constante, ficam com inclinação 0 e intercepto
+        igual à média.
+    """
+    y = np.asarray(y, dtype=float)
+    if x is None:
+        x = np.arange(y.shape[-1], dtype=float)
+    x = np.broadcast_to(np.asarray(x, dtype=float), y.shape)
+
+    mascara = ~(np.isnan(y) | np.isnan(x))
+    pontos = mascara.sum(axis=-1)
+    x0 = np.where(mascara, x, 0.0)
+    y0 = np.where(mascara, y, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_medio = x0.sum(axis=-1) / pontos
+        y_medio = y0.sum(axis=-1) / pontos
+
+        # Somas centradas (mais estáveis que as somas brutas de x² e xy)
+        dx = np.where(mascara, x - x_medio[..., None], 0.0)
+        dy = np.where(mascara, y - y_medio[..., None], 0.0)
+        sxx = (dx * dx).sum(axis=-1)
+        syy = (dy * dy).sum(axis=-1)
+        sxy = (dx * dy).sum(axis=-1)
+
+        inclinacao = np.where(sxx > 0, sxy / sxx, 0.0)
+        intercepto = y_medio - inclinacao * x_medio
+        residuo = np.where(mascara, dy - inclinacao[..., None] * dx, 0.0)
+        sres = (residuo * residuo).sum(axis=-1)
+
+        r2 = np.where(syy > 0, 1 - sres / syy, np.nan)
+        correlacao = np.where((sxx > 0) & (syy > 0), sxy / np.sqrt(sxx * syy), np.nan)
+
+    return AjusteTendencias(
+        pontos=pontos,
+        inclinacao=inclinacao,
+        intercepto=intercepto,
+        r2=r2,
+        correlacao=correlacao,
+        x_medio=x_medio,
+        y_medio=y_medio
+    )
+
+
+def empilhar_series(grupos: np.ndarray, *series: Sequence,
+                    n_grupos: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+    """
+    Monta arrays ``(grupos, pontos)`` a partir de séries em formato longo.
+
+    Args:
+        grupos (ndarray): Grupo (0..n-1) de cada ponto; os pontos de um grupo
+            entram na ordem em que aparecem
+        *series (array): Um valor por ponto (ex.: as abscissas e os valores)
+        n_grupos (int, optional): Quantidade de grupos (padrão: maior + 1)
+
+    Returns:
+        tuple: Um array completado com NaN para cada série
+    """
+    grupos = np.asarray(grupos, dtype=np.int64)
+    if n_grupos is None:
+        n_grupos = int(grupos.max()) + 1 if len(grupos) else 0
+
+    ordem = np.argsort(grupos, kind='stable')
+    g = grupos[ordem]
+    tamanhos = np.bincount(g, minlength=n_grupos)
+    inicio = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+    posicao = np.arange(len(g)) - inicio[g]
+
+    largura = int(tamanhos.max()) if len(tamanhos) else 0
+    empilhados = []
+    for serie in series:
+        matriz = np.full((n_grupos, largura), np.nan)
+        matriz[g, posicao] = np.asarray(serie, dtype=float)[ordem]
+        empilhados.append(matriz)
+    return tuple(empilhados)
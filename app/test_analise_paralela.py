@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+sys.path.append(os.path.dirname(current_dir))
+
+import analise_paralela
+from analise_paralela import analisar_arquivo_paralelo
+from carregador_planilhas import limpar_carregadores
+from motores_excel import definir_motor_padrao
+
+
+def criar_planilha(caminho, abas):
+    """Cria um arquivo Excel com uma aba por item do dicionário"""
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        for nome, df in abas.items():
+            df.to_excel(writer, sheet_name=nome, index=False)
+
+
+def sem_grafico(resultados):
+    """Remove o caminho do gráfico (nome com timestamp) para comparar resultados"""
+    return {
+        chave: {**item, 'dados': {k: v for k, v in item['dados'].items() if k != 'grafico_path'}}
+        for chave, item in resultados.items()
+    }
+
+
+class TestAnaliseParalela(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.diretorio_original = os.getcwd()
+        os.chdir(self.tmp.name)
+        limpar_carregadores()
+
+        datas = pd.date_range('2025-03-01', periods=6).strftime('%d/%m/%Y')
+        self.arquivos = {
+            'julio': os.path.join(self.tmp.name, 'julio.xlsx'),
+            'leandro': os.path.join(self.tmp.name, 'leandro.xlsx'),
+        }
+        criar_planilha(self.arquivos['julio'], {
+            'RESUMO': pd.DataFrame({'TOTAL': [1]}),
+            'AMANDA': pd.DataFrame({'DATA': datas, 'SITUAÇÃO': ['PENDENTE', 'QUITADO'] * 3}),
+            'IGOR': pd.DataFrame({'DATA': datas[:3], 'SITUAÇÃO': ['APROVADO', None, 'ERRO']}),
+        })
+        criar_planilha(self.arquivos['leandro'], {
+            'VITORIA': pd.DataFrame({'DATA': datas, 'SITUAÇÃO': ['VERIFICADO'] * 6}),
+            'NUNO': pd.DataFrame({'DATA': datas[:2], 'SITUAÇÃO': ['CANCELADO', 'PENDENTE']}),
+        })
+
+    def tearDown(self):
+        limpar_carregadores()
+        os.chdir(self.diretorio_original)
+        self.tmp.cleanup()
+
+    def test_paralelo_igual_ao_sequencial_e_na_mesma_ordem(self):
+        sequencial = analisar_arquivo_paralelo(self.arquivos, max_workers=1)
+        paralelo = analisar_arquivo_paralelo(self.arquivos, max_workers=3)
+
+        ordem = ['julio_AMANDA', 'julio_IGOR', 'leandro_VITORIA', 'leandro_NUNO']
+        self.assertEqual(list(sequencial.keys()), ordem)
+        self.assertEqual(list(paralelo.keys()), ordem)
+        # repr: tempos médios podem conter NaN, que não é igual a si mesmo
+        self.assertEqual(repr(sem_grafico(paralelo)), repr(sem_grafico(sequencial)))
+        self.assertTrue(all(item['dados']['status'] == 'SUCESSO' for item in paralelo.values()))
+
+    def test_paralelo_com_cache_frio(self):
+        # O pai abre o workbook para listar as abas; os processos não podem
+        # herdar esse handle (ler pelo mesmo offset corrompe o XML)
+        abas = {f'COLAB{i:02d}': pd.DataFrame({'DATA': ['01/03/2025'] * 40, 'SITUAÇÃO': ['PENDENTE'] * 40})
+                for i in range(12)}
+        criar_planilha(self.arquivos['julio'], abas)
+        definir_motor_padrao('openpyxl')
+        try:
+            resultados = analisar_arquivo_paralelo({'julio': self.arquivos['julio']}, max_workers=6)
+        finally:
+            definir_motor_padrao('auto')
+        self.assertEqual(len(resultados), 12)
+        self.assertEqual({item['dados']['status'] for item in resultados.values()}, {'SUCESSO'})
+
+    def test_um_processo_nao_cria_pool(self):
+        with mock.patch.object(analise_paralela, 'ProcessPoolExecutor', side_effect=AssertionError('pool criado')):
+            resultados = analisar_arquivo_paralelo(self.arquivos, max_workers=1)
+        self.assertEqual(len(resultados), 4)
+
+    def test_pool_indisponivel_cai_para_sequencial(self):
+        with mock.patch.object(analise_paralela, 'ProcessPoolExecutor', side_effect=OSError('sem processos')):
+            resultados = analisar_arquivo_paralelo(self.arquivos, max_workers=4)
+        self.assertEqual(list(resultados.keys()), ['julio_AMANDA', 'julio_IGOR', 'leandro_VITORIA', 'leandro_NUNO'])
+        self.assertTrue(all(item['dados']['status'] == 'SUCESSO' for item in resultados.values()))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+import datetime
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from base_contratos import BaseContratos, compactar_registros
+
+
+def aba(rng, n, status=('PENDENTE', 'QUITADO', 'APROVADO', 'ANÁLISE')):
+    return pd.DataFrame({
+        'CONTRATO': rng.integers(10**6, 10**7, n).astype(str),
+        'STATUS': pd.Series(rng.choice(status, n), dtype=object),
+        'BANCO': pd.Series(rng.choice(['ITAU', 'BRADESCO', 'SANTANDER'], n), dtype=object),
+        'DATA': pd.Series([datetime.datetime(2024, 1, 1) + datetime.timedelta(days=int(d))
+                           for d in rng.integers(0, 90, n)], dtype=object),
+        'PARCELAS': rng.integers(1, 60, n),
+        'DIA': datetime.date(2024, 5, 2),
+    })
+
+
+class TestBaseContratos(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.abas = {(grupo, f'COLAB {i}'): aba(rng, 500) for grupo in ('julio', 'leandro') for i in range(4)}
+        self.base = BaseContratos()
+        for (grupo, colaborador), df in self.abas.items():
+            self.base.adicionar(grupo, colaborador, df)
+
+    def test_tipos_compactos(self):
+        tipos = self.base.dados.dtypes
+        for coluna in ('GRUPO', 'COLABORADOR', 'STATUS', 'BANCO'):
+            self.assertIsInstance(tipos[coluna], pd.CategoricalDtype, coluna)
+        self.assertEqual(tipos['DATA'], np.dtype('datetime64[ns]'))
+        self.assertEqual(tipos['DIA'], np.dtype('datetime64[ns]'))
+        self.assertEqual(tipos['PARCELAS'], np.int32)
+        # Texto com muitos valores distintos continua como object
+        self.assertEqual(tipos['CONTRATO'], object)
+
+    def test_memoria_menor_que_as_abas(self):
+        original = sum(df.memory_usage(deep=True).sum() for df in self.abas.values())
+        self.assertLess(self.base.memoria() * 3, original)
+
+    def test_registros_de_um_colaborador(self):
+        df = self.base.registros('leandro', 'COLAB 2')
+        original = self.abas[('leandro', 'COLAB 2')]
+        self.assertEqual(len(df), len(original))
+        self.assertEqual(df['STATUS'].astype(object).tolist(), original['STATUS'].tolist())
+        self.assertEqual(df['DATA'].tolist(), pd.to_datetime(original['DATA']).tolist())
+        self.assertEqual(set(df['COLABORADOR']), {'COLAB 2'})
+        self.assertEqual(list(df['BANCO'].cat.categories), sorted(original['BANCO'].unique()))
+
+    def test_contagem_status(self):
+        esperado = self.abas[('julio', 'COLAB 1')]['STATUS'].value_counts().to_dict()
+        self.assertEqual(self.base.contagem_status('julio', 'COLAB 1'), esperado)
+        total = pd.concat([df for (g, _), df in self.abas.items() if g == 'julio'])['STATUS'].value_counts()
+        self.assertEqual(self.base.contagem_status('julio'), total.to_dict())
+
+    def test_visao_do_grupo(self):
+        visao = self.base.visao('julio')
+        self.assertEqual(list(visao), [f'COLAB {i}' for i in range(4)])
+        self.assertEqual(len(visao['COLAB 0']), 500)
+        self.assertIsNone(visao.get('COLAB 9'))
+        self.assertEqual(self.base.grupos(), ['julio', 'leandro'])
+
+    def test_abas_com_colunas_diferentes(self):
+        base = BaseContratos()
+        base.adicionar('julio', 'AMANDA', pd.DataFrame({'STATUS': ['QUITADO', 'PENDENTE'], 'PARCELAS': [3, 4]}))
+        base.adicionar('julio', 'IGOR', pd.DataFrame({'STATUS': ['APROVADO'], 'OBS': ['ligar']}))
+        self.assertEqual(str(base.dados['PARCELAS'].dtype), 'Int32')
+        self.assertEqual(list(base.registros('julio', 'IGOR').columns), ['GRUPO', 'COLABORADOR', 'STATUS', 'OBS'])
+        self.assertEqual(base.contagem_status('julio', 'IGOR'), {'APROVADO': 1})
+
+        # Adicionar de novo substitui os registros do colaborador
+        base.adicionar('julio', 'AMANDA', pd.DataFrame({'STATUS': ['CANCELADO']}))
+        self.assertEqual(len(base), 2)
+        self.assertEqual(base.contagem_status('julio', 'AMANDA'), {'CANCELADO': 1})
+
+    def test_compactar_mantem_valores(self):
+        df = pd.DataFrame({'N': np.array([1, 2], dtype=np.int64), 'MISTO': ['a', 1],
+                           'GRANDE': np.array([2**40, 1], dtype=np.int64)})
+        compacto = compactar_registros(df)
+        self.assertEqual(compacto['N'].dtype, np.int32)
+        self.assertEqual(compacto['GRANDE'].dtype, np.int64)
+        self.assertEqual(compacto['MISTO'].tolist(), ['a', 1])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
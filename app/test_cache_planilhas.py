@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import cache_planilhas
+from cache_planilhas import CachePlanilhas
+from carregador_planilhas import CarregadorPlanilhas
+
+
+def criar_planilha(caminho, abas):
+    """Cria um arquivo Excel com uma aba por item do dicionário"""
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        for nome, df in abas.items():
+            df.to_excel(writer, sheet_name=nome, index=False)
+
+
+class TestCachePlanilhas(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.arquivo = os.path.join(self.tmp.name, '(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx')
+        self.abas = {
+            'VITORIA': pd.DataFrame({
+                'DATA': [datetime(2025, 3, 1), datetime(2025, 3, 2)],
+                'SITUACAO': ['PENDENTE', None],
+                'CONTRATO': [123, 456]
+            }),
+            # Coluna com tipos misturados não vai para Parquet
+            'NUNO': pd.DataFrame({'DATA': ['01/03/2025', 45000], 'SITUACAO': ['QUITADO', 'APROVADO']}),
+        }
+        criar_planilha(self.arquivo, self.abas)
+        self.cache = CachePlanilhas(os.path.join(self.tmp.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def carregar(self):
+        with CarregadorPlanilhas(self.arquivo, cache=self.cache) as carregador:
+            return carregador.ler_abas()
+
+    def test_segunda_leitura_nao_abre_o_excel(self):
+        primeira = self.carregar()
+
+        # Novo objeto de cache: força a leitura do manifesto gravado em disco
+        self.cache = CachePlanilhas(self.cache.diretorio)
+        with mock.patch('carregador_planilhas.pd.ExcelFile', side_effect=AssertionError('Excel reaberto')):
+            segunda = self.carregar()
+
+        self.assertEqual(list(segunda.keys()), ['VITORIA', 'NUNO'])
+        for aba in primeira:
+            pd.testing.assert_frame_equal(segunda[aba], primeira[aba])
+
+    @unittest.skipUnless(cache_planilhas.PARQUET_DISPONIVEL, 'pyarrow não instalado')
+    def test_formato_por_aba(self):
+        self.carregar()
+        manifesto = self.cache.manifesto_valido(self.arquivo)
+        self.assertEqual(manifesto['arquivos_abas']['VITORIA']['formato'], 'parquet')
+        self.assertEqual(manifesto['arquivos_abas']['NUNO']['formato'], 'pickle')
+
+    def test_edicao_invalida_o_cache(self):
+        self.carregar()
+        self.abas['NUNO'] = pd.DataFrame({'DATA': ['05/03/2025'], 'SITUACAO': ['CANCELADO']})
+        criar_planilha(self.arquivo, self.abas)
+
+        dados = self.carregar()
+        self.assertEqual(dados['NUNO']['SITUACAO'].tolist(), ['CANCELADO'])
+
+    def test_touch_sem_alterar_conteudo_mantem_cache(self):
+        self.carregar()
+        stat = os.stat(self.arquivo)
+        os.utime(self.arquivo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with mock.patch('carregador_planilhas.pd.ExcelFile', side_effect=AssertionError('Excel reaberto')):
+            dados = self.carregar()
+        self.assertEqual(dados['NUNO']['SITUACAO'].tolist(), ['QUITADO', 'APROVADO'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,143 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import carregador_planilhas
+from carregador_planilhas import CarregadorPlanilhas, obter_carregador, limpar_carregadores, projetar_colunas
+
+
+def criar_planilha(caminho, abas):
+    """Cria um arquivo Excel com uma aba por item do dicionário"""
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        for nome, df in abas.items():
+            df.to_excel(writer, sheet_name=nome, index=False)
+
+
+class TestCarregadorPlanilhas(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.arquivo = os.path.join(self.tmp.name, '(JULIO) LISTAS INDIVIDUAIS.xlsx')
+        self.abas = {
+            'RESUMO': pd.DataFrame({'TOTAL': [3]}),
+            'AMANDA': pd.DataFrame({'DATA': ['01/03/2025', '02/03/2025'], 'SITUACAO': ['PENDENTE', 'QUITADO']}),
+            'IGOR': pd.DataFrame({'DATA': ['03/03/2025'], 'SITUACAO': ['APROVADO']}),
+        }
+        criar_planilha(self.arquivo, self.abas)
+        limpar_carregadores()
+
+    def tearDown(self):
+        limpar_carregadores()
+        self.tmp.cleanup()
+
+    def test_le_todas_as_abas_abrindo_o_arquivo_uma_vez(self):
+        abrir = carregador_planilhas.abrir_planilha
+        with mock.patch.object(carregador_planilhas, 'abrir_planilha', wraps=abrir) as abrir_planilha:
+            carregador = CarregadorPlanilhas(self.arquivo)
+            dados = carregador.ler_abas()
+            carregador.ler_aba('AMANDA')
+            carregador.fechar()
+
+        self.assertEqual(abrir_planilha.call_count, 1)
+        self.assertEqual(list(dados.keys()), ['AMANDA', 'IGOR'])
+        pd.testing.assert_frame_equal(dados['AMANDA'], self.abas['AMANDA'])
+
+    def test_abas_entregues_sao_copias(self):
+        carregador = obter_carregador(self.arquivo, usar_cache=False)
+        df = carregador.ler_aba('IGOR')
+        df['SITUACAO'] = 'ALTERADO'
+        self.assertEqual(carregador.ler_aba('IGOR')['SITUACAO'].tolist(), ['APROVADO'])
+
+    def test_carregador_compartilhado_e_renovado_apos_edicao(self):
+        primeiro = obter_carregador(self.arquivo, usar_cache=False)
+        self.assertIs(obter_carregador(self.arquivo, usar_cache=False), primeiro)
+
+        time.sleep(0.01)
+        self.abas['IGOR'] = pd.DataFrame({'DATA': ['04/03/2025'], 'SITUACAO': ['CANCELADO']})
+        criar_planilha(self.arquivo, self.abas)
+
+        novo = obter_carregador(self.arquivo, usar_cache=False)
+        self.assertIsNot(novo, primeiro)
+        self.assertEqual(novo.ler_aba('IGOR')['SITUACAO'].tolist(), ['CANCELADO'])
+
+
+    def test_projecao_de_colunas(self):
+        self.abas['AMANDA'] = pd.DataFrame({
+            'Data': ['01/03/2025', '02/03/2025'], 'OBS': ['a', 'b'],
+            'Situação': ['PENDENTE', 'QUITADO'], 'BANCO': ['X', 'Y'], 'RESOLUÇÃO': [None, '05/03/2025']
+        })
+        criar_planilha(self.arquivo, self.abas)
+        colunas = {'SITUACAO': 'category', 'DATA': None, 'BANCO': None, 'CONTRATO': None}
+
+        carregador = CarregadorPlanilhas(self.arquivo)
+        with mock.patch.object(carregador.xls, 'parse', wraps=carregador.xls.parse) as parse:
+            df = carregador.ler_aba('AMANDA', colunas)
+            carregador.ler_aba('AMANDA', colunas)
+        self.assertEqual(parse.call_args.kwargs['usecols'], [0, 2, 3])
+        self.assertEqual(parse.call_count, 2)  # cabeçalho + colunas usadas, uma vez só
+
+        self.assertEqual(list(df.columns), ['Data', 'Situação', 'BANCO'])
+        self.assertIsInstance(df['Situação'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['BANCO'].tolist(), ['X', 'Y'])
+
+        # Com a aba inteira já lida, a projeção sai dela
+        outro = CarregadorPlanilhas(self.arquivo)
+        outro.ler_aba('AMANDA')
+        with mock.patch.object(outro.xls, 'parse') as parse:
+            pd.testing.assert_frame_equal(outro.ler_aba('AMANDA', colunas), df)
+        parse.assert_not_called()
+
+    def test_projecao_por_trecho_do_nome(self):
+        # AnalisadorInteligente acha as colunas de hora e tipo por substring
+        cabecalhos = ['DATA', 'SITUAÇÃO', 'HORA ATENDIMENTO', 'TIPO CONTRATO', 'BANCO', 'Categoria_Cliente']
+        posicoes, tipos = projetar_colunas(cabecalhos, {'SITUACAO': 'category', 'DATA': None, '*HORA*': None,
+                                                        '*TIPO*': 'category', '*CATEGORIA*': None})
+        self.assertEqual(posicoes, [0, 1, 2, 3, 5])
+        self.assertEqual(tipos, {'SITUAÇÃO': 'category', 'TIPO CONTRATO': 'category'})
+
+        # Sem asteriscos o nome precisa ser igual ao cabeçalho inteiro
+        self.assertEqual(projetar_colunas(cabecalhos, ['HORA', 'TIPO'])[0], [])
+
+    def test_projecao_le_todas_as_colunas_do_nome_canonico(self):
+        # DATA CADASTRO e DATA são alternativas de DATA; STATUS e SITUAÇÃO, de SITUACAO
+        arquivo = os.path.join(self.tmp.name, 'duplicadas.xlsx')
+        criar_planilha(arquivo, {'AMANDA': pd.DataFrame({
+            'DATA CADASTRO': ['01/03/2025'], 'DATA': ['02/03/2025'], 'STATUS': ['A'],
+            'SITUAÇÃO': ['PENDENTE'], 'RESOLUÇÃO': ['03/03/2025'], 'BANCO': ['X'],
+        })})
+        df = CarregadorPlanilhas(arquivo).ler_aba('AMANDA', {'DATA': None, 'RESOLUCAO': None, 'SITUACAO': 'category'})
+        self.assertEqual(list(df.columns), ['DATA CADASTRO', 'DATA', 'STATUS', 'SITUAÇÃO', 'RESOLUÇÃO'])
+        self.assertEqual(df['DATA'].tolist(), ['02/03/2025'])
+        self.assertEqual(str(df['SITUAÇÃO'].dtype), 'category')
+
+    def test_projecao_de_nome_literal_fora_da_configuracao(self):
+        arquivo = os.path.join(self.tmp.name, 'tempo.xlsx')
+        criar_planilha(arquivo, {'AMANDA': pd.DataFrame({
+            'DATA': ['01/03/2025'], 'SITUAÇÃO': ['APROVADO'], 'TEMPO_PROCESSAMENTO': [4.5], 'BANCO': ['X'],
+        })})
+        df = CarregadorPlanilhas(arquivo).ler_aba('AMANDA', ['SITUACAO', 'STATUS', 'DATA', 'TEMPO_PROCESSAMENTO'])
+        self.assertEqual(list(df.columns), ['DATA', 'SITUAÇÃO', 'TEMPO_PROCESSAMENTO'])
+        self.assertEqual(df['TEMPO_PROCESSAMENTO'].tolist(), [4.5])
+
+    def test_projecao_gravada_no_cache(self):
+        from cache_planilhas import CachePlanilhas
+        cache = CachePlanilhas(os.path.join(self.tmp.name, 'cache'))
+        primeiro = CarregadorPlanilhas(self.arquivo, cache=cache)
+        df = primeiro.ler_aba('IGOR', ['SITUACAO'])
+        self.assertEqual(list(df.columns), ['SITUACAO'])
+
+        segundo = CarregadorPlanilhas(self.arquivo, cache=CachePlanilhas(cache.diretorio))
+        with mock.patch.object(carregador_planilhas, 'abrir_planilha') as abrir_planilha:
+            pd.testing.assert_frame_equal(segundo.ler_aba('IGOR', ['SITUACAO']), df)
+        abrir_planilha.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
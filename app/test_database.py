@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from database import Base, Colaborador, salvar_colaboradores, criar_indice_snapshot
+
+
+def colaborador(nome, score, grupo='JULIO'):
+    return {
+        'nome': nome,
+        'grupo': grupo,
+        'score': score,
+        'taxa_preenchimento': 90.0,
+        'taxa_padronizacao': 80.0,
+        'consistencia': 70.0,
+        'metricas_detalhadas': {'score': score, 'problemas': []}
+    }
+
+
+class TestSalvarColaboradores(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_mesmo_dia_atualiza_em_vez_de_duplicar(self):
+        manha = datetime(2025, 3, 10, 9, 0)
+        tarde = datetime(2025, 3, 10, 17, 30)
+
+        salvar_colaboradores(self.db, [colaborador('AMANDA', 50.0), colaborador('IGOR', 60.0)], manha)
+        self.db.commit()
+        salvar_colaboradores(self.db, [colaborador('AMANDA', 75.0)], tarde)
+        self.db.commit()
+
+        linhas = self.db.query(Colaborador).order_by(Colaborador.nome).all()
+        self.assertEqual([(c.nome, c.score) for c in linhas], [('AMANDA', 75.0), ('IGOR', 60.0)])
+        self.assertEqual(linhas[0].metricas_detalhadas, {'score': 75.0, 'problemas': []})
+        self.assertEqual(linhas[0].data_analise, datetime(2025, 3, 10))
+
+    def test_outro_dia_ou_grupo_gera_novo_snapshot(self):
+        salvar_colaboradores(self.db, [colaborador('AMANDA', 50.0)], datetime(2025, 3, 10))
+        salvar_colaboradores(self.db, [colaborador('AMANDA', 55.0)], datetime(2025, 3, 11))
+        salvar_colaboradores(self.db, [colaborador('AMANDA', 40.0, grupo='LEANDRO')], datetime(2025, 3, 11))
+        self.db.commit()
+        self.assertEqual(self.db.query(Colaborador).count(), 3)
+
+    def test_milhares_de_colaboradores_em_lote(self):
+        lote = [colaborador(f'COLABORADOR {i}', float(i)) for i in range(3000)]
+        self.assertEqual(salvar_colaboradores(self.db, lote, datetime(2025, 3, 10)), 3000)
+        self.db.commit()
+        self.assertEqual(self.db.query(Colaborador).count(), 3000)
+
+
+class TestIndiceSnapshot(unittest.TestCase):
+    def test_banco_antigo_recebe_indice_e_perde_duplicados(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'colaboradores.db')}")
+            # Tabela criada pela versão anterior, sem o índice único
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE TABLE colaboradores (id INTEGER PRIMARY KEY, nome VARCHAR, grupo VARCHAR, score FLOAT, "
+                    "taxa_preenchimento FLOAT, taxa_padronizacao FLOAT, consistencia FLOAT, data_analise DATETIME, "
+                    "metricas_detalhadas JSON)"
+                ))
+                for score in (10.0, 20.0):
+                    conn.execute(text(
+                        "INSERT INTO colaboradores (nome, grupo, score, data_analise) "
+                        "VALUES ('AMANDA', 'JULIO', :score, '2025-03-10 00:00:00.000000')"
+                    ), {'score': score})
+
+            criar_indice_snapshot(engine)
+            criar_indice_snapshot(engine)
+
+            with engine.connect() as conn:
+                self.assertEqual(conn.execute(text("SELECT score FROM colaboradores")).fetchall(), [(20.0,)])
+            db = sessionmaker(bind=engine)()
+            salvar_colaboradores(db, [colaborador('AMANDA', 30.0)], datetime(2025, 3, 10, 15))
+            db.commit()
+            self.assertEqual([c.score for c in db.query(Colaborador).all()], [30.0])
+            db.close()
+            engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
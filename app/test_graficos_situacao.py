@@ -0,0 +1,83 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from graficos_situacao import (caminho_grafico, dados_grafico_situacao, renderizar_graficos_resultados,
+                               renderizar_graficos_situacao)
+
+
+class TestGraficosSituacao(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.diretorio = os.path.join(self.tmp.name, 'graficos')
+        self.graficos = [
+            dados_grafico_situacao('AMANDA SILVA', {'PENDENTE': 3, 'QUITADO': 1}),
+            None,
+            dados_grafico_situacao('IGOR', {'APROVADO': 2}),
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def renderizar(self, graficos):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return renderizar_graficos_situacao(graficos, self.diretorio)
+
+    def test_gera_pngs_na_ordem_da_entrada(self):
+        caminhos = self.renderizar(self.graficos)
+        self.assertIsNone(caminhos[1])
+        self.assertIn('situacao_AMANDA_SILVA_', caminhos[0])
+        for caminho in (caminhos[0], caminhos[2]):
+            with open(caminho, 'rb') as f:
+                self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(len(os.listdir(self.diretorio)), 2)
+
+    def test_graficos_existentes_nao_sao_redesenhados(self):
+        self.renderizar(self.graficos)
+        from matplotlib.figure import Figure
+        with mock.patch.object(Figure, 'savefig') as savefig:
+            caminhos = self.renderizar(self.graficos)
+        savefig.assert_not_called()
+        self.assertTrue(all(os.path.exists(c) for c in caminhos if c))
+
+        # Só o gráfico com distribuição alterada é desenhado de novo
+        alterados = [self.graficos[0], dados_grafico_situacao('IGOR', {'APROVADO': 3})]
+        self.assertNotEqual(caminho_grafico(alterados[1], self.diretorio), caminhos[2])
+        self.renderizar(alterados)
+        self.assertEqual(len(os.listdir(self.diretorio)), 3)
+
+    def test_sem_situacoes_nao_ha_grafico(self):
+        self.assertIsNone(dados_grafico_situacao('NUNO', {}))
+        self.assertEqual(self.renderizar([None]), [None])
+        self.assertFalse(os.path.exists(self.diretorio))
+
+    def test_preenche_caminhos_dos_resultados(self):
+        resultados = {
+            'julio_AMANDA': {'grupo': 'julio', 'dados': {'grafico': self.graficos[0], 'grafico_path': None}},
+            'julio_IGOR': {'grupo': 'julio', 'dados': {'erro': 'falha', 'status': 'FALHA'}},
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            renderizar_graficos_resultados(resultados, self.diretorio)
+        self.assertTrue(os.path.exists(resultados['julio_AMANDA']['dados']['grafico_path']))
+        self.assertIsNone(resultados['julio_IGOR']['dados']['grafico_path'])
+
+    def test_analise_nao_importa_matplotlib(self):
+        codigo = (
+            "import sys; sys.path.insert(0, sys.argv[1]); sys.path.append(sys.argv[2]); "
+            "import analise_paralela; print('matplotlib' in sys.modules)"
+        )
+        saida = subprocess.run([sys.executable, '-c', codigo, current_dir, os.path.dirname(current_dir)],
+                               capture_output=True, text=True, cwd=self.tmp.name)
+        self.assertEqual(saida.stdout.strip().splitlines()[-1], 'False', saida.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from carregador_planilhas import limpar_carregadores
+from jobs import CONCLUIDO, ERRO, EXECUTANDO, GerenciadorJobs
+from metricas_incrementais import MetricasIncrementais
+
+
+def aguardar(job, timeout=10):
+    """Espera o job terminar (o gerenciador não expõe o Future)"""
+    limite = time.monotonic() + timeout
+    while not job.finalizado:
+        if time.monotonic() > limite:
+            raise AssertionError(f'job {job.id} não terminou')
+        time.sleep(0.01)
+
+
+class TestJobs(unittest.TestCase):
+    def setUp(self):
+        self.gerenciador = GerenciadorJobs()
+
+    def tearDown(self):
+        self.gerenciador.encerrar()
+
+    def test_job_concluido_com_resultado_e_progresso(self):
+        def tarefa(job):
+            job.definir_etapa('processando planilhas')
+            for i, aba in enumerate(['AMANDA', 'IGOR'], 1):
+                job.registrar_aba('julio', aba, i, 2)
+            job.registrar_aba('leandro', 'VITORIA', 1, 1)
+            return {'colaboradores': 3}
+
+        job = self.gerenciador.submeter(tarefa, descricao='teste')
+        aguardar(job)
+
+        estado = job.para_dict()
+        self.assertEqual(estado['status'], CONCLUIDO)
+        self.assertEqual(job.resultado, {'colaboradores': 3})
+        self.assertEqual(estado['progresso']['abas_concluidas'], 3)
+        self.assertEqual(estado['progresso']['percentual'], 100.0)
+        self.assertEqual(estado['progresso']['arquivos']['julio']['abas'], ['AMANDA', 'IGOR'])
+        self.assertIs(self.gerenciador.obter(job.id), job)
+
+    def test_excecao_marca_job_com_erro(self):
+        def tarefa(job):
+            raise ValueError('Nenhum resultado encontrado na análise')
+
+        job = self.gerenciador.submeter(tarefa)
+        aguardar(job)
+        self.assertEqual(job.status, ERRO)
+        self.assertEqual(job.erro, 'Nenhum resultado encontrado na análise')
+        self.assertIsNone(job.resultado)
+
+    def test_estado_consultavel_enquanto_executa(self):
+        liberar = threading.Event()
+        iniciou = threading.Event()
+
+        def tarefa(job):
+            job.registrar_aba('julio', 'AMANDA', 1, 4)
+            iniciou.set()
+            liberar.wait(10)
+            return 'ok'
+
+        job = self.gerenciador.submeter(tarefa)
+        self.assertTrue(iniciou.wait(10))
+        estado = self.gerenciador.obter(job.id).para_dict()
+        self.assertEqual(estado['status'], EXECUTANDO)
+        self.assertEqual(estado['progresso']['percentual'], 25.0)
+
+        liberar.set()
+        aguardar(job)
+        self.assertEqual(job.resultado, 'ok')
+
+    def test_historico_descarta_jobs_finalizados_mais_antigos(self):
+        gerenciador = GerenciadorJobs(limite_historico=2)
+        jobs = [gerenciador.submeter(lambda job: None) for _ in range(2)]
+        for job in jobs:
+            aguardar(job)
+        ultimo = gerenciador.submeter(lambda job: None)
+        aguardar(ultimo)
+        gerenciador.encerrar()
+        self.assertIsNone(gerenciador.obter(jobs[0].id))
+        self.assertEqual([job.id for job in gerenciador.listar()], [jobs[1].id, ultimo.id])
+
+
+class TestProgressoMetricas(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.diretorio_original = os.getcwd()
+        os.chdir(self.tmp.name)
+        limpar_carregadores()
+        self.arquivo = os.path.join(self.tmp.name, 'julio.xlsx')
+        with pd.ExcelWriter(self.arquivo, engine='openpyxl') as writer:
+            pd.DataFrame({'TOTAL': [1]}).to_excel(writer, sheet_name='RESUMO', index=False)
+            pd.DataFrame({'SITUACAO': ['PENDENTE']}).to_excel(writer, sheet_name='AMANDA', index=False)
+            pd.DataFrame({'SITUACAO': ['QUITADO']}).to_excel(writer, sheet_name='IGOR', index=False)
+        self.store = MetricasIncrementais('teste', diretorio=os.path.join(self.tmp.name, 'metricas'))
+
+    def tearDown(self):
+        limpar_carregadores()
+        os.chdir(self.diretorio_original)
+        self.tmp.cleanup()
+
+    def test_progresso_por_aba_inclusive_reaproveitadas(self):
+        chamadas = []
+        for _ in range(2):
+            self.store.atualizar(self.arquivo, lambda df, aba: len(df), ignorar=['RESUMO'],
+                                 progresso=lambda aba, feitas, total: chamadas.append((aba, feitas, total)))
+        esperado = [('AMANDA', 1, 2), ('IGOR', 2, 2)]
+        self.assertEqual(chamadas, esperado * 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,137 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from metricas_colaboradores import calcular_metricas_colaboradores
+from debug_excel import AnalisadorExcel
+
+
+def calcular(df, colaboradores):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return calcular_metricas_colaboradores(df, colaboradores, verbose=False)
+
+
+class TestMetricasColaboradores(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'DATA': pd.to_datetime(['2024-01-01 09:00', '2024-01-01 15:00', '2024-01-02 00:00', '2024-01-04 00:00',
+                                    '2024-01-04 00:00', '2024-01-04 00:00']),
+            'STATUS': ['PENDENTE', 'QUITADO', 'QUITADO', 'PENDENTE', 'APROVADO', 'QUITADO'],
+            'RESOLUCAO': pd.to_datetime(['2024-01-03', None, '2024-01-02', '2024-01-30', '2024-01-05',
+                                         '2024-01-06']),
+        })
+
+    def test_metricas_conferidas_a_mao(self):
+        m = calcular(self.df, ['AMANDA'] * len(self.df))['AMANDA']
+        self.assertEqual(m['nome'], 'AMANDA')
+        self.assertEqual(m['total_registros'], 6)
+        self.assertEqual(m['distribuicao_status'], {'QUITADO': 3, 'PENDENTE': 2, 'APROVADO': 1})
+        self.assertEqual(m['distribuicao_percentual'], {'QUITADO': 50.0, 'PENDENTE': 33.3, 'APROVADO': 16.7})
+        # Tempos 1, 0, 26, 1, 2 dias: 26 fica fora do IQR
+        self.assertEqual((m['tempo_medio_resolucao'], m['tempo_mediano_resolucao']), (6.0, 1.0))
+        self.assertEqual(m['outliers_resolucao'], 1)
+        self.assertEqual(m['taxa_eficiencia'], 0.667)
+        self.assertEqual(m['medias_diarias'], {'PENDENTE': 1.0, 'QUITADO': 1.0, 'APROVADO': 1.0})
+        self.assertEqual(m['padrao_semanal'], {'Thursday': 3, 'Monday': 2, 'Tuesday': 1})
+
+    def test_tendencia_igual_a_regressao_da_contagem_diaria(self):
+        rng = np.random.default_rng(3)
+        for _ in range(30):
+            n = int(rng.integers(3, 80))
+            df = pd.DataFrame({
+                'DATA': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 15, n), unit='D'),
+                'STATUS': rng.choice(['PENDENTE', 'QUITADO'], n),
+            })
+            tendencia = calcular(df, ['X'] * n)['X']['tendencia']
+
+            diaria = df.groupby(df['DATA'].dt.normalize()).size()
+            if len(diaria) < 2:
+                self.assertEqual(tendencia, {})
+                continue
+            x = ((diaria.index - diaria.index.min()).days).to_numpy(dtype=float)
+            y = diaria.to_numpy(dtype=float)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = np.corrcoef(x, y)[0, 1]
+            if np.isnan(corr):
+                self.assertTrue(np.isnan(tendencia['correlacao']))
+            else:
+                self.assertAlmostEqual(tendencia['correlacao'], round(corr, 2))
+            slope, intercept = np.polyfit(x, y, 1)
+            self.assertAlmostEqual(tendencia['slope'], slope, delta=1e-4)
+            self.assertAlmostEqual(tendencia['intercept'], intercept, delta=1e-2)
+
+    def test_tendencia_com_dois_dias(self):
+        # 2 registros no dia 0 e 5 no dia 3: reta y = x + 2
+        df = pd.DataFrame({
+            'DATA': pd.to_datetime(['2024-01-01'] * 2 + ['2024-01-04'] * 5),
+            'STATUS': ['PENDENTE'] * 7,
+        })
+        tendencia = calcular(df, ['X'] * len(df))['X']['tendencia']
+        self.assertEqual(tendencia['direcao'], 'crescente')
+        self.assertEqual((tendencia['slope'], tendencia['intercept']), (1.0, 2.0))
+        self.assertEqual(tendencia['r2'], 0)
+
+    def test_agrupado_igual_a_cada_colaborador(self):
+        rng = np.random.default_rng(5)
+        n = 300
+        df = pd.DataFrame({
+            'COLABORADOR': rng.choice(['AMANDA', 'IGOR', 'NUNO', None], n),
+            'DATA': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 30, n), unit='D'),
+            'STATUS': rng.choice(['PENDENTE', 'QUITADO', 'ANÁLISE', None], n),
+            'RESOLUCAO': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(-3, 400, n), unit='D'),
+        })
+        df.loc[rng.random(n) < 0.1, 'DATA'] = pd.NaT
+        agrupado = calcular(df, 'COLABORADOR')
+        self.assertEqual(list(agrupado), list(df['COLABORADOR'].dropna().unique()))
+        for nome, metricas in agrupado.items():
+            parte = df[df['COLABORADOR'] == nome].drop(columns='COLABORADOR')
+            self.assertEqual(metricas, calcular(parte, [nome] * len(parte))[nome])
+
+    def test_colaborador_sem_datas_validas(self):
+        df = pd.DataFrame({'DATA': [None, 'abc'], 'STATUS': ['PENDENTE', 'QUITADO']})
+        self.assertEqual(calcular(df, ['IGOR', 'IGOR']), {'IGOR': None})
+
+    def test_datas_em_texto(self):
+        df = pd.DataFrame({'DATA': ['01/02/2024', '02/02/2024'], 'STATUS': ['QUITADO', 'PENDENTE']})
+        m = calcular(df, ['IGOR', 'IGOR'])['IGOR']
+        self.assertEqual(m['padrao_semanal'], {'Thursday': 1, 'Friday': 1})
+        self.assertEqual(m['tendencia']['direcao'], 'estável')
+
+
+class TestAnalisadorExcelMetricas(unittest.TestCase):
+    maxDiff = None
+
+    def test_abas_calculadas_juntas_iguais_a_cada_aba(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            analisador = AnalisadorExcel('grupo.xlsx')
+            abas = {
+                'AMANDA': analisador.preparar_aba(pd.DataFrame({
+                    'Data': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-03']),
+                    'Status ': ['PENDENTE', 'QUITADO', 'QUITADO'],
+                    'Resolucao': pd.to_datetime(['2024-01-02', None, None]),
+                }), 'AMANDA'),
+                'IGOR': analisador.preparar_aba(pd.DataFrame({
+                    'DATA': ['05/01/2024', '08/01/2024', '08/01/2024'],
+                    'STATUS': ['APROVADO', 'PENDENTE', 'APROVADO'],
+                }), 'IGOR'),
+            }
+            juntas = analisador.calcular_metricas_abas(abas)
+            separadas = {nome: analisador.calcular_metricas_colaborador(df, nome) for nome, df in abas.items()}
+            sem_status = analisador.preparar_aba(pd.DataFrame({'DATA': ['01/01/2024']}), 'NUNO')
+        self.assertEqual(juntas, separadas)
+        self.assertEqual(juntas['AMANDA']['tempo_medio_resolucao'], 1.0)
+        self.assertIsNone(juntas['IGOR']['tempo_medio_resolucao'])
+        self.assertEqual(juntas['IGOR']['tendencia']['direcao'], 'crescente')
+        self.assertIsNone(sem_status)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
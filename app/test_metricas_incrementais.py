@@ -0,0 +1,179 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+sys.path.append(os.path.dirname(current_dir))
+
+from analise_avancada import AnalisadorAvancado
+from carregador_planilhas import limpar_carregadores
+from metricas_incrementais import MetricasIncrementais, assinaturas_xml_abas
+
+
+def criar_planilha(caminho, abas):
+    """Cria um arquivo Excel com uma aba por item do dicionário"""
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        for nome, df in abas.items():
+            df.to_excel(writer, sheet_name=nome, index=False)
+
+
+class TestMetricasIncrementais(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.diretorio_original = os.getcwd()
+        os.chdir(self.tmp.name)
+        limpar_carregadores()
+
+        self.arquivo = os.path.join(self.tmp.name, '(JULIO) LISTAS INDIVIDUAIS.xlsx')
+        self.abas = {
+            'RESUMO': pd.DataFrame({'TOTAL': [3]}),
+            'AMANDA': pd.DataFrame({'DATA': ['01/03/2025', '02/03/2025'], 'SITUACAO': ['PENDENTE', 'QUITADO']}),
+            'IGOR': pd.DataFrame({'DATA': ['03/03/2025'], 'SITUACAO': ['APROVADO']}),
+            'JULIA': pd.DataFrame({'DATA': ['04/03/2025'], 'SITUACAO': ['PENDENTE']}),
+        }
+        criar_planilha(self.arquivo, self.abas)
+        self.store = MetricasIncrementais('teste', diretorio=os.path.join(self.tmp.name, 'metricas'))
+        self.calculadas = []
+
+    def tearDown(self):
+        limpar_carregadores()
+        os.chdir(self.diretorio_original)
+        self.tmp.cleanup()
+
+    def calcular(self, df, aba):
+        self.calculadas.append(aba)
+        return {'total_registros': len(df), 'situacoes': df['SITUACAO'].tolist()}
+
+    def regravar(self):
+        # Garante data de modificação diferente mesmo em sistemas de arquivos com baixa resolução
+        time.sleep(0.01)
+        criar_planilha(self.arquivo, self.abas)
+        stat = os.stat(self.arquivo)
+        os.utime(self.arquivo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_primeira_execucao_calcula_todas_as_abas(self):
+        resultado = self.store.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(resultado['alteradas'], ['AMANDA', 'IGOR', 'JULIA'])
+        self.assertEqual(list(resultado['metricas'].keys()), ['AMANDA', 'IGOR', 'JULIA'])
+
+    def test_arquivo_inalterado_nao_recalcula(self):
+        self.store.atualizar(self.arquivo, self.calcular)
+        self.calculadas.clear()
+
+        # Store relido do disco, como em uma nova execução
+        store = MetricasIncrementais('teste', diretorio=self.store.arquivo_store.parent)
+        resultado = store.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(self.calculadas, [])
+        self.assertEqual(resultado['metricas']['IGOR'], {'total_registros': 1, 'situacoes': ['APROVADO']})
+
+    def test_somente_aba_editada_e_recalculada(self):
+        self.store.atualizar(self.arquivo, self.calcular)
+        self.calculadas.clear()
+
+        self.abas['IGOR'] = pd.DataFrame({'DATA': ['03/03/2025', '05/03/2025'], 'SITUACAO': ['APROVADO', 'QUITADO']})
+        self.regravar()
+        resultado = self.store.atualizar(self.arquivo, self.calcular)
+
+        self.assertEqual(self.calculadas, ['IGOR'])
+        self.assertEqual(resultado['alteradas'], ['IGOR'])
+        self.assertEqual(resultado['metricas']['IGOR']['total_registros'], 2)
+        self.assertEqual(resultado['metricas']['AMANDA']['total_registros'], 2)
+
+    def test_digest_do_conteudo_sem_xml(self):
+        self.store.atualizar(self.arquivo, self.calcular)
+        self.calculadas.clear()
+
+        # Sem assinatura do XML (ex.: arquivos .xls), o digest do DataFrame decide
+        for registro in self.store._store['arquivos'].values():
+            for item in registro['abas'].values():
+                item['xml'] = None
+        self.regravar()
+        resultado = self.store.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(self.calculadas, [])
+        self.assertEqual(resultado['alteradas'], [])
+
+    def test_aba_removida(self):
+        self.store.atualizar(self.arquivo, self.calcular)
+        del self.abas['JULIA']
+        self.regravar()
+
+        resultado = self.store.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(resultado['removidas'], ['JULIA'])
+        self.assertNotIn('JULIA', resultado['metricas'])
+
+    def test_falha_nao_e_gravada(self):
+        def calcular_com_falha(df, aba):
+            if aba == 'IGOR':
+                return {'status': 'FALHA', 'erro': 'coluna ausente'}
+            return self.calcular(df, aba)
+
+        resultado = self.store.atualizar(self.arquivo, calcular_com_falha)
+        self.assertEqual(resultado['metricas']['IGOR']['status'], 'FALHA')
+        self.calculadas.clear()
+
+        # Mesmo com o arquivo inalterado, só a aba que falhou é recalculada
+        store = MetricasIncrementais('teste', diretorio=self.store.arquivo_store.parent)
+        resultado = store.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(self.calculadas, ['IGOR'])
+        self.assertEqual(resultado['metricas']['IGOR']['total_registros'], 1)
+        self.assertEqual(resultado['removidas'], [])
+
+    def test_aba_sem_metricas_nao_e_gravada(self):
+        # calcular_metricas_aba devolve None quando a aba não pôde ser preparada
+        def calcular_sem_metricas(df, aba):
+            return None if aba == 'IGOR' else self.calcular(df, aba)
+
+        resultado = self.store.atualizar(self.arquivo, calcular_sem_metricas)
+        self.assertIsNone(resultado['metricas']['IGOR'])
+        self.assertNotIn('IGOR', self.store.metricas(self.arquivo))
+        self.calculadas.clear()
+
+        store = MetricasIncrementais('teste', diretorio=self.store.arquivo_store.parent)
+        resultado = store.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(self.calculadas, ['IGOR'])
+        self.assertEqual(resultado['metricas']['IGOR']['total_registros'], 1)
+
+    def test_outra_versao_do_calculo_recalcula(self):
+        store = MetricasIncrementais('teste', diretorio=self.store.arquivo_store.parent, versao_calculo=1)
+        store.atualizar(self.arquivo, self.calcular)
+        self.calculadas.clear()
+
+        mesma = MetricasIncrementais('teste', diretorio=self.store.arquivo_store.parent, versao_calculo=1)
+        mesma.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(self.calculadas, [])
+
+        nova = MetricasIncrementais('teste', diretorio=self.store.arquivo_store.parent, versao_calculo=2)
+        resultado = nova.atualizar(self.arquivo, self.calcular)
+        self.assertEqual(resultado['alteradas'], ['AMANDA', 'IGOR', 'JULIA'])
+
+    def test_assinaturas_xml(self):
+        assinaturas = assinaturas_xml_abas(self.arquivo)
+        self.assertEqual(list(assinaturas.keys()), ['RESUMO', 'AMANDA', 'IGOR', 'JULIA'])
+        self.assertEqual(assinaturas_xml_abas(__file__), {})
+
+
+class TestAtualizarMetricasAvancado(unittest.TestCase):
+    def test_mescla_grupo_e_recalcula_agregados(self):
+        analisador = AnalisadorAvancado()
+        analisador.analisar_dados(
+            {'AMANDA': {'total_registros': 10, 'taxa_eficiencia': 0.2}},
+            {'NUNO': {'total_registros': 30, 'taxa_eficiencia': 0.1}}
+        )
+
+        analisador.atualizar_metricas('julio', {'IGOR': {'total_registros': 50, 'taxa_eficiencia': 0.4}}, removidos=['AMANDA'])
+
+        self.assertEqual(set(analisador.metricas_julio), {'IGOR'})
+        self.assertEqual(set(analisador.metricas_leandro), {'NUNO'})
+        self.assertEqual(analisador.tendencias['volume'], {'IGOR': 50, 'NUNO': 30})
+
+        with self.assertRaises(ValueError):
+            analisador.atualizar_metricas('outro', {})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
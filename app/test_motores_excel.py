@@ -0,0 +1,103 @@
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import motores_excel
+from motores_excel import (CALAMINE_DISPONIVEL, PlanilhaCalamine, abrir_planilha,
+                           definir_motor_padrao, escolher_motor)
+
+
+class TestMotoresExcel(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.arquivo = os.path.join(self.tmp.name, 'listas.xlsx')
+        with pd.ExcelWriter(self.arquivo, engine='openpyxl') as writer:
+            pd.DataFrame({
+                'DATA': [datetime.datetime(2024, 3, 1), None, datetime.datetime(2024, 3, 2)],
+                'CONTRATO': [101, 102, 103],
+                'SITUAÇÃO': ['PENDENTE', None, 'QUITADO'],
+                'VALOR': [10.5, 2.0, None],
+            }).to_excel(writer, sheet_name='AMANDA', index=False)
+            pd.DataFrame({'TOTAL': [3]}).to_excel(writer, sheet_name='RESUMO', index=False)
+
+    def tearDown(self):
+        definir_motor_padrao('auto')
+        self.tmp.cleanup()
+
+    def test_escolha_do_motor(self):
+        self.assertEqual(escolher_motor(self.arquivo, 'openpyxl'), 'openpyxl')
+        self.assertEqual(escolher_motor('listas.csv', 'calamine'), 'openpyxl')
+        esperado = 'calamine' if CALAMINE_DISPONIVEL else 'openpyxl'
+        self.assertEqual(escolher_motor(self.arquivo), esperado)
+
+        definir_motor_padrao('openpyxl')
+        self.assertEqual(escolher_motor(self.arquivo), 'openpyxl')
+        self.assertIsInstance(abrir_planilha(self.arquivo), pd.ExcelFile)
+
+    def test_motor_desconhecido(self):
+        with self.assertRaises(ValueError):
+            definir_motor_padrao('xlsxwriter')
+        with self.assertRaises(ValueError):
+            escolher_motor(self.arquivo, 'xlsxwriter')
+
+    @unittest.skipUnless(CALAMINE_DISPONIVEL, 'python-calamine não instalado')
+    def test_calamine_igual_ao_openpyxl(self):
+        calamine = abrir_planilha(self.arquivo, 'calamine')
+        openpyxl = pd.ExcelFile(self.arquivo)
+        self.assertEqual(calamine.sheet_names, openpyxl.sheet_names)
+
+        variacoes = [{}, {'nrows': 0}, {'nrows': 1},
+                     {'usecols': [0, 2], 'dtype': {'SITUAÇÃO': 'category'}}]
+        for kwargs in variacoes:
+            with self.subTest(**{k: str(v) for k, v in kwargs.items()}):
+                pd.testing.assert_frame_equal(calamine.parse('AMANDA', **kwargs),
+                                              openpyxl.parse('AMANDA', **kwargs))
+        self.assertEqual(calamine.motor, 'calamine')
+        calamine.close()
+        openpyxl.close()
+
+    @unittest.skipUnless(CALAMINE_DISPONIVEL, 'python-calamine não instalado')
+    def test_volta_para_openpyxl_quando_calamine_falha(self):
+        from python_calamine import XmlError
+        planilha = abrir_planilha(self.arquivo, 'calamine')
+        workbook = planilha._principal
+        with mock.patch.object(PlanilhaCalamine, 'parse', side_effect=XmlError('célula inválida')), \
+                mock.patch.object(workbook, 'close', wraps=workbook.close) as fechar:
+            dados = planilha.parse('AMANDA')
+        # O workbook do calamine é fechado ao passar para o openpyxl
+        fechar.assert_called_once()
+        self.assertEqual(planilha.motor, 'openpyxl')
+        self.assertEqual(dados['CONTRATO'].tolist(), [101, 102, 103])
+        self.assertEqual(planilha.parse('RESUMO')['TOTAL'].tolist(), [3])
+        planilha.close()
+
+    @unittest.skipUnless(CALAMINE_DISPONIVEL, 'python-calamine não instalado')
+    def test_outros_erros_nao_trocam_de_motor(self):
+        planilha = abrir_planilha(self.arquivo, 'calamine')
+        with self.assertRaises(ValueError):
+            planilha.parse('AMANDA', usecols=['NAO EXISTE'])
+        self.assertEqual(planilha.motor, 'calamine')
+        planilha.close()
+        with self.assertRaises(OSError):
+            abrir_planilha(os.path.join(self.tmp.name, 'nao_existe.xlsx'), 'calamine')
+
+    @unittest.skipUnless(CALAMINE_DISPONIVEL, 'python-calamine não instalado')
+    def test_arquivo_que_calamine_nao_abre(self):
+        with mock.patch.object(motores_excel, 'CalamineWorkbook') as workbook:
+            workbook.from_path.side_effect = motores_excel.CalamineError('formato')
+            planilha = abrir_planilha(self.arquivo, 'calamine')
+        self.assertEqual(planilha.motor, 'openpyxl')
+        self.assertEqual(planilha.sheet_names, ['AMANDA', 'RESUMO'])
+        planilha.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
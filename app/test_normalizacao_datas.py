@@ -0,0 +1,70 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from debug_excel import AnalisadorExcel
+from normalizacao_datas import converter_datas
+
+
+def converter_valor_a_valor(serie):
+    """Resultado de referência: a conversão original, uma célula por vez"""
+    analisador = AnalisadorExcel.__new__(AnalisadorExcel)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return serie.apply(analisador.corrigir_formato_data)
+
+
+class TestNormalizacaoDatas(unittest.TestCase):
+    def comparar(self, valores):
+        serie = pd.Series(valores, dtype=object, name='DATA')
+        with contextlib.redirect_stdout(io.StringIO()):
+            obtido = converter_datas(serie)
+        pd.testing.assert_series_equal(obtido, converter_valor_a_valor(serie))
+
+    def test_textos_em_todos_os_formatos(self):
+        self.comparar([
+            '01/03/2025', '01-03-2025', '2025-03-01', '01/03/25', '01-03-25',
+            '2025/03/01', '01/03/2025 10:11:12', '01-03-2025 10:11:12',
+            '2025-03-01 10:11:12', 'Data: 02/03/2025', '1/3/2025'
+        ])
+
+    def test_textos_invalidos_e_inferidos(self):
+        self.comparar(['abc', '', '   ', '31/02/2025', 'March 5, 2025', '2025-03-05T10:00', '05/03/2025'])
+
+    def test_numeros_de_serie_do_excel(self):
+        self.comparar([45000, 45000.75, 45000.123456789, -5, True, 1e9, float('inf'), 0.5])
+
+    def test_datas_nulos_e_tipos_misturados(self):
+        self.comparar([
+            datetime(2025, 1, 1, 5), pd.Timestamp('2025-02-02'), None, np.nan, pd.NaT,
+            date(2025, 1, 1), '03/03/2025', 45001
+        ])
+
+    def test_somente_invalidos(self):
+        self.comparar(['x', 'y', None])
+
+    def test_coluna_grande_aleatoria(self):
+        rng = np.random.default_rng(42)
+        textos = [f'{d:02d}/{m:02d}/2024' for d, m in zip(rng.integers(1, 29, 500), rng.integers(1, 13, 500))]
+        numeros = list(rng.uniform(40000, 46000, 500))
+        valores = textos + numeros + [None] * 20
+        rng.shuffle(valores)
+        self.comparar(valores)
+
+    def test_preserva_indice(self):
+        serie = pd.Series(['01/03/2025', 45000], index=[10, 20], name='RESOLUCAO')
+        convertida = converter_datas(serie)
+        self.assertEqual(list(convertida.index), [10, 20])
+        self.assertEqual(convertida.name, 'RESOLUCAO')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
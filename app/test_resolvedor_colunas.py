@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import resolvedor_colunas
+from resolvedor_colunas import COLUNAS_PADRAO, ResolvedorColunas, normalizar_nome_coluna, obter_resolvedor
+
+
+class TestResolvedorColunas(unittest.TestCase):
+    def setUp(self):
+        self.resolvedor = ResolvedorColunas(COLUNAS_PADRAO)
+
+    def test_normalizacao(self):
+        self.assertEqual(normalizar_nome_coluna(' Número_Contrato '), 'NUMEROCONTRATO')
+        self.assertEqual(normalizar_nome_coluna(None), 'NONE')
+
+    def test_resolve_pelo_nome_normalizado(self):
+        mapeamento = self.resolvedor.resolver(['Data', 'Situação', 'NUM CONTRATO', 'OBS', 'Resolução'])
+        self.assertEqual(mapeamento, {'DATA': 0, 'RESOLUCAO': 4, 'CONTRATO': 2, 'NEGOCIACAO': None, 'SITUACAO': 1})
+
+    def test_primeira_ocorrencia_vale(self):
+        mapeamento = self.resolvedor.resolver(['STATUS', 'SITUACAO'])
+        self.assertEqual(mapeamento['SITUACAO'], 0)
+
+    def test_fuzzy_so_nas_colunas_configuradas(self):
+        mapeamento = self.resolvedor.resolver(['DATAS', 'RESOLUCAOS', 'CONTRATOS'])
+        self.assertEqual(mapeamento['DATA'], 0)
+        self.assertEqual(mapeamento['RESOLUCAO'], 1)
+        self.assertIsNone(mapeamento['CONTRATO'])
+
+        sem_fuzzy = ResolvedorColunas(COLUNAS_PADRAO, limiar_fuzzy=1.0)
+        self.assertIsNone(sem_fuzzy.resolver(['DATAS'])['DATA'])
+
+    def test_cabecalho_repetido_nao_e_normalizado_de_novo(self):
+        cabecalho = ['DATA', 'SITUAÇÃO', 'CONTRATO']
+        primeiro = self.resolvedor.resolver(cabecalho)
+        primeiro['DATA'] = 99
+        with mock.patch.object(resolvedor_colunas, 'normalizar_nome_coluna') as normalizar:
+            segundo = self.resolvedor.resolver(tuple(cabecalho))
+        normalizar.assert_not_called()
+        self.assertEqual(segundo['DATA'], 0)
+
+    def test_encontrar_e_colunas_reconhecidas(self):
+        self.assertEqual(self.resolvedor.encontrar(['X', 'dt negociacao'], ['DT_NEGOCIACAO']), 1)
+        self.assertIsNone(self.resolvedor.encontrar(['X'], ['DATA']))
+        self.assertEqual(self.resolvedor.colunas_reconhecidas(['Data', 'DT', 'Status']), 2)
+
+    def test_resolvedor_compartilhado_por_arquivo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = os.path.join(tmp, 'colunas_config.json')
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump({'colunas_essenciais': {'VALOR': {'alternativas': ['VALOR', 'VLR']}}}, f)
+            resolvedor = obter_resolvedor(caminho)
+            self.assertIs(obter_resolvedor(caminho), resolvedor)
+            self.assertEqual(resolvedor.resolver(['vlr']), {'VALOR': 0})
+
+            # Sem arquivo, as alternativas padrão
+            self.assertEqual(obter_resolvedor(os.path.join(tmp, 'ausente.json')).colunas, list(COLUNAS_PADRAO))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import openpyxl
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import sessao_leitura
+from sessao_leitura import MemoriaEstrategias, SessaoLeitura
+
+
+class TestSessaoLeitura(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.tmp.name, 'listas.xlsx')
+        wb = openpyxl.Workbook()
+        wb.active.title = 'ANA'
+        for nome in ('ANA', 'IGOR'):
+            ws = wb[nome] if nome in wb.sheetnames else wb.create_sheet(nome)
+            ws.append(['DATA', 'SITUAÇÃO', 'CONTRATO'])
+            ws.append(['2024-03-01', 'PENDENTE', 1])
+        wb.save(self.caminho)
+        self.memoria = MemoriaEstrategias(os.path.join(self.tmp.name, 'cache', 'estrategias.json'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_estrategia_que_falha_ao_abrir_nao_e_repetida(self):
+        # xlrd 2.x não abre .xlsx: a falha é guardada e não se repete em cada aba
+        import xlrd
+        with mock.patch.object(xlrd, 'open_workbook', side_effect=xlrd.XLRDError('formato')) as abrir:
+            with SessaoLeitura(self.caminho, ['xlrd', 'openpyxl'], self.memoria) as sessao:
+                for aba in sessao.abas():
+                    dados, estrategia, erros = sessao.ler(aba)
+                    self.assertEqual(estrategia, 'openpyxl')
+                    self.assertEqual(len(erros), 1)
+                    self.assertEqual(dados.iloc[1, 1], 'PENDENTE')
+        self.assertEqual(abrir.call_count, 1)
+
+    def test_handle_reaproveitado_entre_abas(self):
+        with mock.patch.object(sessao_leitura.pd, 'ExcelFile', wraps=pd.ExcelFile) as abrir:
+            with SessaoLeitura(self.caminho, ['pandas']) as sessao:
+                lidas = [sessao.ler(aba)[0] for aba in sessao.abas()]
+        self.assertEqual(abrir.call_count, 1)
+        self.assertEqual([len(df) for df in lidas], [1, 1])
+
+    def test_estrategia_lembrada_e_tentada_primeiro(self):
+        with SessaoLeitura(self.caminho, ['xlrd', 'openpyxl', 'pandas'], self.memoria) as sessao:
+            sessao.ler('ANA')
+
+        nova_memoria = MemoriaEstrategias(self.memoria.caminho)
+        sessao = SessaoLeitura(self.caminho, ['xlrd', 'openpyxl', 'pandas'], nova_memoria)
+        self.assertEqual(sessao.estrategias, ['openpyxl', 'xlrd', 'pandas'])
+        _, estrategia, erros = sessao.ler('IGOR')
+        sessao.fechar()
+        self.assertEqual((estrategia, erros), ('openpyxl', []))
+
+    def test_todas_falham(self):
+        with SessaoLeitura(self.caminho, ['xlrd']) as sessao:
+            with self.assertRaises(Exception):
+                sessao.ler('ANA')
+        self.assertIsNone(sessao.estrategia)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from tendencias import ajustar_tendencias, empilhar_series
+
+
+class TestTendencias(unittest.TestCase):
+    def test_igual_a_polyfit_em_series_de_tamanhos_diferentes(self):
+        rng = np.random.default_rng(11)
+        # (colaboradores, métricas, dias), com pontos ausentes
+        y = rng.normal(size=(5, 3, 20))
+        x = np.sort(rng.uniform(0, 30, size=(5, 3, 20)), axis=-1)
+        y[rng.random(y.shape) < 0.3] = np.nan
+        ajuste = ajustar_tendencias(y, x)
+
+        for indice in np.ndindex(y.shape[:-1]):
+            validos = ~np.isnan(y[indice])
+            xi, yi = x[indice][validos], y[indice][validos]
+            inclinacao, intercepto = np.polyfit(xi, yi, 1)
+            previsto = inclinacao * xi + intercepto
+            r2 = 1 - np.sum((yi - previsto) ** 2) / np.sum((yi - yi.mean()) ** 2)
+            self.assertEqual(ajuste.pontos[indice], validos.sum())
+            self.assertAlmostEqual(ajuste.inclinacao[indice], inclinacao)
+            self.assertAlmostEqual(ajuste.intercepto[indice], intercepto)
+            self.assertAlmostEqual(ajuste.r2[indice], r2)
+            self.assertAlmostEqual(ajuste.correlacao[indice], np.corrcoef(xi, yi)[0, 1])
+
+    def test_abscissas_padrao_e_previsao(self):
+        ajuste = ajustar_tendencias([[1, 3, 5], [2, 2, np.nan]])
+        self.assertEqual(ajuste.inclinacao.tolist(), [2.0, 0.0])
+        self.assertEqual(ajuste.prever(3).tolist(), [7.0, 2.0])
+        self.assertEqual(ajuste.prever([[3, 4], [5, 6]]).tolist(), [[7.0, 9.0], [2.0, 2.0]])
+        # Série constante: R² e correlação indefinidos
+        self.assertTrue(np.isnan(ajuste.r2[1]))
+        self.assertTrue(np.isnan(ajuste.correlacao[1]))
+
+    def test_series_sem_pontos_suficientes(self):
+        ajuste = ajustar_tendencias([[np.nan, 4.0, np.nan], [np.nan] * 3])
+        self.assertEqual(ajuste.pontos.tolist(), [1, 0])
+        self.assertEqual(ajuste.inclinacao.tolist(), [0.0, 0.0])
+        self.assertEqual(ajuste.intercepto[0], 4.0)
+        self.assertTrue(np.isnan(ajuste.intercepto[1]))
+
+    def test_empilhar_series(self):
+        grupos = np.array([1, 0, 1, 1, 0])
+        x, y = empilhar_series(grupos, [10, 20, 11, 12, 21], [1, 2, 3, 4, 5], n_grupos=3)
+        np.testing.assert_array_equal(x, [[20, 21, np.nan], [10, 11, 12], [np.nan] * 3])
+        np.testing.assert_array_equal(y, [[2, 5, np.nan], [1, 3, 4], [np.nan] * 3])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
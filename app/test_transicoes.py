@@ -0,0 +1,95 @@
+import os
+import sys
+import unittest
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from transicoes import analisar_transicoes, combinar_matrizes, transicoes_mais_comuns
+
+
+def transicoes_legado(df, coluna_data):
+    """Cálculo anterior (iterrows sobre o DataFrame ordenado pela data)"""
+    df_ordenado = df.sort_values(by=coluna_data, kind='stable')
+    transicoes = []
+    situacao_anterior = None
+    for _, row in df_ordenado.iterrows():
+        situacao_atual = row['SITUACAO']
+        if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
+            transicoes.append((situacao_anterior, situacao_atual))
+        situacao_anterior = situacao_atual
+    df_ordenado['tempo_no_estado'] = (df_ordenado[coluna_data] - df_ordenado[coluna_data].shift(1)).dt.days
+    tempos = df_ordenado.groupby('SITUACAO')['tempo_no_estado'].mean().to_dict()
+    return Counter(transicoes), tempos
+
+
+class TestTransicoes(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'DATA': pd.to_datetime(['2024-01-05', '2024-01-01', '2024-01-03', '2024-01-10', '2024-01-12']),
+            'SITUACAO': ['QUITADO', 'PENDENTE', 'PENDENTE', 'QUITADO', 'PENDENTE'],
+        })
+
+    def test_medidas_conferidas_a_mao(self):
+        analise = analisar_transicoes(self.df, 'DATA')
+        compacta = analise.compacta()
+        self.assertEqual(compacta['estados'], ['PENDENTE', 'QUITADO'])
+        self.assertEqual(compacta['registros'], [3, 2])
+        self.assertEqual(compacta['contagens'], [[0, 1], [1, 0]])
+        # PENDENTE de 01/01 até 05/01; QUITADO de 05/01 até 12/01; o último PENDENTE ainda não terminou
+        self.assertEqual(compacta['permanencia_media'], [4.0, 7.0])
+        self.assertEqual(compacta['primeira_passagem'], [0.0, 4.0])
+        self.assertEqual(analise.tempos_medios(), {'PENDENTE': 2.0, 'QUITADO': 3.5})
+
+    def test_equivale_ao_calculo_anterior(self):
+        rng = np.random.default_rng(7)
+        for _ in range(50):
+            n = int(rng.integers(1, 40))
+            datas = pd.Series(pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60, n), unit='D'))
+            datas[rng.random(n) < 0.1] = pd.NaT
+            situacoes = pd.Series(rng.choice(['A', 'B', 'C', None], n), dtype=object)
+            df = pd.DataFrame({'DATA': datas, 'SITUACAO': situacoes})
+
+            contagem, tempos = transicoes_legado(df, 'DATA')
+            analise = analisar_transicoes(df, 'DATA')
+            compacta = analise.compacta()
+            obtidas = {(de, para): n for de, para, n in
+                       transicoes_mais_comuns(compacta['estados'], compacta['contagens'])}
+            self.assertEqual(obtidas, dict(contagem))
+            obtidos = analise.tempos_medios()
+            self.assertEqual(set(obtidos), set(tempos))
+            for situacao, tempo in tempos.items():
+                if pd.isna(tempo):
+                    self.assertTrue(np.isnan(obtidos[situacao]))
+                else:
+                    self.assertAlmostEqual(obtidos[situacao], tempo)
+
+    def test_agrupado_igual_a_cada_aba(self):
+        outra = pd.DataFrame({
+            'DATA': pd.to_datetime(['2024-02-01', '2024-02-02', '2024-02-09']),
+            'SITUACAO': ['APROVADO', 'PENDENTE', 'APROVADO'],
+        })
+        juntos = pd.concat([self.df.assign(ABA='AMANDA'), outra.assign(ABA='IGOR')], ignore_index=True)
+        agrupada = analisar_transicoes(juntos, 'DATA', coluna_grupo='ABA')
+        self.assertEqual(agrupada.chaves, ['AMANDA', 'IGOR'])
+        for aba, df in [('AMANDA', self.df), ('IGOR', outra)]:
+            self.assertEqual(agrupada.compacta(aba), analisar_transicoes(df, 'DATA').compacta())
+
+    def test_combinar_matrizes(self):
+        estados, total = combinar_matrizes([
+            {'estados': ['A', 'B'], 'contagens': [[0, 2], [1, 0]]},
+            {'estados': ['B', 'C'], 'contagens': [[0, 3], [0, 0]]},
+            {},
+        ])
+        self.assertEqual(estados, ['A', 'B', 'C'])
+        self.assertEqual(total.tolist(), [[0, 2, 0], [1, 0, 3], [0, 0, 0]])
+        self.assertEqual(transicoes_mais_comuns(estados, total, limite=2), [('B', 'C', 3), ('A', 'B', 2)])
+        self.assertEqual(transicoes_mais_comuns([], np.zeros((0, 0))), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,67 @@
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import openpyxl
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from validacao_dados import BufferColuna, ExcelLeitor
+
+
+class TestExcelLeitor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.caminho = os.path.join(self.tmp.name, 'listas.xlsx')
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = 'AMANDA'
+        ws.append(['LISTA INDIVIDUAL'])
+        ws.append(['Data', 'Observação', 'Situação', 'Resolução', 'Contrato'])
+        ws.append([datetime.datetime(2024, 3, 1), 'texto longo', ' pendente ', 45352, 101])
+        ws.append([None, 'só observação', None, None, None])
+        ws.append(['02/03/2024', None, 'quitado', None, 102])
+        wb.create_sheet('RESUMO').append(['DATA', 'CONTRATO'])
+        wb.create_sheet('SEM CABECALHO').append(['x', 'y'])
+        wb.save(self.caminho)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_le_so_as_colunas_mapeadas(self):
+        resultado = ExcelLeitor().ler_arquivo(self.caminho)
+        self.assertEqual(resultado['status'], 'sucesso')
+        self.assertEqual(list(resultado['abas']), ['AMANDA'])
+
+        aba = resultado['abas']['AMANDA']
+        dados = aba['dados']
+        self.assertEqual(aba['total_linhas'], 2)
+        self.assertEqual(aba['colunas_encontradas'], ['DATA', 'RESOLUCAO', 'CONTRATO', 'SITUACAO'])
+        self.assertEqual(list(dados.columns), aba['colunas_encontradas'])
+        self.assertEqual(dados['DATA'].dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(dados['SITUACAO'].tolist(), ['PENDENTE', 'QUITADO'])
+        self.assertEqual(dados['RESOLUCAO'].iloc[0], datetime.datetime(2024, 3, 1))
+        self.assertTrue(np.isnat(dados['RESOLUCAO'].to_numpy()[1]))
+        self.assertEqual(dados['CONTRATO'].tolist(), [101, 102])
+
+    def test_buffer_cresce(self):
+        buffer = BufferColuna(data=True, capacidade=1)
+        for dia in range(1, 6):
+            buffer.adicionar(datetime.datetime(2024, 1, dia))
+        buffer.adicionar(None)
+        serie = buffer.serie()
+        self.assertEqual(len(serie), 6)
+        self.assertEqual(serie.iloc[4], datetime.datetime(2024, 1, 5))
+        self.assertTrue(serie.isna().iloc[5])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
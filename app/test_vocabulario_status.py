@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import vocabulario_status
+from vocabulario_status import (CODIGO_DESCONHECIDO, CODIGOS_STATUS, STATUS_CANONICOS, chave_status,
+                                codificar_status, contagem_por_codigo, contar_status, status_categorico)
+
+
+class TestVocabularioStatus(unittest.TestCase):
+    def setUp(self):
+        self.serie = pd.Series([
+            'Análise', 'ANALISE', ' em análise ', 'PRIORIDADE  TOTAL', 'prioridade_total',
+            'Pendete', None, 'quitada', 'M. ENCAMINHADA', 'XPTO', 'xpto ', 'PENDENTE'
+        ])
+
+    def test_chave_remove_acentos_e_espacos(self):
+        self.assertEqual(chave_status('  em   Análise '), 'EM ANALISE')
+        self.assertEqual(chave_status('m . encaminhada'), 'M.ENCAMINHADA')
+        self.assertIsNone(chave_status(np.nan))
+        self.assertIsNone(chave_status('   '))
+
+    def test_codigos(self):
+        codigos = codificar_status(self.serie)
+        esperado = ['ANÁLISE', 'ANÁLISE', 'ANÁLISE', 'PRIORIDADE TOTAL', 'PRIORIDADE TOTAL',
+                    'PENDENTE', None, 'QUITADO', 'M.ENCAMINHADA', None, None, 'PENDENTE']
+        self.assertEqual(codigos.tolist(),
+                         [CODIGOS_STATUS[s] if s else CODIGO_DESCONHECIDO for s in esperado])
+
+    def test_tabela_consultada_so_nos_valores_distintos(self):
+        serie = pd.Series(['ANALISE', 'QUITADO'] * 1000)
+        with mock.patch.object(vocabulario_status, 'codigo_status',
+                               wraps=vocabulario_status.codigo_status) as consulta:
+            codificar_status(serie)
+        self.assertEqual(consulta.call_count, 2)
+
+    def test_categorico_mantem_desconhecidos_depois_dos_canonicos(self):
+        categorico = status_categorico(self.serie)
+        self.assertEqual(list(categorico.categories), STATUS_CANONICOS + ['XPTO'])
+        self.assertEqual(categorico[9], 'XPTO')
+        self.assertEqual(categorico[10], 'XPTO')
+        self.assertTrue(pd.isna(categorico[6]))
+
+        sem_extras = status_categorico(self.serie, manter_desconhecidos=False)
+        self.assertEqual(list(sem_extras.categories), STATUS_CANONICOS)
+        self.assertTrue(pd.isna(sem_extras[9]))
+
+    def test_contagem_como_value_counts(self):
+        contagem = contar_status(self.serie)
+        self.assertEqual(contagem, {'ANÁLISE': 3, 'PRIORIDADE TOTAL': 2, 'PENDENTE': 2, 'XPTO': 2,
+                                    'QUITADO': 1, 'M.ENCAMINHADA': 1})
+        self.assertEqual(list(contagem)[0], 'ANÁLISE')
+
+        # Coluna já categorizada dá o mesmo resultado
+        self.assertEqual(contar_status(pd.Series(status_categorico(self.serie))), contagem)
+
+    def test_contagem_por_codigo(self):
+        contagem = contagem_por_codigo(codificar_status(self.serie))
+        self.assertEqual(len(contagem), len(STATUS_CANONICOS))
+        self.assertEqual(contagem[CODIGOS_STATUS['ANÁLISE']], 3)
+        self.assertEqual(contagem.sum(), 9)
+
+    def test_serie_vazia(self):
+        self.assertEqual(contar_status(pd.Series([], dtype=object)), {})
+        self.assertEqual(len(codificar_status(pd.Series([], dtype=object))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Transições de Situação
+======================
+Análise vetorizada das mudanças de SITUAÇÃO ao longo do tempo, para um ou
+vários colaboradores de uma vez (agrupados pela aba).
+
+Os registros são ordenados uma única vez por (grupo, data) e todas as
+medidas saem de deslocamentos e contagens com NumPy sobre essa ordem:
+
+- ``transicoes``: matriz (grupo, de, para) com o número de mudanças diretas
+  de uma situação para outra entre registros consecutivos;
+- ``intervalo_medio``: média de dias desde o registro anterior, atribuída à
+  situação do registro atual (a medida usada em ``tempos_medios``);
+- ``permanencia_media``: duração média, em dias, de cada sequência contínua
+  de registros na mesma situação até a mudança seguinte (a última sequência
+  de cada grupo ainda não terminou e fica de fora);
+- ``primeira_passagem``: dias entre o primeiro registro do grupo e a primeira
+  vez que cada situação aparece.
+
+As situações ficam em ``estados`` e as matrizes são indexadas pela posição
+nessa lista, em vez de dicionários com chaves "DE -> PARA".
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DIA_NS = 86_400 * 10**9
+
+
+@dataclass
+class AnaliseTransicoes:
+    chaves: List[Any]
+    estados: List[Any]
+    registros: np.ndarray          # (grupos, estados) registros em cada situação
+    transicoes: np.ndarray         # (grupos, estados, estados)
+    intervalo_medio: np.ndarray    # (grupos, estados), em dias
+    permanencia_media: np.ndarray  # (grupos, estados), em dias
+    primeira_passagem: np.ndarray  # (grupos, estados), em dias
+
+    def indice(self, chave=None) -> int:
+        """Posição do grupo; sem chave, o único grupo da análise"""
+        if chave is None and len(self.chaves) == 1:
+            return 0
+        return self.chaves.index(chave)
+
+    def compacta(self, chave=None) -> Dict[str, Any]:
+        """
+        Representação compacta de um grupo, só com as situações presentes.
+
+        Returns:
+            dict: ``estados`` e, na mesma ordem, ``registros``, ``contagens``
+            (matriz de transições, linhas = de, colunas = para),
+            ``permanencia_media`` e ``primeira_passagem``, em listas simples
+        """
+        i = self.indice(chave)
+        presentes = np.flatnonzero(self.registros[i] > 0)
+        return {
+            'estados': [self.estados[j] for j in presentes],
+            'registros': self.registros[i, presentes].tolist(),
+            'contagens': self.transicoes[i][np.ix_(presentes, presentes)].tolist(),
+            'permanencia_media': self.permanencia_media[i, presentes].tolist(),
+            'primeira_passagem': self.primeira_passagem[i, presentes].tolist()
+        }
+
+    def tempos_medios(self, chave=None) -> Dict[Any, float]:
+        """Intervalo médio por situação presente no grupo, ordenado pela situação"""
+        i = self.indice(chave)
+        return {
+            self.estados[j]: float(self.intervalo_medio[i, j])
+            for j in np.flatnonzero(self.registros[i] > 0)
+        }
+
+
+def _media_por_celula(indices, valores, tamanho) -> np.ndarray:
+    soma = np.bincount(indices, weights=valores, minlength=tamanho)
+    quantidade = np.bincount(indices, minlength=tamanho)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(quantidade > 0, soma / np.maximum(quantidade, 1), np.nan)
+
+
+def _datas_em_ns(serie: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_datetime64_any_dtype(serie):
+        serie = pd.to_datetime(serie, errors='coerce')
+    datas = pd.DatetimeIndex(serie)
+    if datas.tz is not None:
+        datas = datas.tz_convert(None)
+    return datas.values.astype('datetime64[ns]').view('i8')
+
+
+def analisar_transicoes(df: pd.DataFrame, coluna_data: str, coluna_situacao: str = 'SITUACAO',
+                        coluna_grupo: Optional[str] = None) -> AnaliseTransicoes:
+    """
+    Calcula transições, intervalos, permanência e primeira passagem.
+
+    Args:
+        df (DataFrame): Registros (de um colaborador ou de vários)
+        coluna_data (str): Coluna com a data do registro
+        coluna_situacao (str): Coluna com a situação
+        coluna_grupo (str, optional): Coluna que separa os colaboradores
+            (ex.: nome da aba). Sem ela, todos os registros formam um grupo.
+
+    Returns:
+        AnaliseTransicoes: Matrizes indexadas por (grupo, situação)
+    """
+    if coluna_grupo is None:
+        grupos = np.zeros(len(df), dtype=np.int64)
+        chaves = [None]
+    else:
+        grupos, uniques = pd.factorize(df[coluna_grupo], sort=False)
+        chaves = list(uniques)
+    try:
+        codigos, estados = pd.factorize(df[coluna_situacao], sort=True)
+    except TypeError:
+        # Situações de tipos misturados não são ordenáveis
+        codigos, estados = pd.factorize(df[coluna_situacao], sort=False)
+    estados = list(estados)
+    tempos = _datas_em_ns(df[coluna_data])
+
+    validos = grupos >= 0
+    grupos, codigos, tempos = grupos[validos], codigos[validos], tempos[validos]
+    sem_data = tempos == np.iinfo(np.int64).min
+
+    # Ordenação única e estável por grupo e data, com datas vazias no fim
+    ordem = np.lexsort((np.where(sem_data, np.iinfo(np.int64).max, tempos), grupos))
+    g, c, t, nt = grupos[ordem], codigos[ordem], tempos[ordem], sem_data[ordem]
+
+    n_grupos, n_estados = len(chaves), len(estados)
+    celulas = n_grupos * n_estados
+    tem_estado = c >= 0
+
+    mesmo_grupo = np.zeros(len(g), dtype=bool)
+    mesmo_grupo[1:] = g[1:] == g[:-1]
+    c_anterior = np.empty_like(c)
+    c_anterior[:1] = -1
+    c_anterior[1:] = c[:-1]
+    nt_anterior = np.ones_like(nt)
+    nt_anterior[1:] = nt[:-1]
+    t_anterior = np.zeros_like(t)
+    t_anterior[1:] = t[:-1]
+
+    registros = np.bincount((g * n_estados + c)[tem_estado], minlength=celulas)
+
+    # Transições diretas entre registros consecutivos com situações diferentes
+    mudou = mesmo_grupo & tem_estado & (c_anterior >= 0) & (c_anterior != c)
+    transicoes = np.bincount(
+        ((g * n_estados + c_anterior) * n_estados + c)[mudou], minlength=celulas * n_estados
+    )
+
+    # Dias (inteiros, arredondados para baixo) desde o registro anterior
+    com_intervalo = mesmo_grupo & tem_estado & ~nt & ~nt_anterior
+    dias = (t[com_intervalo] - t_anterior[com_intervalo]) // DIA_NS
+    intervalo_medio = _media_por_celula((g * n_estados + c)[com_intervalo], dias.astype(float), celulas)
+
+    # Sequências contínuas na mesma situação (registro vazio também interrompe)
+    inicios = np.flatnonzero(~mesmo_grupo | (c != c_anterior))
+    g_seq, c_seq, t_seq, nt_seq = g[inicios], c[inicios], t[inicios], nt[inicios]
+    terminou = np.zeros(len(inicios), dtype=bool)
+    terminou[:-1] = (g_seq[1:] == g_seq[:-1]) & ~nt_seq[:-1] & ~nt_seq[1:]
+    terminou &= c_seq >= 0
+    duracao = (t_seq[1:] - t_seq[:-1])[terminou[:-1]] / DIA_NS if len(inicios) else np.empty(0)
+    permanencia_media = _media_por_celula((g_seq * n_estados + c_seq)[terminou], duracao, celulas)
+
+    # Primeira vez em cada situação, a partir do primeiro registro do grupo
+    primeira_passagem = np.full(celulas, np.nan)
+    celula = (g * n_estados + c)[tem_estado]
+    posicoes = np.flatnonzero(tem_estado)
+    if len(celula):
+        celulas_vistas, primeiras = np.unique(celula, return_index=True)
+        posicoes = posicoes[primeiras]
+        inicio_grupo = np.flatnonzero(~mesmo_grupo)
+        base = np.zeros(n_grupos, dtype=np.int64)
+        base_vazia = np.ones(n_grupos, dtype=bool)
+        base[g[inicio_grupo]] = t[inicio_grupo]
+        base_vazia[g[inicio_grupo]] = nt[inicio_grupo]
+        com_data = ~nt[posicoes] & ~base_vazia[g[posicoes]]
+        primeira_passagem[celulas_vistas[com_data]] = (
+            (t[posicoes] - base[g[posicoes]])[com_data] / DIA_NS
+        )
+
+    return AnaliseTransicoes(
+        chaves=chaves,
+        estados=estados,
+        registros=registros.reshape(n_grupos, n_estados),
+        transicoes=transicoes.reshape(n_grupos, n_estados, n_estados),
+        intervalo_medio=intervalo_medio.reshape(n_grupos, n_estados),
+        permanencia_media=permanencia_media.reshape(n_grupos, n_estados),
+        primeira_passagem=primeira_passagem.reshape(n_grupos, n_estados)
+    )
+
+
+def combinar_matrizes(compactas: Iterable[Dict[str, Any]]) -> Tuple[List[Any], np.ndarray]:
+    """Soma matrizes compactas de vários colaboradores, alinhando as situações"""
+    estados: List[Any] = []
+    posicao: Dict[Any, int] = {}
+    itens = [m for m in compactas if m and m.get('estados')]
+    for matriz in itens:
+        for estado in matriz['estados']:
+            if estado not in posicao:
+                posicao[estado] = len(estados)
+                estados.append(estado)
+
+    total = np.zeros((len(estados), len(estados)), dtype=np.int64)
+    for matriz in itens:
+        indices = np.array([posicao[e] for e in matriz['estados']])
+        total[np.ix_(indices, indices)] += np.asarray(matriz['contagens'], dtype=np.int64)
+    return estados, total
+
+
+def transicoes_mais_comuns(estados: List[Any], contagens: np.ndarray,
+                           limite: Optional[int] = None) -> List[Tuple[Any, Any, int]]:
+    """Lista (de, para, quantidade) em ordem decrescente de quantidade"""
+    contagens = np.asarray(contagens)
+    if contagens.size == 0:
+        return []
+    plano = contagens.ravel()
+    ordem = np.argsort(-plano, kind='stable')
+    ordem = ordem[plano[ordem] > 0][:limite]
+    n = contagens.shape[1]
+    return [(estados[k // n], estados[k % n], int(plano[k])) for k in ordem]
@@ -2,15 +2,17 @@ import pandas as pd
 import os
 from pathlib import Path
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
 import warnings
 from pandas.errors import ParserError
-import xlrd
 from openpyxl import load_workbook
 import json
 from openpyxl.utils.exceptions import InvalidFileException
+from sessao_leitura import MemoriaEstrategias, SessaoLeitura
+from resolvedor_colunas import normalizar_nome_coluna, obter_resolvedor
+from vocabulario_status import CODIGOS_STATUS, STATUS_CANONICOS, codificar_status, codigo_status
 
 class ValidadorAvancado:
     def __init__(self):
@@ -23,8 +25,14 @@ class ValidadorAvancado:
         # Mapeamento de colunas com múltiplas estratégias
         self.config = self.carregar_configuracao()
         
+        # Alternativas de colunas compiladas uma vez (compartilhadas com ExcelLeitor)
+        self.resolvedor = obter_resolvedor(Path('config/colunas_config.json'))
+        
         # Cache para otimização
         self.cache_dados = {}
+        
+        # Estratégia de leitura que funcionou para cada arquivo (persistida em cache/)
+        self.memoria_estrategias = MemoriaEstrategias()
 
     def setup_logging(self):
         """Configuração avançada de logging"""
@@ -109,36 +117,31 @@ class ValidadorAvancado:
                 config = json.load(f)
         return config
 
-    def ler_planilha(self, arquivo: Path, aba: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-        """Lê planilha com múltiplas estratégias e tratamento de erros"""
-        erros = []
-        dados = None
+    def abrir_sessao(self, arquivo: Path) -> SessaoLeitura:
+        """Abre uma sessão de leitura do arquivo (um handle por estratégia)"""
+        return SessaoLeitura(arquivo, self.config['estrategias_leitura'], self.memoria_estrategias)
+
+    def ler_planilha(self, arquivo: Path, aba: str,
+                     sessao: Optional[SessaoLeitura] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Lê planilha com múltiplas estratégias e tratamento de erros.
+
+        Args:
+            arquivo (Path): Arquivo Excel
+            aba (str): Nome da aba
+            sessao (SessaoLeitura, optional): Sessão já aberta do arquivo, para
+                reaproveitar os handles entre as abas. Sem ela, uma sessão é
+                aberta e fechada só para esta aba.
+        """
+        if sessao is None:
+            with self.abrir_sessao(arquivo) as sessao:
+                return self.ler_planilha(arquivo, aba, sessao)
         
-        for estrategia in self.config['estrategias_leitura']:
-            try:
-                if estrategia == 'pandas':
-                    dados = pd.read_excel(arquivo, sheet_name=aba)
-                elif estrategia == 'openpyxl':
-                    wb = load_workbook(arquivo, data_only=True)
-                    ws = wb[aba]
-                    dados = pd.DataFrame(ws.values)
-                elif estrategia == 'xlrd':
-                    wb = xlrd.open_workbook(arquivo)
-                    ws = wb.sheet_by_name(aba)
-                    dados = pd.DataFrame([ws.row_values(i) for i in range(ws.nrows)])
-                
-                if dados is not None and not dados.empty:
-                    dados = self.limpar_dados(dados)
-                    break
-                    
-            except Exception as e:
-                erros.append(f"Erro na estratégia {estrategia}: {str(e)}")
-                continue
-        
-        if dados is None:
-            raise Exception(f"Todas as estratégias falharam: {'; '.join(erros)}")
+        dados, estrategia, erros = sessao.ler(aba)
+        if not dados.empty:
+            dados = self.limpar_dados(dados)
             
-        return dados, {'erros': erros}
+        return dados, {'erros': erros, 'estrategia': estrategia}
 
     def limpar_dados(self, df: pd.DataFrame) -> pd.DataFrame:
         """Limpa e padroniza os dados"""
@@ -160,13 +163,8 @@ class ValidadorAvancado:
 
     def verificar_cabecalho(self, row: pd.Series) -> bool:
         """Verifica se uma linha é provavelmente o cabeçalho"""
-        colunas_importantes = set()
-        for col in self.config['colunas_essenciais'].keys():
-            alternativas = self.config['colunas_essenciais'][col]['alternativas']
-            colunas_importantes.update(alt.upper() for alt in alternativas)
-        
-        row_values = set(str(val).upper().strip() for val in row if pd.notna(val))
-        return len(row_values.intersection(colunas_importantes)) >= 2
+        row_values = [val for val in row if pd.notna(val)]
+        return self.resolvedor.colunas_reconhecidas(row_values) >= 2
 
     def processar_arquivo(self, arquivo: Path) -> Dict[str, Any]:
         """Processa um arquivo Excel completo"""
@@ -179,21 +177,22 @@ class ValidadorAvancado:
         }
         
         try:
-            xls = pd.ExcelFile(arquivo)
-            for aba in xls.sheet_names:
-                if aba.upper() in ['TESTE', 'RESUMO', 'RELATÓRIO GERAL']:
-                    continue
-                    
-                try:
-                    self.logger.info(f"Processando aba: {aba}")
-                    df, info = self.ler_planilha(arquivo, aba)
-                    dados_processados = self.processar_aba(df, aba)
-                    resultados['abas'][aba] = dados_processados
-                    
-                except Exception as e:
-                    msg = f"Erro ao processar aba {aba}: {str(e)}"
-                    self.logger.error(msg)
-                    resultados['erros'].append(msg)
+            # Um handle por estratégia para o arquivo todo, não um por aba
+            with self.abrir_sessao(arquivo) as sessao:
+                for aba in sessao.abas():
+                    if aba.upper() in ['TESTE', 'RESUMO', 'RELATÓRIO GERAL']:
+                        continue
+                        
+                    try:
+                        self.logger.info(f"Processando aba: {aba}")
+                        df, info = self.ler_planilha(arquivo, aba, sessao)
+                        dados_processados = self.processar_aba(df, aba)
+                        resultados['abas'][aba] = dados_processados
+                        
+                    except Exception as e:
+                        msg = f"Erro ao processar aba {aba}: {str(e)}"
+                        self.logger.error(msg)
+                        resultados['erros'].append(msg)
                     
         except Exception as e:
             msg = f"Erro ao processar arquivo: {str(e)}"
@@ -215,11 +214,15 @@ class ValidadorAvancado:
             'dados_validos': True
         }
         
+        # Localizar todas as colunas essenciais de uma vez
+        posicoes = self.resolvedor.resolver(df.columns)
+        
         # Processar cada coluna essencial
         for col_nome, config in self.config['colunas_essenciais'].items():
-            coluna_encontrada = self.encontrar_coluna(df, config['alternativas'])
+            posicao = posicoes.get(col_nome)
+            coluna_encontrada = df.columns[posicao] if posicao is not None else None
             
-            if coluna_encontrada:
+            if coluna_encontrada is not None:
                 resultados['metricas']['colunas_encontradas'].append(col_nome)
                 
                 # Validar e corrigir dados
@@ -236,20 +239,12 @@ class ValidadorAvancado:
 
     def encontrar_coluna(self, df: pd.DataFrame, alternativas: List[str]) -> str:
         """Encontra a coluna correta usando diferentes estratégias"""
-        for col in df.columns:
-            col_norm = self.normalizar_texto(str(col))
-            for alt in alternativas:
-                alt_norm = self.normalizar_texto(alt)
-                if col_norm == alt_norm:
-                    return col
-        return None
+        posicao = self.resolvedor.encontrar(df.columns, alternativas)
+        return df.columns[posicao] if posicao is not None else None
 
     def normalizar_texto(self, texto: str) -> str:
         """Normaliza texto para comparação"""
-        import unicodedata
-        texto = unicodedata.normalize('NFKD', texto)
-        texto = texto.encode('ASCII', 'ignore').decode('ASCII')
-        return texto.upper().strip().replace(' ', '').replace('_', '')
+        return normalizar_nome_coluna(texto)
 
     def corrigir_datas(self, serie: pd.Series) -> pd.Series:
         """Corrige problemas comuns em datas"""
@@ -260,17 +255,49 @@ class ValidadorAvancado:
 
     def validar_situacao(self, serie: pd.Series) -> pd.Series:
         """Valida e corrige valores da coluna situação"""
-        valores_validos = set(self.config['colunas_essenciais']['SITUACAO']['valores_validos'])
+        valores_validos = self.config['colunas_essenciais']['SITUACAO']['valores_validos']
+        codigos_validos = [codigo_status(v) for v in valores_validos]
         serie = serie.fillna('PENDENTE')
-        serie = serie.astype(str).str.upper().str.strip()
+        
+        # Códigos do vocabulário de status, resolvidos só sobre os valores distintos
+        codigos = codificar_status(serie)
         
         # Corrigir valores inválidos
-        mascara_invalidos = ~serie.isin(valores_validos)
+        mascara_invalidos = ~np.isin(codigos, codigos_validos)
         if mascara_invalidos.any():
             self.logger.warning(f"Valores inválidos encontrados em SITUACAO: {serie[mascara_invalidos].unique()}")
-            serie[mascara_invalidos] = 'PENDENTE'
+            codigos[mascara_invalidos] = CODIGOS_STATUS['PENDENTE']
             
-        return serie
+        return pd.Series(pd.Categorical.from_codes(codigos, categories=STATUS_CANONICOS),
+                         index=serie.index, name=serie.name)
+
+# Colunas do ExcelLeitor convertidas para data
+COLUNAS_DATA = ['DATA', 'RESOLUCAO', 'NEGOCIACAO']
+
+
+class BufferColuna:
+    """
+    Valores de uma coluna lidos linha a linha, em um array NumPy pré-alocado
+    (datetime64 para datas, object para o resto) que dobra de tamanho quando
+    enche.
+    """
+
+    def __init__(self, data: bool, capacidade: int = 1024):
+        self.dtype = 'datetime64[ns]' if data else object
+        self.valores = np.empty(max(capacidade, 1), dtype=self.dtype)
+        self.tamanho = 0
+
+    def adicionar(self, valor: Any):
+        if self.tamanho == len(self.valores):
+            maior = np.empty(2 * len(self.valores), dtype=self.dtype)
+            maior[:self.tamanho] = self.valores
+            self.valores = maior
+        self.valores[self.tamanho] = np.datetime64('NaT') if valor is None and self.dtype != object else valor
+        self.tamanho += 1
+
+    def serie(self) -> pd.Series:
+        return pd.Series(self.valores[:self.tamanho])
+
 
 class ExcelLeitor:
     def __init__(self):
@@ -278,6 +305,7 @@ class ExcelLeitor:
         self.colunas_importantes = [
             'DATA', 'RESOLUÇÃO', 'CONTRATO', 'NEGOCIAÇÃO', 'SITUAÇÃO'
         ]
+        self.resolvedor = obter_resolvedor()
         
     def setup_logging(self):
         """Configura logging"""
@@ -332,38 +360,47 @@ class ExcelLeitor:
             return {'status': 'erro', 'mensagem': msg}
 
     def processar_aba(self, ws) -> Optional[Dict[str, Any]]:
-        """Processa uma aba do Excel"""
+        """
+        Processa uma aba do Excel lendo as linhas em fluxo.
+
+        Só os valores das colunas importantes são guardados, em buffers
+        tipados por coluna (ver ``BufferColuna``), então a memória usada é
+        proporcional às colunas mapeadas e não à aba inteira.
+
+        Returns:
+            dict: ``total_linhas``, ``colunas_encontradas`` e ``dados``
+            (DataFrame com uma coluna por coluna encontrada)
+        """
         try:
-            # Ler todas as linhas da aba
-            rows = list(ws.rows)
-            if not rows:
-                return None
+            linhas = ws.iter_rows(values_only=True)
 
-            # Encontrar cabeçalho
-            header_row = self.encontrar_cabecalho(rows)
+            # Encontrar cabeçalho nas primeiras linhas, sem ler o resto da aba
+            header_row = self.encontrar_cabecalho(linhas)
             if header_row is None:
                 return None
 
-            # Extrair cabeçalho e dados
-            headers = [str(cell.value).strip() if cell.value else '' for cell in rows[header_row]]
+            # Extrair cabeçalho e projetar só as colunas importantes
+            headers = [str(valor).strip() if valor else '' for valor in header_row]
+            projecao = [(col_nome, idx) for col_nome, idx in self.mapear_colunas(headers).items() if idx is not None]
             
-            # Criar dicionário de índices das colunas importantes
-            indices_colunas = self.mapear_colunas(headers)
+            # max_row pode faltar ou incluir linhas só com formatação: os buffers crescem se preciso
+            capacidade = min(ws.max_row or 1024, 65536)
+            buffers = {col_nome: BufferColuna(col_nome in COLUNAS_DATA, capacidade) for col_nome, _ in projecao}
             
             # Processar dados
-            dados = []
-            for row in rows[header_row + 1:]:
-                linha = {}
-                for col_nome, idx in indices_colunas.items():
-                    if idx is not None:
-                        valor = row[idx].value
-                        linha[col_nome] = self.limpar_valor(valor, col_nome)
-                if any(linha.values()):  # Adicionar apenas linhas não vazias
-                    dados.append(linha)
-
+            for row in linhas:
+                valores = [
+                    self.limpar_valor(row[idx] if idx < len(row) else None, col_nome)
+                    for col_nome, idx in projecao
+                ]
+                if any(valores):  # Adicionar apenas linhas não vazias
+                    for (col_nome, _), valor in zip(projecao, valores):
+                        buffers[col_nome].adicionar(valor)
+
+            dados = pd.DataFrame({col_nome: buffer.serie() for col_nome, buffer in buffers.items()})
             return {
                 'total_linhas': len(dados),
-                'colunas_encontradas': list(indices_colunas.keys()),
+                'colunas_encontradas': list(buffers),
                 'dados': dados
             }
 
@@ -371,57 +408,34 @@ class ExcelLeitor:
             self.logger.error(f"Erro ao processar aba {ws.title}: {str(e)}")
             return None
 
-    def encontrar_cabecalho(self, rows: List) -> Optional[int]:
-        """Encontra a linha do cabeçalho"""
-        for idx, row in enumerate(rows[:10]):  # Verificar primeiras 10 linhas
-            valores = [str(cell.value).strip().upper() if cell.value else '' for cell in row]
+    def encontrar_cabecalho(self, rows) -> Optional[tuple]:
+        """Encontra a linha do cabeçalho (valores) nas primeiras 10 linhas"""
+        for idx, row in enumerate(rows):
+            if idx >= 10:
+                break
+            valores = [str(valor).strip().upper() if valor else '' for valor in row]
             if any(col in valores for col in ['DATA', 'RESOLUÇÃO', 'CONTRATO']):
-                return idx
+                return row
         return None
 
     def mapear_colunas(self, headers: List[str]) -> Dict[str, Optional[int]]:
         """Mapeia as colunas importantes para seus índices"""
-        mapeamento = {
-            'DATA': None,
-            'RESOLUCAO': None,
-            'CONTRATO': None,
-            'NEGOCIACAO': None,
-            'SITUACAO': None
-        }
-        
-        alternativas = {
-            'DATA': ['DATA', 'DT', 'DATA_'],
-            'RESOLUCAO': ['RESOLUÇÃO', 'RESOLUCAO', 'RESOL'],
-            'CONTRATO': ['CONTRATO', 'NUM_CONTRATO', 'NÚMERO CONTRATO'],
-            'NEGOCIACAO': ['NEGOCIAÇÃO', 'NEGOCIACAO', 'DT_NEGOCIACAO'],
-            'SITUACAO': ['SITUAÇÃO', 'SITUACAO', 'STATUS']
-        }
-
-        for idx, header in enumerate(headers):
-            header_norm = self.normalizar_texto(header)
-            for col_nome, alts in alternativas.items():
-                if any(self.normalizar_texto(alt) == header_norm for alt in alts):
-                    mapeamento[col_nome] = idx
-                    break
-
-        return mapeamento
+        # Resolução guardada por cabeçalho: abas com o mesmo cabeçalho não são remapeadas
+        return self.resolvedor.resolver(headers)
 
     def normalizar_texto(self, texto: str) -> str:
         """Normaliza texto para comparação"""
-        if not isinstance(texto, str):
-            texto = str(texto)
-        import unicodedata
-        texto = unicodedata.normalize('NFKD', texto)
-        texto = texto.encode('ASCII', 'ignore').decode('ASCII')
-        return texto.upper().strip().replace(' ', '').replace('_', '')
+        return normalizar_nome_coluna(texto)
 
     def limpar_valor(self, valor: Any, tipo_coluna: str) -> Any:
         """Limpa e formata o valor baseado no tipo da coluna"""
         if valor is None:
             return None
 
-        if tipo_coluna in ['DATA', 'RESOLUCAO', 'NEGOCIACAO']:
+        if tipo_coluna in COLUNAS_DATA:
             try:
+                if isinstance(valor, datetime):
+                    return pd.Timestamp(valor)
                 if isinstance(valor, (int, float)):
                     return pd.to_datetime('1899-12-30') + pd.Timedelta(days=int(valor))
                 return pd.to_datetime(valor)
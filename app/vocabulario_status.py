@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Vocabulário de Status
+=====================
+Normalização única dos valores de STATUS/SITUAÇÃO das planilhas.
+
+Cada valor bruto ("Análise", "ANALISE", " em análise ", "PRIORIDADE  TOTAL",
+"Pendete", ...) é reduzido a uma chave (maiúsculas, sem acentos, espaços
+simples) e procurado em uma tabela montada na importação do módulo. A busca é
+feita só sobre os valores distintos da coluna (``pd.factorize``) e o resultado
+é um código inteiro por registro — a posição em ``STATUS_CANONICOS`` — ou um
+``pd.Categorical`` com esses status como categorias. As contagens saem de
+``np.bincount`` sobre os códigos, sem ``value_counts`` nem ``map`` por linha.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Ordem fixa: o código de cada status é a sua posição nesta lista
+STATUS_CANONICOS = [
+    'VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE', 'PRIORIDADE TOTAL',
+    'APROVADO', 'QUITADO', 'APREENDIDO', 'CANCELADO', 'OUTROS ACORDOS',
+    'M.ENCAMINHADA'
+]
+CODIGOS_STATUS = {status: codigo for codigo, status in enumerate(STATUS_CANONICOS)}
+
+# Vazio ou fora do vocabulário
+CODIGO_DESCONHECIDO = -1
+
+# Variações encontradas nas planilhas (flexão, plural, prefixo e digitação)
+SINONIMOS = {
+    'EM ANALISE': 'ANÁLISE',
+    'ANALIZE': 'ANÁLISE',
+    'ANALISADO': 'ANÁLISE',
+    'PENDENTES': 'PENDENTE',
+    'PENDENCIA': 'PENDENTE',
+    'PEDENTE': 'PENDENTE',
+    'PENDETE': 'PENDENTE',
+    'PRIORIDADES': 'PRIORIDADE',
+    'PRIORIDADE TOT': 'PRIORIDADE TOTAL',
+    'PRIORIDADETOTAL': 'PRIORIDADE TOTAL',
+    'VERIFICADA': 'VERIFICADO',
+    'VERIFICADOS': 'VERIFICADO',
+    'APROVADA': 'APROVADO',
+    'APROVADOS': 'APROVADO',
+    'QUITADA': 'QUITADO',
+    'QUITADOS': 'QUITADO',
+    'APREENDIDA': 'APREENDIDO',
+    'APREENDIDOS': 'APREENDIDO',
+    'CANCELADA': 'CANCELADO',
+    'CANCELADOS': 'CANCELADO',
+    'OUTRO ACORDO': 'OUTROS ACORDOS',
+    'OUTROS ACORDO': 'OUTROS ACORDOS',
+    'M ENCAMINHADA': 'M.ENCAMINHADA',
+    'MINUTA ENCAMINHADA': 'M.ENCAMINHADA',
+}
+
+
+def chave_status(valor) -> Optional[str]:
+    """
+    Chave de comparação de um valor bruto.
+
+    Args:
+        valor: Conteúdo da célula
+
+    Returns:
+        str: Texto em maiúsculas, sem acentos e com espaços simples (None para vazio)
+    """
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)) or valor is pd.NaT:
+        return None
+    texto = unicodedata.normalize('NFKD', str(valor))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).upper()
+    texto = re.sub(r'[\s_\-]+', ' ', texto).strip()
+    texto = re.sub(r'\s*\.\s*', '.', texto)
+    return texto or None
+
+
+# Chave -> código, montada uma vez
+_TABELA = {chave_status(status): codigo for status, codigo in CODIGOS_STATUS.items()}
+_TABELA.update({chave_status(variacao): CODIGOS_STATUS[status] for variacao, status in SINONIMOS.items()})
+
+
+def codigo_status(valor) -> int:
+    """Código de um único valor (``CODIGO_DESCONHECIDO`` se não reconhecido)"""
+    return _TABELA.get(chave_status(valor), CODIGO_DESCONHECIDO)
+
+
+def _fatorar(valores):
+    if isinstance(valores, pd.Categorical):
+        return valores.codes.astype(np.int64), valores.categories
+    codigos, unicos = pd.factorize(pd.Series(valores, copy=False), sort=False)
+    return codigos, unicos
+
+
+def codificar_status(valores) -> np.ndarray:
+    """
+    Converte uma coluna de status em códigos inteiros.
+
+    Args:
+        valores (Series/array): Valores brutos da coluna
+
+    Returns:
+        ndarray: Posição em ``STATUS_CANONICOS`` de cada registro
+        (``CODIGO_DESCONHECIDO`` para vazio ou valor fora do vocabulário)
+    """
+    codigos, unicos = _fatorar(valores)
+    tabela = np.array([codigo_status(v) for v in unicos] + [CODIGO_DESCONHECIDO], dtype=np.int16)
+    # codigos == -1 (vazio) cai na última posição da tabela
+    return tabela[codigos]
+
+
+def status_categorico(valores, manter_desconhecidos: bool = True) -> pd.Categorical:
+    """
+    Coluna de status como ``pd.Categorical`` normalizado.
+
+    Args:
+        valores (Series/array): Valores brutos da coluna
+        manter_desconhecidos (bool): Mantém valores fora do vocabulário como
+            categorias extras (em maiúsculas, sem espaços nas pontas); sem
+            isso eles ficam vazios
+
+    Returns:
+        Categorical: Categorias ``STATUS_CANONICOS`` (e extras, depois delas)
+    """
+    codigos, unicos = _fatorar(valores)
+    categorias = list(STATUS_CANONICOS)
+    extras: Dict[str, int] = {}
+    tabela = []
+    for valor in unicos:
+        codigo = codigo_status(valor)
+        if codigo == CODIGO_DESCONHECIDO and manter_desconhecidos and chave_status(valor) is not None:
+            texto = str(valor).strip().upper()
+            if texto not in extras:
+                extras[texto] = len(categorias)
+                categorias.append(texto)
+            codigo = extras[texto]
+        tabela.append(codigo)
+    tabela = np.array(tabela + [CODIGO_DESCONHECIDO], dtype=np.int64)
+    return pd.Categorical.from_codes(tabela[codigos], categories=categorias)
+
+
+def contagem_por_codigo(codigos: np.ndarray, tamanho: int = len(STATUS_CANONICOS)) -> np.ndarray:
+    """Registros de cada código (vazios e desconhecidos ficam de fora)"""
+    codigos = np.asarray(codigos)
+    return np.bincount(codigos[codigos >= 0], minlength=tamanho)
+
+
+def contar_status(valores) -> Dict[str, int]:
+    """
+    Contagem de registros por status normalizado.
+
+    Args:
+        valores (Series/array/Categorical): Valores brutos ou já categorizados
+
+    Returns:
+        dict: {status: quantidade} com maior contagem primeiro, como em
+        ``value_counts`` (inclui valores fora do vocabulário, sem os vazios)
+    """
+    if isinstance(valores, pd.Series) and isinstance(valores.dtype, pd.CategoricalDtype):
+        valores = valores.array
+    if not isinstance(valores, pd.Categorical) or list(valores.categories[:len(STATUS_CANONICOS)]) != STATUS_CANONICOS:
+        valores = status_categorico(valores)
+    contagem = contagem_por_codigo(valores.codes, len(valores.categories))
+    ordem = np.argsort(-contagem, kind='stable')
+    return {valores.categories[i]: int(contagem[i]) for i in ordem if contagem[i]}
@@ -5,9 +5,15 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+# Módulos compartilhados de leitura ficam em app/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+from carregador_planilhas import obter_carregador
+from vocabulario_status import CODIGO_DESCONHECIDO, codificar_status
+
 class AuditorDados:
     def __init__(self):
         self.arquivos = {
@@ -21,7 +27,7 @@ class AuditorDados:
         if not os.path.exists(caminho):
             return False, f"Arquivo {nome_arquivo} não encontrado em {caminho}"
         try:
-            pd.read_excel(caminho, sheet_name=None)
+            obter_carregador(caminho).abas
             return True, f"Arquivo {nome_arquivo} validado com sucesso"
         except Exception as e:
             return False, f"Erro ao ler arquivo {nome_arquivo}: {str(e)}"
@@ -48,8 +54,9 @@ class AuditorDados:
                 analise['problemas_detectados'].append("Erro na conversão de datas")
                 
         if 'Status' in df.columns:
-            status_invalidos = df[~df['Status'].isin(['VERIFICADO', 'ANÁLISE', 'PENDENTE', 'PRIORIDADE', 
-                                                     'PRIORIDADE TOTAL', 'APROVADO', 'QUITADO', 'APREENDIDO', 'CANCELADO'])]['Status'].unique()
+            # Fora do vocabulário de status mesmo após normalizar acentos e grafia
+            codigos = codificar_status(df['Status'])
+            status_invalidos = df['Status'][codigos == CODIGO_DESCONHECIDO].unique()
             if len(status_invalidos) > 0:
                 analise['problemas_detectados'].append(f"Status inválidos encontrados: {status_invalidos}")
         
@@ -64,8 +71,8 @@ class AuditorDados:
             
             if self.relatorio_completo[nome]['status_arquivo'][0]:
                 try:
-                    # Lê todas as abas
-                    excel_file = pd.read_excel(caminho, sheet_name=None)
+                    # Lê todas as abas (do cache em disco quando o arquivo não mudou)
+                    excel_file = obter_carregador(caminho).ler_abas(ignorar=[])
                     self.relatorio_completo[nome]['abas'] = {}
                     
                     for aba_nome, df in excel_file.items():
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do Histórico de Métricas
+==================================
+Mede a latência das consultas de histórico do DatabaseManager sobre uma tabela
+``metricas`` com muitas linhas (padrão: 1 milhão), com os índices criados pelas
+migrações e depois sem eles, para comparação.
+
+Uso:
+    python benchmark_historico_metricas.py [--linhas 1000000] [--repeticoes 20]
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database_manager import DatabaseManager
+
+INDICES = ['idx_metricas_colaborador_data', 'idx_metricas_grupo_data', 'idx_metricas_data']
+
+# Consultas de dois passes usadas por get_group_comparison antes da migração 2
+SQL_COMPARACAO_ANTIGA = [
+    'SELECT grupo, AVG(taxa_eficiencia) FROM metricas GROUP BY grupo',
+    'SELECT grupo, SUM(total_registros) FROM metricas GROUP BY grupo',
+]
+
+
+def popular(db, linhas, colaboradores, tamanho_lote=50000):
+    """Insere linhas sintéticas distribuídas pelos últimos 365 dias"""
+    aleatorio = random.Random(42)
+    agora = datetime.now()
+    inseridas = 0
+    while inseridas < linhas:
+        lote = []
+        for _ in range(min(tamanho_lote, linhas - inseridas)):
+            indice = aleatorio.randrange(len(colaboradores))
+            lote.append({
+                'colaborador': colaboradores[indice],
+                'grupo': 'Julio' if indice % 2 else 'Leandro',
+                'data': agora - timedelta(minutes=aleatorio.randrange(365 * 24 * 60)),
+                'total_registros': aleatorio.randrange(1, 500),
+                'taxa_eficiencia': aleatorio.random(),
+                'tendencia': aleatorio.choice(['crescente', 'decrescente', 'estável'])
+            })
+        db.store_metrics_batch(lote)
+        inseridas += len(lote)
+
+
+def medir(funcao, repeticoes):
+    """Mediana do tempo de execução, em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def consultas(db, colaborador):
+    conn = db._get_connection()
+    return {
+        'get_efficiency_trend (30 dias)': lambda: db.get_efficiency_trend(colaborador, days=30),
+        'get_metrics_history (colaborador)': lambda: db.get_metrics_history(colaborador=colaborador),
+        'get_metrics_history (grupo, 90 dias)': lambda: db.get_metrics_history(
+            grupo='Julio', start_date=datetime.now() - timedelta(days=90), limit=100),
+        'get_metrics_history (sem filtro)': lambda: db.get_metrics_history(),
+        'get_group_comparison': db.get_group_comparison,
+        'comparação em duas consultas (antiga)': lambda: [conn.execute(sql).fetchall() for sql in SQL_COMPARACAO_ANTIGA],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=1000000)
+    parser.add_argument('--colaboradores', type=int, default=60)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger('database_manager').setLevel(logging.WARNING)
+    colaboradores = [f'COLABORADOR {i:03d}' for i in range(args.colaboradores)]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, 'benchmark.db'))
+        print(f"Populando {args.linhas:,} linhas...")
+        inicio = time.perf_counter()
+        popular(db, args.linhas, colaboradores)
+        print(f"Inserção: {time.perf_counter() - inicio:.1f}s")
+        db._get_connection().execute('ANALYZE')
+
+        com_indices = {nome: medir(f, args.repeticoes) for nome, f in consultas(db, colaboradores[0]).items()}
+
+        conn = db._get_connection()
+        for indice in INDICES:
+            conn.execute(f'DROP INDEX {indice}')
+        conn.execute('ANALYZE')
+        sem_indices = {nome: medir(f, max(1, args.repeticoes // 4)) for nome, f in consultas(db, colaboradores[0]).items()}
+        db.close()
+
+    print(f"\nLatência mediana com {args.linhas:,} linhas (ms)")
+    print(f"{'consulta':<42}{'sem índices':>14}{'com índices':>14}{'ganho':>10}")
+    for nome in com_indices:
+        ganho = sem_indices[nome] / com_indices[nome] if com_indices[nome] else float('inf')
+        print(f"{nome:<42}{sem_indices[nome]:>14.2f}{com_indices[nome]:>14.2f}{ganho:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark dos Motores de Leitura Excel
+======================================
+Compara o tempo de leitura de todas as abas das planilhas dos grupos com cada
+motor disponível (ver ``app/motores_excel.py``) e confere se os DataFrames
+produzidos são iguais aos do openpyxl.
+
+Sem os arquivos dos grupos (ou com ``--sintetico``), gera uma planilha com o
+mesmo formato das listas individuais.
+
+Uso:
+    python benchmark_motores_excel.py [arquivos ...] [--repeticoes 3] [--sintetico 20000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+from motores_excel import CALAMINE_DISPONIVEL, abrir_planilha
+
+ARQUIVOS_GRUPOS = ['(JULIO) LISTAS INDIVIDUAIS.xlsx', '(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx']
+DIRETORIOS = ['data', '.', 'F:/okok/data', 'F:/okok']
+
+SITUACOES = ['PENDENTE', 'VERIFICADO', 'ANÁLISE', 'PRIORIDADE', 'APROVADO', 'QUITADO', 'CANCELADO']
+
+
+def localizar_arquivos():
+    encontrados = []
+    for nome in ARQUIVOS_GRUPOS:
+        for diretorio in DIRETORIOS:
+            caminho = os.path.join(diretorio, nome)
+            if os.path.exists(caminho):
+                encontrados.append(caminho)
+                break
+    return encontrados
+
+
+def gerar_planilha(caminho, linhas, abas=8):
+    """Planilha sintética com uma aba por colaborador"""
+    aleatorio = random.Random(42)
+    inicio = datetime(2024, 1, 1)
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        for i in range(abas):
+            datas = [inicio + timedelta(days=aleatorio.randrange(365)) for _ in range(linhas // abas)]
+            pd.DataFrame({
+                'DATA': datas,
+                'CONTRATO': [aleatorio.randrange(10**6, 10**7) for _ in datas],
+                'SITUAÇÃO': [aleatorio.choice(SITUACOES) for _ in datas],
+                'RESOLUÇÃO': [d + timedelta(days=aleatorio.randrange(30)) for d in datas],
+                'BANCO': [aleatorio.choice(['BANCO A', 'BANCO B', 'BANCO C']) for _ in datas],
+                'OBSERVAÇÃO': ['observação do atendimento'] * len(datas),
+            }).to_excel(writer, sheet_name=f'COLABORADOR {i + 1}', index=False)
+
+
+def ler_todas(caminho, motor):
+    planilha = abrir_planilha(caminho, motor)
+    try:
+        return {aba: planilha.parse(aba) for aba in planilha.sheet_names}
+    finally:
+        planilha.close()
+
+
+def medir(caminho, motor, repeticoes):
+    """Mediana do tempo de leitura, em segundos, e o resultado da última leitura"""
+    tempos, abas = [], None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        abas = ler_todas(caminho, motor)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), abas
+
+
+def iguais(esperado, obtido):
+    if list(esperado) != list(obtido):
+        return False
+    for aba, df in esperado.items():
+        try:
+            pd.testing.assert_frame_equal(df, obtido[aba], check_dtype=False)
+        except AssertionError:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('arquivos', nargs='*', help='Planilhas (padrão: as dos grupos)')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--sintetico', type=int, default=0, metavar='LINHAS',
+                        help='Gera uma planilha com este total de linhas')
+    args = parser.parse_args()
+
+    motores = ['openpyxl'] + (['calamine'] if CALAMINE_DISPONIVEL else [])
+    if not CALAMINE_DISPONIVEL:
+        print("python-calamine não está instalado: só o openpyxl será medido (pip install python-calamine)")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivos = args.arquivos or ([] if args.sintetico else localizar_arquivos())
+        if not arquivos:
+            linhas = args.sintetico or 20000
+            caminho = os.path.join(diretorio, 'sintetico.xlsx')
+            print(f"Gerando planilha sintética com {linhas:,} linhas...")
+            gerar_planilha(caminho, linhas)
+            arquivos = [caminho]
+
+        print(f"\n{'arquivo':<45}{'motor':<12}{'tempo (s)':>10}{'ganho':>8}  resultado")
+        for caminho in arquivos:
+            base, referencia = medir(caminho, 'openpyxl', args.repeticoes)
+            nome = os.path.basename(caminho)
+            print(f"{nome:<45}{'openpyxl':<12}{base:>10.2f}{1:>7.1f}x  referência")
+            for motor in motores[1:]:
+                tempo, abas = medir(caminho, motor, args.repeticoes)
+                resultado = 'igual' if iguais(referencia, abas) else 'DIVERGENTE'
+                print(f"{nome:<45}{motor:<12}{tempo:>10.2f}{base / tempo:>7.1f}x  {resultado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 import pandas as pd
 import numpy as np
-from debug_excel import AnalisadorExcel
 from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
 from datetime import datetime, timedelta
 import warnings
 import os
+import sys
 import json
+
+# Módulos da aplicação (debug_excel, tendencias) ficam em app/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+
+from debug_excel import AnalisadorExcel
+from tendencias import ajustar_tendencias
 warnings.filterwarnings('ignore')
 
 class AnalisadorAvancado:
@@ -377,55 +381,60 @@ class AnalisadorAvancado:
         }
         
         try:
-            # Para cada grupo, realizar previsões
-            for grupo_nome, grupo_metricas in [("Julio", self.metricas_julio), ("Leandro", self.metricas_leandro)]:
+            grupos = [
+                ("Julio", self.metricas_julio, 'metricas_julio'),
+                ("Leandro", self.metricas_leandro, 'metricas_leandro')
+            ]
+            
+            # Eficiência de todos os colaboradores ao longo do histórico em uma
+            # matriz (colaborador x análise), com NaN onde o colaborador não aparece.
+            # O índice da análise é usado como proxy para tempo.
+            posicao = {}
+            for grupo_nome, grupo_metricas, _ in grupos:
+                for colaborador in (grupo_metricas or {}):
+                    posicao[(grupo_nome, colaborador)] = len(posicao)
+            
+            eficiencia = np.full((len(posicao), len(self.historico_analises)), np.nan)
+            for idx, analise in enumerate(self.historico_analises):
+                for grupo_nome, _, chave_historico in grupos:
+                    for colaborador, metricas in analise.get(chave_historico, {}).items():
+                        i = posicao.get((grupo_nome, colaborador))
+                        if i is not None and metricas:
+                            valor = metricas.get('taxa_eficiencia', 0)
+                            eficiencia[i, idx] = np.nan if valor is None else valor
+            
+            # Um único ajuste para todos os colaboradores; previsão para os
+            # próximos 3 períodos após os pontos de cada um
+            ajuste = ajustar_tendencias(eficiencia)
+            previsoes_todas = ajuste.prever(ajuste.pontos[:, None] + np.arange(3))
+            # Como em r2_score: o ajuste de uma série constante é perfeito
+            r2_todos = np.where(np.isnan(ajuste.r2), 1.0, ajuste.r2)
+            
+            # Para cada grupo, exibir as previsões
+            for grupo_nome, grupo_metricas, _ in grupos:
                 if not grupo_metricas:
                     continue
                 
                 print(f"\nPrevisões para grupo {grupo_nome}:")
                 
-                # Para cada colaborador, construir modelo preditivo
                 for colaborador in grupo_metricas.keys():
-                    # Coletar dados históricos deste colaborador
-                    dados_historicos = []
-                    datas = []
-                    
-                    for idx, analise in enumerate(self.historico_analises):
-                        if grupo_nome == "Julio":
-                            metricas_grupo = analise.get('metricas_julio', {})
-                        else:
-                            metricas_grupo = analise.get('metricas_leandro', {})
-                        
-                        if colaborador in metricas_grupo and metricas_grupo[colaborador]:
-                            dados_historicos.append(metricas_grupo[colaborador].get('taxa_eficiencia', 0))
-                            datas.append(idx)  # Usar índice como proxy para tempo
+                    i = posicao[(grupo_nome, colaborador)]
                     
                     # Se temos pelo menos 3 pontos de dados, podemos fazer previsão
-                    if len(dados_historicos) >= 3:
-                        # Preparar dados para modelo
-                        X = np.array(datas).reshape(-1, 1)
-                        y = np.array(dados_historicos)
-                        
-                        # Criar e treinar modelo
-                        modelo = LinearRegression()
-                        modelo.fit(X, y)
-                        
-                        # Fazer previsão para próximos 3 períodos
-                        proximos_periodos = np.array([len(datas), len(datas)+1, len(datas)+2]).reshape(-1, 1)
-                        previsoes = modelo.predict(proximos_periodos)
-                        
-                        # Calcular qualidade do modelo
-                        y_pred = modelo.predict(X)
-                        r2 = r2_score(y, y_pred)
+                    if ajuste.pontos[i] >= 3:
+                        dados_historicos = eficiencia[i][~np.isnan(eficiencia[i])].tolist()
+                        previsoes = previsoes_todas[i]
+                        r2 = float(r2_todos[i])
+                        coeficiente = float(ajuste.inclinacao[i])
                         
                         # Armazenar resultados
                         resultados_preditivos[grupo_nome][colaborador] = {
                             "historico": dados_historicos,
                             "previsoes": previsoes.tolist(),
                             "r2": r2,
-                            "tendencia": "crescente" if modelo.coef_[0] > 0 else "decrescente",
-                            "coeficiente": float(modelo.coef_[0]),
-                            "intercepto": float(modelo.intercept_)
+                            "tendencia": "crescente" if coeficiente > 0 else "decrescente",
+                            "coeficiente": coeficiente,
+                            "intercepto": float(ajuste.intercepto[i])
                         }
                         
                         # Exibir resultados
@@ -899,11 +908,10 @@ class AnalisadorAvancado:
             # Análise de tendências
             df_tendencia = df.groupby('Data').size().reset_index()
             if len(df_tendencia) > 1:
-                X = np.arange(len(df_tendencia)).reshape(-1, 1)
-                y = df_tendencia[0].values
-                reg = LinearRegression().fit(X, y)
-                r2 = reg.score(X, y)
-                tendencia = 'crescente' if reg.coef_[0] > 0 else 'decrescente'
+                ajuste = ajustar_tendencias(df_tendencia[0].values)
+                # Como em LinearRegression.score: série constante tem ajuste perfeito
+                r2 = 1.0 if np.isnan(ajuste.r2) else float(ajuste.r2)
+                tendencia = 'crescente' if ajuste.inclinacao > 0 else 'decrescente'
             else:
                 tendencia = 'estável'
                 r2 = 0
@@ -3,6 +3,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import sys
+
+# Módulos compartilhados de leitura ficam em app/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+from carregador_planilhas import obter_carregador
 
 # Configuração da página
 st.set_page_config(page_title="Dashboard de Atividades", layout="wide", initial_sidebar_state="expanded")
@@ -19,12 +24,14 @@ def get_data():
         st.write("Arquivos encontrados:", os.listdir(base_path))
         
         # Ler planilha do Julio
-        df_julio = pd.read_excel(planilha_julio)
+        carregador_julio = obter_carregador(planilha_julio)
+        df_julio = carregador_julio.ler_aba(carregador_julio.abas[0])
         df_julio['Grupo'] = 'JULIO'
         st.success("Planilha do Julio carregada com sucesso!")
         
         # Ler planilha do Leandro
-        df_leandro = pd.read_excel(planilha_leandro)
+        carregador_leandro = obter_carregador(planilha_leandro)
+        df_leandro = carregador_leandro.ler_aba(carregador_leandro.abas[0])
         df_leandro['Grupo'] = 'LEANDRO'
         st.success("Planilha do Leandro carregada com sucesso!")
         
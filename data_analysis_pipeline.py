@@ -9,6 +9,7 @@ This module orchestrates the entire data workflow from raw Excel files to intera
 """
 
 import os
+import sys
 import json
 import logging
 from datetime import datetime
@@ -22,9 +23,12 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 
 # Local imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
 from analise_avancada import AnalisadorAvancado
-from debug_excel import AnalisadorExcel
+from debug_excel import AnalisadorExcel, VERSAO_METRICAS_ABA
 from database_manager import DatabaseManager
+from metricas_incrementais import MetricasIncrementais
+from motores_excel import definir_motor_padrao
 
 # Configure logging
 logging.basicConfig(
@@ -52,8 +56,10 @@ class DataAnalysisPipeline:
             config_file (str, optional): Path to configuration file. Defaults to None.
         """
         self.config = self._load_config(config_file)
+        self._configure_excel_engine()
         self.db_manager = DatabaseManager('analise_historica.db')
         self.analisador = AnalisadorAvancado()
+        self.metricas_store = MetricasIncrementais('pipeline', versao_calculo=VERSAO_METRICAS_ABA)
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Create output directories if they don't exist
@@ -70,6 +76,10 @@ class DataAnalysisPipeline:
                 "julio": "(JULIO) LISTAS INDIVIDUAIS.xlsx",
                 "leandro": "(LEANDRO_ADRIANO) LISTAS INDIVIDUAIS.xlsx"
             },
+            "input_settings": {
+                # "auto" uses calamine when installed, "openpyxl" forces the pandas default
+                "excel_engine": "auto"
+            },
             "analysis_settings": {
                 "store_history": True,
                 "history_limit": 10,
@@ -104,6 +114,15 @@ class DataAnalysisPipeline:
         
         return default_config
     
+    def _configure_excel_engine(self):
+        """Apply the configured Excel engine to every workbook loader in this process."""
+        engine = self.config.get("input_settings", {}).get("excel_engine", "auto")
+        try:
+            definir_motor_padrao(engine)
+            logger.info(f"Excel engine: {engine}")
+        except ValueError as e:
+            logger.error(f"{str(e)}; keeping the default engine")
+    
     def run_pipeline(self):
         """Execute the complete data analysis pipeline."""
         logger.info("Starting data analysis pipeline")
@@ -139,15 +158,18 @@ class DataAnalysisPipeline:
         logger.info("Extracting data from Excel files")
         
         try:
-            # Process Julio's group data
-            julio_file = self.config["input_files"]["julio"]
-            logger.info(f"Processing {julio_file}")
-            self.analisador.analisar_arquivo(julio_file)
-            
-            # Process Leandro's group data
-            leandro_file = self.config["input_files"]["leandro"]
-            logger.info(f"Processing {leandro_file}")
-            self.analisador.analisar_arquivo(leandro_file)
+            # Process each group's file; only sheets changed since the last run
+            # are recomputed, the others come from the metrics store
+            for grupo in ("julio", "leandro"):
+                arquivo = self.config["input_files"][grupo]
+                logger.info(f"Processing {arquivo}")
+                analisador_excel = AnalisadorExcel(arquivo)
+                resultado = self.metricas_store.atualizar(arquivo, analisador_excel.calcular_metricas_aba)
+                logger.info(f"{len(resultado['alteradas'])} of {len(resultado['metricas'])} sheets recomputed for {grupo}")
+                
+                metricas = {aba: m for aba, m in resultado['metricas'].items() if m}
+                sem_metricas = [aba for aba, m in resultado['metricas'].items() if not m]
+                self.analisador.atualizar_metricas(grupo, metricas, resultado['removidas'] + sem_metricas)
             
             # Save extracted data if configured
             if self.config["output_settings"]["save_intermediate_data"]:
@@ -177,14 +199,15 @@ class DataAnalysisPipeline:
         logger.info("Performing data analysis")
         
         try:
-            # Run correlation analysis
-            self.analisador.analisar_correlacoes()
+            # Analyze trends
+            self.analisador.analisar_tendencias()
             
             # Detect bottlenecks
-            self.analisador.detectar_gargalos()
+            self.analisador.identificar_gargalos()
             
-            # Analyze trends
-            self.analisador.analisar_tendencias()
+            # Generate predictions
+            if self.config["analysis_settings"]["generate_predictions"]:
+                self.analisador.gerar_previsoes()
             
             # Save analysis results if configured
             if self.config["output_settings"]["save_intermediate_data"]:
@@ -224,29 +247,25 @@ class DataAnalysisPipeline:
         logger.info("Storing results in database")
         
         try:
-            # Store summary metrics for Julio's group
-            for colaborador, metricas in self.analisador.metricas_julio.items():
-                if metricas:
-                    self.db_manager.store_metrics(
-                        colaborador=colaborador,
-                        grupo="Julio",
-                        data=datetime.now(),
-                        total_registros=metricas.get('total_registros', 0),
-                        taxa_eficiencia=metricas.get('taxa_eficiencia', 0),
-                        tendencia=metricas.get('tendencia', {}).get('direcao', 'estável')
-                    )
+            # Store every collaborator of both groups in a single transaction
+            data = datetime.now()
+            registros = []
+            for grupo, metricas_grupo in (("Julio", self.analisador.metricas_julio),
+                                          ("Leandro", self.analisador.metricas_leandro)):
+                for colaborador, metricas in metricas_grupo.items():
+                    if metricas:
+                        registros.append({
+                            'colaborador': colaborador,
+                            'grupo': grupo,
+                            'data': data,
+                            'total_registros': metricas.get('total_registros') or 0,
+                            'taxa_eficiencia': metricas.get('taxa_eficiencia') or 0,
+                            'tendencia': (metricas.get('tendencia') or {}).get('direcao', 'estável'),
+                            'distribuicao_status': metricas.get('distribuicao_status') or {},
+                            'tempo_medio_resolucao': metricas.get('tempo_medio_resolucao')
+                        })
             
-            # Store summary metrics for Leandro's group
-            for colaborador, metricas in self.analisador.metricas_leandro.items():
-                if metricas:
-                    self.db_manager.store_metrics(
-                        colaborador=colaborador,
-                        grupo="Leandro",
-                        data=datetime.now(),
-                        total_registros=metricas.get('total_registros', 0),
-                        taxa_eficiencia=metricas.get('taxa_eficiencia', 0),
-                        tendencia=metricas.get('tendencia', {}).get('direcao', 'estável')
-                    )
+            self.db_manager.store_metrics_batch(registros)
             
             logger.info("Results stored in database")
             
@@ -11,80 +11,308 @@ Provides a clean interface for data persistence across analysis runs.
 import sqlite3
 import logging
 import json
+import threading
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# SQL statements are kept as module constants so every call reuses the same
+# text and sqlite3 serves them from the connection's prepared statement cache
+SQL_INSERT_METRICS = '''
+INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+SQL_UPSERT_DAILY = '''
+INSERT INTO metricas_diarias (dia, grupo, colaborador, amostras, soma_eficiencia, soma_registros,
+                              soma_pendentes, soma_tempo_resolucao, amostras_tempo_resolucao)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT (dia, grupo, colaborador) DO UPDATE SET
+    amostras = amostras + 1,
+    soma_eficiencia = soma_eficiencia + excluded.soma_eficiencia,
+    soma_registros = soma_registros + excluded.soma_registros,
+    soma_pendentes = soma_pendentes + excluded.soma_pendentes,
+    soma_tempo_resolucao = soma_tempo_resolucao + excluded.soma_tempo_resolucao,
+    amostras_tempo_resolucao = amostras_tempo_resolucao + excluded.amostras_tempo_resolucao
+'''
+
+SQL_UPSERT_DAILY_STATUS = '''
+INSERT INTO metricas_diarias_status (dia, grupo, colaborador, status, soma_quantidade)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (dia, grupo, colaborador, status) DO UPDATE SET
+    soma_quantidade = soma_quantidade + excluded.soma_quantidade
+'''
+
+SQL_DAILY_ROLLUP = '''
+SELECT dia, grupo, colaborador, amostras,
+       soma_eficiencia / amostras AS taxa_eficiencia,
+       CAST(soma_registros AS REAL) / amostras AS total_registros,
+       CAST(soma_pendentes AS REAL) / amostras AS casos_pendentes,
+       CASE WHEN amostras_tempo_resolucao > 0
+            THEN soma_tempo_resolucao / amostras_tempo_resolucao END AS tempo_medio_resolucao
+FROM metricas_diarias
+WHERE dia >= date('now', :periodo)
+  AND (:grupo IS NULL OR grupo = :grupo COLLATE NOCASE)
+  AND (:colaborador IS NULL OR colaborador = :colaborador)
+ORDER BY dia, grupo, colaborador
+'''
+
+SQL_DAILY_STATUS = '''
+SELECT s.dia, s.grupo, s.colaborador, s.status,
+       CAST(s.soma_quantidade AS REAL) / d.amostras AS quantidade
+FROM metricas_diarias_status s
+JOIN metricas_diarias d USING (dia, grupo, colaborador)
+WHERE s.dia >= date('now', :periodo)
+  AND (:grupo IS NULL OR s.grupo = :grupo COLLATE NOCASE)
+  AND (:colaborador IS NULL OR s.colaborador = :colaborador)
+ORDER BY s.dia, s.grupo, s.colaborador, s.status
+'''
+
+SQL_INSERT_ANALYSIS_HISTORY = '''
+INSERT INTO analise_historica (data, grupo, metricas)
+VALUES (?, ?, ?)
+'''
+
+SQL_EFFICIENCY_TREND = '''
+SELECT data, taxa_eficiencia 
+FROM metricas 
+WHERE colaborador = ? 
+AND data >= date('now', ?) 
+ORDER BY data ASC
+'''
+
+SQL_GROUP_COMPARISON = '''
+SELECT grupo, AVG(taxa_eficiencia) as avg_eficiencia, SUM(total_registros) as total
+FROM metricas
+GROUP BY grupo
+'''
+
+SQL_SAVE_CONFIGURATION = '''
+INSERT OR REPLACE INTO configuracoes (chave, valor, updated_at)
+VALUES (?, ?, CURRENT_TIMESTAMP)
+'''
+
+SQL_GET_CONFIGURATION = '''
+SELECT valor FROM configuracoes WHERE chave = ?
+'''
+
+# Schema migrations: (version, description, statements). New changes are
+# appended with the next version number; applied ones must never be edited.
+MIGRATIONS = [
+    (1, "initial schema", [
+        '''
+        CREATE TABLE IF NOT EXISTS metricas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            colaborador TEXT NOT NULL,
+            grupo TEXT NOT NULL,
+            data TIMESTAMP NOT NULL,
+            total_registros INTEGER NOT NULL,
+            taxa_eficiencia REAL NOT NULL,
+            tendencia TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS analise_historica (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TIMESTAMP NOT NULL,
+            grupo TEXT NOT NULL,
+            metricas TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS configuracoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chave TEXT UNIQUE NOT NULL,
+            valor TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    (2, "covering indexes for history queries", [
+        # get_efficiency_trend / get_metrics_history by collaborator:
+        # seek on colaborador, range and order on data, value read from the index
+        '''
+        CREATE INDEX IF NOT EXISTS idx_metricas_colaborador_data
+        ON metricas (colaborador, data, taxa_eficiencia)
+        ''',
+        # get_group_comparison / get_metrics_history by group: the aggregate
+        # is computed from the index alone, already grouped by grupo
+        '''
+        CREATE INDEX IF NOT EXISTS idx_metricas_grupo_data
+        ON metricas (grupo, data, taxa_eficiencia, total_registros)
+        ''',
+        # get_metrics_history without filters: latest rows first
+        '''
+        CREATE INDEX IF NOT EXISTS idx_metricas_data
+        ON metricas (data)
+        ''',
+    ]),
+    (3, "daily rollup tables", [
+        # One row per day and collaborator, kept up to date by
+        # store_metrics_batch. Columns are sums over the day's snapshots, so
+        # every write is a plain increment; daily values are soma / amostras.
+        '''
+        CREATE TABLE IF NOT EXISTS metricas_diarias (
+            dia TEXT NOT NULL,
+            grupo TEXT NOT NULL,
+            colaborador TEXT NOT NULL,
+            amostras INTEGER NOT NULL,
+            soma_eficiencia REAL NOT NULL,
+            soma_registros INTEGER NOT NULL,
+            soma_pendentes INTEGER NOT NULL,
+            soma_tempo_resolucao REAL NOT NULL,
+            amostras_tempo_resolucao INTEGER NOT NULL,
+            PRIMARY KEY (dia, grupo, colaborador)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS metricas_diarias_status (
+            dia TEXT NOT NULL,
+            grupo TEXT NOT NULL,
+            colaborador TEXT NOT NULL,
+            status TEXT NOT NULL,
+            soma_quantidade INTEGER NOT NULL,
+            PRIMARY KEY (dia, grupo, colaborador, status)
+        ) WITHOUT ROWID
+        ''',
+        # Backfill from the history already stored (no status breakdown there)
+        '''
+        INSERT OR IGNORE INTO metricas_diarias
+        SELECT substr(data, 1, 10), grupo, colaborador, COUNT(*), SUM(taxa_eficiencia),
+               SUM(total_registros), 0, 0, 0
+        FROM metricas
+        GROUP BY substr(data, 1, 10), grupo, colaborador
+        ''',
+    ]),
+]
+
+# Daily values served by the rollup query API
+DAILY_METRICS = ('taxa_eficiencia', 'total_registros', 'casos_pendentes', 'tempo_medio_resolucao')
+
 class DatabaseManager:
     """
     Manages database operations for the analytics system.
     Handles schema creation, data storage, and retrieval.
+    
+    Each thread gets one long-lived connection (SQLite connections cannot be
+    shared between threads), opened on first use in WAL mode and kept until
+    close() is called.
     """
     
-    def __init__(self, db_path):
+    def __init__(self, db_path, timeout=30.0):
         """
         Initialize the database manager.
         
         Args:
             db_path (str): Path to the SQLite database file
+            timeout (float, optional): Seconds to wait for a locked database
         """
         self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
         self._initialize_db()
     
+    def _get_connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers run while a batch is being written; with WAL,
+            # synchronous=NORMAL only syncs at checkpoints and stays durable
+            # against application crashes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every connection opened by this manager."""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close connection: {str(e)}")
+            self._connections = []
+        self._local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     def _initialize_db(self):
-        """Create the database schema if it doesn't exist."""
+        """Create the database schema and apply pending migrations."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Create metrics table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS metricas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                colaborador TEXT NOT NULL,
-                grupo TEXT NOT NULL,
-                data TIMESTAMP NOT NULL,
-                total_registros INTEGER NOT NULL,
-                taxa_eficiencia REAL NOT NULL,
-                tendencia TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Create analysis_history table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS analise_historica (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                data TIMESTAMP NOT NULL,
-                grupo TEXT NOT NULL,
-                metricas TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Create configuration table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS configuracoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chave TEXT UNIQUE NOT NULL,
-                valor TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            conn.commit()
-            logger.info("Database initialized successfully")
+            versao = self.migrate()
+            logger.info(f"Database initialized successfully (schema version {versao})")
             
         except Exception as e:
             logger.error(f"Database initialization failed: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+    
+    def schema_version(self):
+        """
+        Get the schema version recorded in the database.
+        
+        Returns:
+            int: Number of the last migration applied (0 for a new database)
+        """
+        return self._get_connection().execute('PRAGMA user_version').fetchone()[0]
+    
+    def migrate(self, target_version=None):
+        """
+        Apply the pending schema migrations, in order.
+        
+        The version applied last is stored in SQLite's user_version pragma.
+        Each migration runs in its own transaction together with the version
+        bump, so an interrupted upgrade never leaves a half-applied step.
+        
+        Args:
+            target_version (int, optional): Stop after this migration.
+                Defaults to the latest one.
+        
+        Returns:
+            int: Schema version after the upgrade
+        """
+        conn = self._get_connection()
+        versao_atual = self.schema_version()
+        
+        for versao, descricao, comandos in MIGRATIONS:
+            if versao <= versao_atual:
+                continue
+            if target_version is not None and versao > target_version:
+                break
+            
+            try:
+                conn.execute('BEGIN')
+                for comando in comandos:
+                    conn.execute(comando)
+                conn.execute(f'PRAGMA user_version = {versao:d}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            versao_atual = versao
+            logger.info(f"Migration {versao} applied: {descricao}")
+        
+        return versao_atual
     
     def store_metrics(self, colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia):
         """
         Store metrics for a collaborator.
         
+        To store a whole run use store_metrics_batch, which writes every
+        collaborator in a single transaction.
+        
         Args:
             colaborador (str): Name of the collaborator
             grupo (str): Group name (Julio or Leandro)
@@ -96,25 +324,70 @@ class DatabaseManager:
         Returns:
             bool: True if successful, False otherwise
         """
+        return self.store_metrics_batch([{
+            'colaborador': colaborador,
+            'grupo': grupo,
+            'data': data,
+            'total_registros': total_registros,
+            'taxa_eficiencia': taxa_eficiencia,
+            'tendencia': tendencia
+        }])
+    
+    def store_metrics_batch(self, registros):
+        """
+        Store metrics for many collaborators in one transaction.
+        
+        The daily rollup (metricas_diarias / metricas_diarias_status) is
+        updated in the same transaction, so history views never need to read
+        the raw rows.
+        
+        Args:
+            registros (list): Dicts with the store_metrics arguments
+                (colaborador, grupo, data, total_registros, taxa_eficiencia,
+                tendencia). Optional keys feed the rollup: distribuicao_status
+                (dict status -> count), casos_pendentes (defaults to the
+                PENDENTE count) and tempo_medio_resolucao.
+        
+        Returns:
+            bool: True if every record was stored, False otherwise (in which
+                case nothing is stored)
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (colaborador, grupo, data.isoformat(), total_registros, taxa_eficiencia, tendencia))
-            
-            conn.commit()
-            logger.info(f"Metrics stored for {colaborador} in group {grupo}")
+            linhas = []
+            linhas_diarias = []
+            linhas_status = []
+            for r in registros:
+                linhas.append((r['colaborador'], r['grupo'], r['data'].isoformat(),
+                               r['total_registros'], r['taxa_eficiencia'], r['tendencia']))
+                
+                dia = r['data'].date().isoformat()
+                chave = (dia, r['grupo'], r['colaborador'])
+                distribuicao = r.get('distribuicao_status') or {}
+                pendentes = r.get('casos_pendentes')
+                if pendentes is None:
+                    pendentes = distribuicao.get('PENDENTE', 0)
+                tempo = r.get('tempo_medio_resolucao')
+                linhas_diarias.append(chave + (
+                    r['taxa_eficiencia'], r['total_registros'], pendentes,
+                    tempo if tempo is not None else 0.0, 0 if tempo is None else 1
+                ))
+                linhas_status.extend(chave + (str(status), int(quantidade)) for status, quantidade in distribuicao.items())
+            
+            if not linhas:
+                return True
+            
+            conn = self._get_connection()
+            with conn:
+                conn.executemany(SQL_INSERT_METRICS, linhas)
+                conn.executemany(SQL_UPSERT_DAILY, linhas_diarias)
+                conn.executemany(SQL_UPSERT_DAILY_STATUS, linhas_status)
+            
+            logger.info(f"Metrics stored for {len(linhas)} collaborators")
             return True
             
         except Exception as e:
             logger.error(f"Failed to store metrics: {str(e)}")
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def store_analysis_history(self, data, grupo, metricas):
         """
@@ -129,27 +402,21 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # Convert metrics to JSON string
             metricas_json = json.dumps(metricas, ensure_ascii=False)
             
-            cursor.execute('''
-            INSERT INTO analise_historica (data, grupo, metricas)
-            VALUES (?, ?, ?)
-            ''', (data.isoformat(), grupo, metricas_json))
+            with conn:
+                cursor.execute(SQL_INSERT_ANALYSIS_HISTORY, (data.isoformat(), grupo, metricas_json))
             
-            conn.commit()
             logger.info(f"Analysis history stored for group {grupo}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to store analysis history: {str(e)}")
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def get_metrics_history(self, colaborador=None, grupo=None, start_date=None, end_date=None, limit=10):
         """
@@ -166,8 +433,7 @@ class DatabaseManager:
             list: List of metrics records
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             query = "SELECT * FROM metricas WHERE 1=1"
@@ -201,9 +467,6 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to retrieve metrics history: {str(e)}")
             return []
-        finally:
-            if conn:
-                conn.close()
     
     def get_efficiency_trend(self, colaborador, days=30):
         """
@@ -217,17 +480,10 @@ class DatabaseManager:
             dict: Trend data with dates and efficiency values
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = self._get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-            SELECT data, taxa_eficiencia 
-            FROM metricas 
-            WHERE colaborador = ? 
-            AND data >= date('now', ?) 
-            ORDER BY data ASC
-            ''', (colaborador, f'-{days} days'))
+            cursor.execute(SQL_EFFICIENCY_TREND, (colaborador, f'-{days} days'))
             
             results = [dict(row) for row in cursor.fetchall()]
             
@@ -242,9 +498,6 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to retrieve efficiency trend: {str(e)}")
             return {"dates": [], "efficiency": []}
-        finally:
-            if conn:
-                conn.close()
     
     def get_group_comparison(self):
         """
@@ -254,28 +507,15 @@ class DatabaseManager:
             dict: Comparison metrics between groups
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
-            # Get average efficiency by group
-            cursor.execute('''
-            SELECT grupo, AVG(taxa_eficiencia) as avg_eficiencia
-            FROM metricas
-            GROUP BY grupo
-            ''')
-            
-            efficiency_results = cursor.fetchall()
-            efficiency_by_group = {row[0]: row[1] for row in efficiency_results}
+            # Average efficiency and total records by group, in a single pass
+            cursor.execute(SQL_GROUP_COMPARISON)
             
-            # Get total records by group
-            cursor.execute('''
-            SELECT grupo, SUM(total_registros) as total
-            FROM metricas
-            GROUP BY grupo
-            ''')
-            
-            total_results = cursor.fetchall()
-            total_by_group = {row[0]: row[1] for row in total_results}
+            results = cursor.fetchall()
+            efficiency_by_group = {row['grupo']: row['avg_eficiencia'] for row in results}
+            total_by_group = {row['grupo']: row['total'] for row in results}
             
             # Compile the comparison data
             comparison = {
@@ -288,9 +528,122 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to retrieve group comparison: {str(e)}")
             return {"efficiency": {}, "total_records": {}}
-        finally:
-            if conn:
-                conn.close()
+    
+    def get_daily_rollup(self, days=30, grupo=None, colaborador=None):
+        """
+        Get daily metrics per collaborator from the rollup table.
+        
+        Each value is the mean of the snapshots stored that day. The cost
+        depends on days x collaborators, not on how many raw rows exist.
+        
+        Args:
+            days (int, optional): Number of days to look back
+            grupo (str, optional): Filter by group (case-insensitive)
+            colaborador (str, optional): Filter by collaborator name
+        
+        Returns:
+            list: Dicts with dia, grupo, colaborador, amostras,
+                taxa_eficiencia, total_registros, casos_pendentes and
+                tempo_medio_resolucao, ordered by day
+        """
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(SQL_DAILY_ROLLUP, {
+                'periodo': f'-{days} days',
+                'grupo': grupo,
+                'colaborador': colaborador
+            })
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Failed to retrieve daily rollup: {str(e)}")
+            return []
+    
+    def get_daily_status_counts(self, days=30, grupo=None, colaborador=None):
+        """
+        Get the mean daily count of each status per collaborator.
+        
+        Args:
+            days (int, optional): Number of days to look back
+            grupo (str, optional): Filter by group (case-insensitive)
+            colaborador (str, optional): Filter by collaborator name
+        
+        Returns:
+            list: Dicts with dia, grupo, colaborador, status and quantidade
+        """
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(SQL_DAILY_STATUS, {
+                'periodo': f'-{days} days',
+                'grupo': grupo,
+                'colaborador': colaborador
+            })
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Failed to retrieve daily status counts: {str(e)}")
+            return []
+    
+    def get_daily_trend(self, metric='taxa_eficiencia', days=30, grupo=None, by_group=False):
+        """
+        Get a daily trend, ready to plot.
+        
+        Args:
+            metric (str, optional): taxa_eficiencia, total_registros,
+                casos_pendentes or tempo_medio_resolucao
+            days (int, optional): Number of days to look back
+            grupo (str, optional): Filter by group (case-insensitive)
+            by_group (bool, optional): One series per group (mean of its
+                collaborators) instead of one per collaborator
+        
+        Returns:
+            dict: {"dates": [...], "series": {name: [value per date]}},
+                with None where there is no data for a date
+        """
+        return self._daily_matrix(metric, days, grupo, 'grupo' if by_group else 'colaborador')
+    
+    def get_daily_heatmap(self, metric='casos_pendentes', days=30, grupo=None):
+        """
+        Get a collaborator x day matrix for heatmaps.
+        
+        Args:
+            metric (str, optional): Same options as get_daily_trend
+            days (int, optional): Number of days to look back
+            grupo (str, optional): Filter by group (case-insensitive)
+        
+        Returns:
+            dict: {"dates": [...], "colaboradores": [...], "values": [[...]]},
+                one row of values per collaborator
+        """
+        matriz = self._daily_matrix(metric, days, grupo, 'colaborador')
+        return {
+            "dates": matriz["dates"],
+            "colaboradores": list(matriz["series"].keys()),
+            "values": list(matriz["series"].values())
+        }
+    
+    def _daily_matrix(self, metric, days, grupo, serie):
+        """Pivot the rollup rows into one list of daily values per series."""
+        if metric not in DAILY_METRICS:
+            raise ValueError(f"Unknown daily metric: {metric}")
+        
+        linhas = self.get_daily_rollup(days=days, grupo=grupo)
+        datas = sorted({linha['dia'] for linha in linhas})
+        posicao = {dia: i for i, dia in enumerate(datas)}
+        
+        valores = {}
+        for linha in linhas:
+            if linha[metric] is not None:
+                celulas = valores.setdefault(linha[serie], [[] for _ in datas])
+                celulas[posicao[linha['dia']]].append(linha[metric])
+        
+        series = {
+            nome: [sum(celula) / len(celula) if celula else None for celula in celulas]
+            for nome, celulas in sorted(valores.items())
+        }
+        return {"dates": datas, "series": series}
     
     def save_configuration(self, key, value):
         """
@@ -304,28 +657,22 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # Convert value to JSON if it's not a string
             if not isinstance(value, str):
                 value = json.dumps(value)
             
-            cursor.execute('''
-            INSERT OR REPLACE INTO configuracoes (chave, valor, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (key, value))
+            with conn:
+                cursor.execute(SQL_SAVE_CONFIGURATION, (key, value))
             
-            conn.commit()
             logger.info(f"Configuration saved: {key}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to save configuration: {str(e)}")
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def get_configuration(self, key, default=None):
         """
@@ -339,12 +686,10 @@ class DatabaseManager:
             any: Configuration value
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-            SELECT valor FROM configuracoes WHERE chave = ?
-            ''', (key,))
+            cursor.execute(SQL_GET_CONFIGURATION, (key,))
             
             result = cursor.fetchone()
             
@@ -362,6 +707,3 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to retrieve configuration: {str(e)}")
             return default
-        finally:
-            if conn:
-                conn.close()
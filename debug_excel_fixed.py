@@ -6,6 +6,10 @@ from datetime import datetime, timedelta
 import warnings
 import traceback
 import json
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+from normalizacao_datas import converter_datas
 
 # Suprimir avisos específicos do pandas
 warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
@@ -150,7 +154,7 @@ class AnalisadorExcel:
             
             # Converter coluna de data para datetime
             df_processado = df.copy()
-            df_processado[coluna_data] = df_processado[coluna_data].apply(self.corrigir_formato_data)
+            df_processado[coluna_data] = converter_datas(df_processado[coluna_data], verbose=False)
             
             # Remover linhas com data inválida
             df_processado = df_processado.dropna(subset=[coluna_data])
@@ -8,7 +8,7 @@ from analise_avancada import AnalisadorAvancado
 
 class RelatorioAvancado:
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = DatabaseManager('analise_historica.db')
         self.analisador = AnalisadorAvancado()
         
     def gerar_relatorio(self):
@@ -37,15 +37,14 @@ class RelatorioAvancado:
         
     def mostrar_metricas_historicas(self, dias, grupo):
         """Mostra gráficos históricos das principais métricas"""
-        df = self.db.obter_historico_metricas(dias)
-        
-        if grupo != "Todos":
-            df = df[df['grupo'] == grupo]
+        # Valores diários já agregados no banco (um por colaborador e dia)
+        filtro_grupo = None if grupo == "Todos" else grupo
+        df = pd.DataFrame(self.db.get_daily_rollup(days=dias, grupo=filtro_grupo))
         
         if not df.empty:
             # Gráfico de eficiência ao longo do tempo
             fig = px.line(df, 
-                         x='data_analise', 
+                         x='dia', 
                          y='taxa_eficiencia',
                          color='colaborador',
                          title='Evolução da Taxa de Eficiência')
@@ -59,16 +58,11 @@ class RelatorioAvancado:
             st.plotly_chart(fig)
             
             # Heatmap de casos pendentes por colaborador
-            pivot = df.pivot_table(
-                values='casos_pendentes',
-                index='colaborador',
-                columns='data_analise',
-                aggfunc='mean'
-            )
+            heatmap = self.db.get_daily_heatmap('casos_pendentes', days=dias, grupo=filtro_grupo)
             fig = go.Figure(data=go.Heatmap(
-                z=pivot.values,
-                x=pivot.columns,
-                y=pivot.index,
+                z=heatmap['values'],
+                x=heatmap['dates'],
+                y=heatmap['colaboradores'],
                 colorscale='RdYlGn_r'
             ))
             fig.update_layout(title='Heatmap de Casos Pendentes por Colaborador')
@@ -19,6 +19,11 @@ import xlrd  # Para arquivos .xls
 from openpyxl import load_workbook  # Para arquivos .xlsx
 import sqlite3
 import re
+import sys
+
+# Gravação no banco compartilhada com static/analisar_dados_v5.py
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'static'))
+from ingestao_banco import gravar_contagens
 
 class AnalisadorInteligente:
     def __init__(self):
@@ -54,6 +59,8 @@ class AnalisadorInteligente:
         self.horas_trabalho = 8
         
         self.modelos = {}
+        # Dados da última análise completa (gravados por exportar_para_sqlite)
+        self.dados_grupos = None
         warnings.filterwarnings('ignore')
         
     def calcular_metricas_avancadas(self, dados_grupos):
@@ -508,6 +515,7 @@ class AnalisadorInteligente:
         try:
             # 1. Carregar dados
             dados_grupos = self.carregar_dados()
+            self.dados_grupos = dados_grupos
             
             # 2. Validar dados antes de prosseguir
             if not self.validar_dados_antes_geracao(dados_grupos):
@@ -1069,14 +1077,28 @@ class AnalisadorInteligente:
             return False
 
     def exportar_para_sqlite(self, dados_grupos=None):
-        """Exporta os dados para um banco de dados SQLite"""
+        """
+        Exporta os dados para um banco de dados SQLite.
+
+        As métricas de ``dados_grupos`` (ou as da última análise completa) são
+        gravadas direto no banco; o relatório txt só é importado quando não há
+        dados carregados neste processo.
+        """
         try:
             print("\n=== Exportando dados para SQLite ===")
             
             # Criar instância do gerenciador de banco de dados
             db_manager = RelatorioDatabase()
             
-            # Verificar se já existe relatório gerado
+            dados_grupos = dados_grupos or self.dados_grupos
+            if dados_grupos:
+                if db_manager.importar_dados_grupos(dados_grupos):
+                    print("✓ Dados exportados com sucesso!")
+                    return True
+                print("✗ Falha ao gravar dados no banco.")
+                return False
+            
+            # Sem dados em memória: usar o relatório gerado anteriormente
             relatorio_path = Path('F:/relatoriotest/relatorio_completo.txt')
             if relatorio_path.exists():
                 print(f"Importando dados do relatório: {relatorio_path}")
@@ -1293,6 +1315,7 @@ class RelatorioDatabase:
         self.db_path = db_path
         self.conn = None
         self.criar_tabelas()
+        self.horas_trabalho = 8  # Horas de trabalho por dia
     
     def conectar(self):
         """Estabelece conexão com o banco de dados"""
@@ -1366,7 +1389,12 @@ class RelatorioDatabase:
         self.fechar()
 
     def importar_relatorio_txt(self, caminho_relatorio):
-        """Importa dados do relatório txt para o banco de dados"""
+        """
+        Importa dados do relatório txt para o banco de dados.
+
+        Mantido para relatórios gerados antes; com os dados carregados em
+        memória use ``importar_dados_grupos``.
+        """
         try:
             with open(caminho_relatorio, 'r', encoding='utf-8') as file:
                 conteudo = file.read()
@@ -1396,6 +1424,38 @@ class RelatorioDatabase:
         finally:
             self.fechar()
 
+    def importar_dados_grupos(self, dados_grupos, data_relatorio=None):
+        """
+        Grava no banco as métricas calculadas pelo ``AnalisadorInteligente``,
+        sem passar pelo relatório txt (ver ``ingestao_banco.gravar_contagens``).
+
+        Args:
+            dados_grupos (dict): {grupo: {'metricas': {colaborador: metricas}}},
+                como retornado por ``carregar_dados``
+            data_relatorio (date, optional): Data gravada nas linhas (padrão: hoje)
+
+        Returns:
+            bool: True se os dados foram gravados
+        """
+        data_relatorio = data_relatorio or datetime.now().date()
+        try:
+            registros = [
+                (grupo.upper(), colaborador, metricas.get('status_counts', {}))
+                for grupo, dados in dados_grupos.items()
+                for colaborador, metricas in dados.get('metricas', {}).items()
+            ]
+            gravados = gravar_contagens(self.conectar(), registros, data_relatorio, self.horas_trabalho)
+            print(f"✓ {gravados['colaboradores']} colaboradores de {gravados['grupos']} grupos "
+                  f"gravados em: {self.db_path}")
+            return True
+
+        except Exception as e:
+            print(f"Erro ao gravar dados no banco: {str(e)}")
+            traceback.print_exc()
+            return False
+        finally:
+            self.fechar()
+
 if __name__ == "__main__":
     try:
         print("\n=== Iniciando Análise de Dados ===")
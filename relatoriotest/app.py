@@ -4,14 +4,16 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import sqlite3
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import base64
-from io import BytesIO
 from pathlib import Path
 import uvicorn
 from datetime import datetime, timedelta
 import os
+import sys
+
+# Módulos compartilhados com o dashboard de static/ (mesmo banco e mesmas rotas)
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'static'))
+from exportacao import resposta_exportacao
+from servico_graficos import servico_graficos, resposta_grafico, dados_barras_eficiencia, dados_pizza_status
 
 # Criar diretório para templates e arquivos estáticos se não existirem
 os.makedirs("templates", exist_ok=True)
@@ -25,51 +27,30 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Configurar templates
 templates = Jinja2Templates(directory="templates")
 
+# Configurar banco de dados
+DB_PATH = "F:/relatoriotest/relatorio_dashboard.db"
+
 # Função para conectar ao banco de dados
 def get_db():
-    db_path = "F:/relatoriotest/relatorio_dashboard.db"
     # Usar check_same_thread=False para evitar o erro de thread
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # Para retornar dicionários
     try:
         yield conn
     finally:
         conn.close()
 
-# Função para gerar gráficos
+# Funções para gerar gráficos: a renderização roda no pool do servico_graficos e
+# a imagem é servida em /charts/{chave}.png
 def gerar_grafico_pizza(df_status):
-    plt.figure(figsize=(10, 6))
-    labels = ['Verificado', 'Análise', 'Pendente', 'Prioridade', 
-              'Prioridade Total', 'Aprovado', 'Apreendido', 'Cancelado']
-    valores = [df_status[0][col] for col in ['verificado', 'analise', 'pendente', 'prioridade', 
-                                           'prioridade_total', 'aprovado', 'apreendido', 'cancelado']]
-    
-    plt.pie(valores, labels=labels, autopct='%1.1f%%', startangle=90)
-    plt.title('Distribuição de Status')
-    
-    buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode('utf-8')
-    plt.close()
-    
-    return img_str
+    return servico_graficos.solicitar('pizza_status', dados_pizza_status(df_status[0]))
 
 def gerar_grafico_barras(df_metricas):
-    plt.figure(figsize=(12, 8))
-    df_top10 = df_metricas.nlargest(10, 'eficiencia')
-    sns.barplot(x='colaborador', y='eficiencia', hue='grupo', data=df_top10)
-    plt.title('Top 10 Colaboradores por Eficiência')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode('utf-8')
-    plt.close()
-    
-    return img_str
+    # Sem eficiências numéricas (banco vazio) não há gráfico de barras
+    dados = dados_barras_eficiencia(df_metricas)
+    if dados is None:
+        return None
+    return servico_graficos.solicitar('barras_eficiencia', dados)
 
 # Rota principal - Dashboard
 @app.get("/", response_class=HTMLResponse)
@@ -129,7 +110,7 @@ async def dashboard(request: Request, conn: sqlite3.Connection = Depends(get_db)
         metricas = cursor.fetchall()
         
         # Converter para DataFrame para gráficos
-        df_metricas = pd.DataFrame(metricas)
+        df_metricas = pd.DataFrame([dict(m) for m in metricas])
         
         # Gerar gráficos
         grafico_pizza = gerar_grafico_pizza(status)
@@ -148,73 +129,19 @@ async def dashboard(request: Request, conn: sqlite3.Connection = Depends(get_db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao gerar dashboard: {str(e)}")
 
+# Imagens dos gráficos (a chave é o hash dos dados e serve de ETag)
+@app.get("/charts/{chave}.png")
+async def obter_grafico(chave: str, request: Request):
+    return await resposta_grafico(chave, request.headers.get("if-none-match"))
+
 # Rota para exportar dados
 @app.get("/exportar/{tipo}/{formato}")
-async def exportar_dados(tipo: str, formato: str, conn: sqlite3.Connection = Depends(get_db)):
-    from fastapi.responses import FileResponse
-    
+async def exportar_dados(tipo: str, formato: str):
+    """Exporta um relatório em CSV ou Excel, lendo o banco em lotes"""
     try:
-        cursor = conn.cursor()
-        
-        if tipo == "diario":
-            query = """
-            SELECT c.nome as colaborador, g.nome as grupo, rd.*
-            FROM relatorio_diario rd
-            JOIN colaboradores c ON rd.colaborador_id = c.id
-            JOIN grupos g ON c.grupo_id = g.id
-            """
-            nome_arquivo = "relatorio_diario"
-        
-        elif tipo == "geral":
-            query = """
-            SELECT c.nome as colaborador, g.nome as grupo, rg.*
-            FROM relatorio_geral rg
-            JOIN colaboradores c ON rg.colaborador_id = c.id
-            JOIN grupos g ON c.grupo_id = g.id
-            """
-            nome_arquivo = "relatorio_geral"
-        
-        elif tipo == "metricas":
-            query = """
-            SELECT c.nome as colaborador, g.nome as grupo, mp.*
-            FROM metricas_produtividade mp
-            JOIN colaboradores c ON mp.colaborador_id = c.id
-            JOIN grupos g ON c.grupo_id = g.id
-            """
-            nome_arquivo = "metricas_produtividade"
-        
-        else:
-            raise HTTPException(status_code=400, detail="Tipo de relatório inválido")
-        
-        # Executar consulta
-        cursor.execute(query)
-        dados = cursor.fetchall()
-        df = pd.DataFrame(dados)
-        
-        # Caminho para salvar o arquivo
-        data_atual = datetime.now().strftime("%Y%m%d")
-        caminho_arquivo = f"static/{nome_arquivo}_{data_atual}"
-        
-        # Exportar conforme formato solicitado
-        if formato == "excel":
-            caminho_completo = f"{caminho_arquivo}.xlsx"
-            df.to_excel(caminho_completo, index=False)
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        
-        elif formato == "csv":
-            caminho_completo = f"{caminho_arquivo}.csv"
-            df.to_csv(caminho_completo, index=False)
-            media_type = "text/csv"
-        
-        else:
-            raise HTTPException(status_code=400, detail="Formato inválido")
-        
-        return FileResponse(
-            path=caminho_completo,
-            filename=os.path.basename(caminho_completo),
-            media_type=media_type
-        )
-    
+        return resposta_exportacao(DB_PATH, tipo, formato)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao exportar dados: {str(e)}")
 
@@ -347,7 +274,7 @@ def criar_template_html():
                                                 <h4>Distribuição de Status</h4>
                                             </div>
                                             <div class="card-body text-center">
-                                                <img src="data:image/png;base64,{{ grafico_pizza }}" class="img-fluid">
+                                                <img src="/charts/{{ grafico_pizza }}.png" class="img-fluid">
                                             </div>
                                         </div>
                                     </div>
@@ -419,7 +346,11 @@ def criar_template_html():
                                                 <h4>Top Colaboradores</h4>
                                             </div>
                                             <div class="card-body text-center">
-                                                <img src="data:image/png;base64,{{ grafico_barras }}" class="img-fluid">
+                                                {% if grafico_barras %}
+                                                <img src="/charts/{{ grafico_barras }}.png" class="img-fluid">
+                                                {% else %}
+                                                <p class="text-muted">Sem dados de eficiência disponíveis</p>
+                                                {% endif %}
                                             </div>
                                         </div>
                                     </div>
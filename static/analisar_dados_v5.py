@@ -19,6 +19,8 @@ import xlrd  # Para arquivos .xls
 from openpyxl import load_workbook  # Para arquivos .xlsx
 import sqlite3
 import re
+from ingestao_banco import COLUNAS_STATUS, gravar_contagens, linha_relatorio
+from cache_resultados import invalidar_cache
 
 class AnalisadorInteligente:
     def __init__(self):
@@ -55,6 +57,8 @@ class AnalisadorInteligente:
         self.horas_trabalho = 8
         
         self.modelos = {}
+        # Dados da última análise completa (gravados por exportar_para_sqlite)
+        self.dados_grupos = None
         warnings.filterwarnings('ignore')
         
     def calcular_metricas_avancadas(self, dados_grupos):
@@ -509,6 +513,7 @@ class AnalisadorInteligente:
         try:
             # 1. Carregar dados
             dados_grupos = self.carregar_dados()
+            self.dados_grupos = dados_grupos
             
             # 2. Validar dados antes de prosseguir
             if not self.validar_dados_antes_geracao(dados_grupos):
@@ -1079,14 +1084,28 @@ class AnalisadorInteligente:
             return False
 
     def exportar_para_sqlite(self, dados_grupos=None):
-        """Exporta os dados para um banco de dados SQLite"""
+        """
+        Exporta os dados para um banco de dados SQLite.
+
+        As métricas de ``dados_grupos`` (ou as da última análise completa) são
+        gravadas direto no banco; o relatório txt só é importado quando não há
+        dados carregados neste processo.
+        """
         try:
             print("\n=== Exportando dados para SQLite ===")
             
             # Criar instância do gerenciador de banco de dados
             db_manager = RelatorioDatabase()
             
-            # Verificar se já existe relatório gerado
+            dados_grupos = dados_grupos or self.dados_grupos
+            if dados_grupos:
+                if db_manager.importar_dados_grupos(dados_grupos):
+                    print("✓ Dados exportados com sucesso!")
+                    return True
+                print("✗ Falha ao gravar dados no banco.")
+                return False
+            
+            # Sem dados em memória: usar o relatório gerado anteriormente
             relatorio_path = Path('F:/relatoriotest/relatorio_completo.txt')
             if relatorio_path.exists():
                 print(f"Importando dados do relatório: {relatorio_path}")
@@ -1377,7 +1396,12 @@ class RelatorioDatabase:
         self.fechar()
 
     def importar_relatorio_txt(self, caminho_relatorio):
-        """Importa dados do relatório txt para o banco de dados"""
+        """
+        Importa dados do relatório txt para o banco de dados.
+
+        Mantido para relatórios gerados antes; com os dados carregados em
+        memória use ``importar_dados_grupos``.
+        """
         try:
             with open(caminho_relatorio, 'r', encoding='utf-8') as file:
                 conteudo = file.read()
@@ -1454,8 +1478,9 @@ class RelatorioDatabase:
             
             # Inserir dados no relatório geral
             for dados in dados_relatorio:
-                total = sum(dados[k] for k in ['verificado', 'analise', 'pendente', 'prioridade',
-                                             'prioridade_total', 'aprovado', 'apreendido', 'cancelado'])
+                # Total e métricas com a mesma definição de importar_dados_grupos
+                contagens = {status: dados[coluna] for status, coluna in COLUNAS_STATUS.items()}
+                colunas, metricas = linha_relatorio(contagens, self.horas_trabalho)
                 
                 cursor.execute('''
                     INSERT OR REPLACE INTO relatorio_geral (
@@ -1465,24 +1490,7 @@ class RelatorioDatabase:
                         aprovado, apreendido, cancelado,
                         total
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    dados['colaborador_id'],
-                    dados['data_relatorio'],
-                    dados['verificado'],
-                    dados['analise'],
-                    dados['pendente'],
-                    dados['prioridade'],
-                    dados['prioridade_total'],
-                    dados['aprovado'],
-                    dados['apreendido'],
-                    dados['cancelado'],
-                    total
-                ))
-                
-                # Calcular métricas de produtividade
-                prod_horaria = total / self.horas_trabalho if self.horas_trabalho > 0 else 0
-                prod_diaria = prod_horaria * self.horas_trabalho
-                eficiencia = (dados['aprovado'] / total * 100) if total > 0 else 0
+                ''', (dados['colaborador_id'], dados['data_relatorio'], *colunas))
                 
                 # Inserir métricas de produtividade
                 cursor.execute('''
@@ -1490,15 +1498,11 @@ class RelatorioDatabase:
                         colaborador_id, data_relatorio,
                         prod_diaria, prod_horaria, eficiencia
                     ) VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    dados['colaborador_id'],
-                    dados['data_relatorio'],
-                    prod_diaria,
-                    prod_horaria,
-                    eficiencia
-                ))
+                ''', (dados['colaborador_id'], dados['data_relatorio'], *metricas))
             
             conn.commit()
+            # O dashboard não deve continuar servindo o contexto anterior à importação
+            invalidar_cache()
             print(f"✓ Dados importados com sucesso para o banco de dados: {self.db_path}")
             return True
         
@@ -1509,6 +1513,40 @@ class RelatorioDatabase:
         finally:
             self.fechar()
 
+    def importar_dados_grupos(self, dados_grupos, data_relatorio=None):
+        """
+        Grava no banco as métricas calculadas pelo ``AnalisadorInteligente``,
+        sem passar pelo relatório txt (ver ``ingestao_banco.gravar_contagens``).
+
+        Args:
+            dados_grupos (dict): {grupo: {'metricas': {colaborador: metricas}}},
+                como retornado por ``carregar_dados``
+            data_relatorio (date, optional): Data gravada nas linhas (padrão: hoje)
+
+        Returns:
+            bool: True se os dados foram gravados
+        """
+        data_relatorio = data_relatorio or datetime.now().date()
+        try:
+            registros = [
+                (grupo.upper(), colaborador, metricas.get('status_counts', {}))
+                for grupo, dados in dados_grupos.items()
+                for colaborador, metricas in dados.get('metricas', {}).items()
+            ]
+            gravados = gravar_contagens(self.conectar(), registros, data_relatorio, self.horas_trabalho)
+            # O dashboard não deve continuar servindo o contexto anterior à gravação
+            invalidar_cache()
+            print(f"✓ {gravados['colaboradores']} colaboradores de {gravados['grupos']} grupos "
+                  f"gravados em: {self.db_path}")
+            return True
+
+        except Exception as e:
+            print(f"Erro ao gravar dados no banco: {str(e)}")
+            traceback.print_exc()
+            return False
+        finally:
+            self.fechar()
+
 if __name__ == "__main__":
     try:
         print("\n=== Iniciando Análise de Dados ===")
@@ -0,0 +1,102 @@
+"""
+Cache de Resultados do Dashboard
+================================
+Guarda em memória o contexto já calculado das páginas do dashboard para que
+visualizações repetidas não consultem o SQLite.
+
+Uma entrada deixa de valer quando:
+
+1. passa o TTL (``DASHBOARD_CACHE_TTL``, em segundos; padrão 300);
+2. alguma escrita no banco chama :func:`invalidar_cache` (importação do
+   relatório, rota ``/atualizar``);
+3. o arquivo do banco muda de tamanho ou data de modificação, o que cobre
+   escritas feitas por outro processo (ex.: ``python analisar_dados_v5.py``).
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+TTL_PADRAO = float(os.getenv("DASHBOARD_CACHE_TTL", "300"))
+
+
+def assinatura_banco(db_path) -> Optional[Tuple[int, int]]:
+    """Tamanho e data de modificação do arquivo do banco (None se não existe)"""
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class CacheResultados:
+    """Cache com TTL e invalidação explícita, seguro para várias threads"""
+
+    def __init__(self, ttl: float = TTL_PADRAO):
+        self.ttl = ttl
+        self._entradas: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._locks_chave: Dict[Hashable, threading.Lock] = {}
+        self._geracao = 0
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Any], versao: Any = None) -> Any:
+        """
+        Retorna o valor em cache para ``chave`` ou o calcula com ``calcular()``.
+
+        Args:
+            chave: Identificador da entrada
+            calcular (callable): Função sem argumentos que produz o valor
+            versao: Valor que, se diferente do gravado, torna a entrada inválida
+                (ex.: :func:`assinatura_banco`)
+        """
+        valor = self._valida(chave, versao)
+        if valor is not None:
+            return valor[0]
+
+        # Uma requisição calcula; as concorrentes esperam e reaproveitam
+        with self._lock:
+            lock_chave = self._locks_chave.setdefault(chave, threading.Lock())
+        with lock_chave:
+            valor = self._valida(chave, versao)
+            if valor is not None:
+                return valor[0]
+
+            geracao = self._geracao
+            resultado = calcular()
+            with self._lock:
+                # Uma invalidação durante o cálculo descarta o resultado
+                if geracao == self._geracao:
+                    self._entradas[chave] = {
+                        'valor': resultado,
+                        'versao': versao,
+                        'expira_em': time.monotonic() + self.ttl
+                    }
+            return resultado
+
+    def _valida(self, chave: Hashable, versao: Any) -> Optional[Tuple[Any]]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            if entrada['expira_em'] <= time.monotonic() or entrada['versao'] != versao:
+                del self._entradas[chave]
+                return None
+            return (entrada['valor'],)
+
+    def invalidar(self, chave: Optional[Hashable] = None):
+        """Descarta uma entrada (ou todas)"""
+        with self._lock:
+            self._geracao += 1
+            if chave is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(chave, None)
+
+
+cache_dashboard = CacheResultados()
+
+
+def invalidar_cache():
+    """Chamada após qualquer escrita no banco do dashboard"""
+    cache_dashboard.invalidar()
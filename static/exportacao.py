@@ -0,0 +1,152 @@
+"""
+Exportação em Streaming
+=======================
+Gera os arquivos de ``/exportar/{tipo}/{formato}`` direto na resposta HTTP,
+lendo o SQLite em lotes com ``fetchmany``. Nenhum arquivo é gravado em
+``static/`` e a memória usada não depende do tamanho da tabela:
+
+- CSV: cada lote de linhas vira um pedaço da resposta;
+- Excel: planilha openpyxl em modo ``write_only`` (as linhas vão para disco
+  conforme são adicionadas), salva em um arquivo temporário anônimo que é
+  enviado em blocos e apagado ao final.
+"""
+
+import csv
+import io
+import sqlite3
+import tempfile
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+
+TAMANHO_LOTE = 1000
+TAMANHO_BLOCO = 64 * 1024
+
+CONSULTAS_EXPORTACAO = {
+    "diario": ("relatorio_diario", """
+        SELECT c.nome as colaborador, g.nome as grupo, rd.*
+        FROM relatorio_diario rd
+        JOIN colaboradores c ON rd.colaborador_id = c.id
+        JOIN grupos g ON c.grupo_id = g.id
+    """),
+    "geral": ("relatorio_geral", """
+        SELECT c.nome as colaborador, g.nome as grupo, rg.*
+        FROM relatorio_geral rg
+        JOIN colaboradores c ON rg.colaborador_id = c.id
+        JOIN grupos g ON c.grupo_id = g.id
+    """),
+    "metricas": ("metricas_produtividade", """
+        SELECT c.nome as colaborador, g.nome as grupo, mp.*
+        FROM metricas_produtividade mp
+        JOIN colaboradores c ON mp.colaborador_id = c.id
+        JOIN grupos g ON c.grupo_id = g.id
+    """),
+}
+
+FORMATOS_EXPORTACAO = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def abrir_consulta(db_path, query) -> Tuple[sqlite3.Connection, sqlite3.Cursor, List[str]]:
+    """
+    Abre uma conexão própria e executa a consulta, sem ler as linhas.
+
+    A conexão é criada com ``check_same_thread=False`` porque o Starlette
+    consome o gerador da resposta em threads do pool.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    try:
+        cursor = conn.execute(query)
+        colunas = [descricao[0] for descricao in cursor.description]
+    except Exception:
+        conn.close()
+        raise
+    return conn, cursor, colunas
+
+
+def linhas_em_lotes(cursor, tamanho_lote: int = TAMANHO_LOTE) -> Iterator[list]:
+    while True:
+        lote = cursor.fetchmany(tamanho_lote)
+        if not lote:
+            break
+        yield lote
+
+
+def gerar_csv(conn, cursor, colunas, tamanho_lote: int = TAMANHO_LOTE) -> Iterator[bytes]:
+    """Gera o CSV em pedaços, um por lote de linhas; fecha a conexão ao final"""
+    try:
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer, lineterminator='\n')
+        escritor.writerow(colunas)
+        for lote in linhas_em_lotes(cursor, tamanho_lote):
+            escritor.writerows(lote)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    finally:
+        conn.close()
+
+
+def gerar_xlsx(conn, cursor, colunas, nome_aba: str = 'Dados',
+               tamanho_lote: int = TAMANHO_LOTE) -> Iterator[bytes]:
+    """Gera o .xlsx com openpyxl em modo write-only; fecha a conexão ao final"""
+    try:
+        workbook = Workbook(write_only=True)
+        planilha = workbook.create_sheet(nome_aba[:31])
+        planilha.append(colunas)
+        for lote in linhas_em_lotes(cursor, tamanho_lote):
+            for linha in lote:
+                planilha.append(list(linha))
+    finally:
+        conn.close()
+
+    # Arquivo anônimo: fica em memória até 8 MB e nunca aparece em static/
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as arquivo:
+        workbook.save(arquivo)
+        arquivo.seek(0)
+        while True:
+            bloco = arquivo.read(TAMANHO_BLOCO)
+            if not bloco:
+                break
+            yield bloco
+
+
+def resposta_exportacao(db_path, tipo: str, formato: str) -> StreamingResponse:
+    """
+    Monta a resposta de exportação de um relatório.
+
+    Args:
+        db_path (str): Caminho do banco SQLite
+        tipo (str): ``diario``, ``geral`` ou ``metricas``
+        formato (str): ``csv`` ou ``excel``
+
+    Raises:
+        ValueError: Tipo ou formato inválido
+        sqlite3.Error: Falha ao executar a consulta (antes de iniciar a resposta)
+    """
+    if tipo not in CONSULTAS_EXPORTACAO:
+        raise ValueError("Tipo de relatório inválido")
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError("Formato inválido")
+
+    nome_arquivo, query = CONSULTAS_EXPORTACAO[tipo]
+    extensao, media_type = FORMATOS_EXPORTACAO[formato]
+    conn, cursor, colunas = abrir_consulta(db_path, query)
+
+    if formato == "csv":
+        conteudo = gerar_csv(conn, cursor, colunas)
+    else:
+        conteudo = gerar_xlsx(conn, cursor, colunas, nome_aba=nome_arquivo)
+
+    data_atual = datetime.now().strftime("%Y%m%d")
+    return StreamingResponse(
+        conteudo,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}_{data_atual}.{extensao}"'}
+    )
@@ -0,0 +1,111 @@
+"""
+Ingestão no Banco do Dashboard
+==============================
+Grava as contagens de status de cada colaborador nas tabelas ``grupos``,
+``colaboradores``, ``relatorio_geral`` e ``metricas_produtividade``.
+
+Usado pelas duas formas de alimentar o banco (``RelatorioDatabase`` de
+``static/`` e de ``relatoriotest/``): os dados em memória da análise e o
+relatório txt de uma execução anterior. Por isso as colunas derivadas têm uma
+definição só, em :func:`linha_relatorio`:
+
+- ``total``: soma das oito colunas de status da própria linha (status fora
+  dessas colunas, como QUITADO, não entram);
+- ``prod_horaria``: ``total`` dividido pelas horas de trabalho do dia;
+- ``prod_diaria``: ``prod_horaria`` vezes as horas de trabalho;
+- ``eficiencia``: percentual de APROVADO sobre ``total``.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# Colunas de relatorio_geral para cada status contado
+COLUNAS_STATUS = {
+    'VERIFICADO': 'verificado',
+    'ANÁLISE': 'analise',
+    'PENDENTE': 'pendente',
+    'PRIORIDADE': 'prioridade',
+    'PRIORIDADE TOTAL': 'prioridade_total',
+    'APROVADO': 'aprovado',
+    'APREENDIDO': 'apreendido',
+    'CANCELADO': 'cancelado'
+}
+
+HORAS_TRABALHO = 8
+
+
+def linha_relatorio(contagens: Mapping[str, int], horas_trabalho: float = HORAS_TRABALHO) -> Tuple[List[int], Tuple]:
+    """
+    Colunas de status e métricas derivadas de um colaborador.
+
+    Args:
+        contagens (dict): Quantidade por status (nomes de ``COLUNAS_STATUS``)
+        horas_trabalho (float): Horas de trabalho por dia
+
+    Returns:
+        tuple: (contagens na ordem de ``COLUNAS_STATUS`` + total,
+        (prod_diaria, prod_horaria, eficiencia))
+    """
+    valores = [int(contagens.get(status, 0) or 0) for status in COLUNAS_STATUS]
+    total = sum(valores)
+    prod_horaria = total / horas_trabalho if horas_trabalho > 0 else 0
+    prod_diaria = prod_horaria * horas_trabalho
+    eficiencia = (contagens.get('APROVADO', 0) / total * 100) if total > 0 else 0
+    return valores + [total], (prod_diaria, prod_horaria, eficiencia)
+
+
+def gravar_contagens(conn, registros: Iterable[Tuple[str, str, Mapping[str, int]]], data_relatorio,
+                     horas_trabalho: float = HORAS_TRABALHO) -> Dict[str, int]:
+    """
+    Grava as contagens de vários colaboradores em uma única transação.
+
+    Grupos e colaboradores são inseridos com ``executemany`` e os ids são
+    lidos de uma vez para dicionários, em vez de um ``SELECT`` por nome. Em
+    caso de erro nada é gravado.
+
+    Args:
+        conn: Conexão sqlite3 (não é fechada)
+        registros: Tuplas (grupo, colaborador, contagens por status)
+        data_relatorio (date): Data gravada nas linhas
+        horas_trabalho (float): Horas de trabalho por dia
+
+    Returns:
+        dict: Quantidade de ``grupos`` e ``colaboradores`` gravados
+    """
+    registros = list(registros)
+    grupos = sorted({grupo for grupo, _, _ in registros})
+    with conn:
+        cursor = conn.cursor()
+        cursor.executemany('INSERT OR IGNORE INTO grupos (nome) VALUES (?)', [(grupo,) for grupo in grupos])
+        ids_grupos = dict(cursor.execute('SELECT nome, id FROM grupos'))
+
+        cursor.executemany('INSERT OR IGNORE INTO colaboradores (nome, grupo_id) VALUES (?, ?)',
+                           [(colaborador, ids_grupos[grupo]) for grupo, colaborador, _ in registros])
+        ids_colaboradores = {
+            (nome, grupo_id): id_colaborador
+            for id_colaborador, nome, grupo_id in cursor.execute('SELECT id, nome, grupo_id FROM colaboradores')
+        }
+
+        linhas_relatorio = []
+        linhas_metricas = []
+        for grupo, colaborador, contagens in registros:
+            colaborador_id = ids_colaboradores[(colaborador, ids_grupos[grupo])]
+            colunas, metricas = linha_relatorio(contagens, horas_trabalho)
+            linhas_relatorio.append((colaborador_id, data_relatorio, *colunas))
+            linhas_metricas.append((colaborador_id, data_relatorio, *metricas))
+
+        cursor.executemany('''
+            INSERT OR REPLACE INTO relatorio_geral (
+                colaborador_id, data_relatorio,
+                verificado, analise, pendente,
+                prioridade, prioridade_total,
+                aprovado, apreendido, cancelado,
+                total
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', linhas_relatorio)
+        cursor.executemany('''
+            INSERT OR REPLACE INTO metricas_produtividade (
+                colaborador_id, data_relatorio,
+                prod_diaria, prod_horaria, eficiencia
+            ) VALUES (?, ?, ?, ?, ?)
+        ''', linhas_metricas)
+    return {'grupos': len(grupos), 'colaboradores': len(registros)}
@@ -0,0 +1,300 @@
+"""
+Serviço de Gráficos
+===================
+Renderiza os gráficos do dashboard fora do event loop do uvicorn.
+
+- Os gráficos são desenhados com a API orientada a objetos do matplotlib
+  (``Figure`` + ``FigureCanvasAgg``), sem o estado global do pyplot.
+- A renderização roda em um pool de processos próprio (ou de threads, se
+  não for possível criar processos).
+- Cada imagem é identificada por um hash do tipo de gráfico e dos dados de
+  entrada, então dados iguais nunca são renderizados duas vezes e a chave
+  serve de ETag para ``/charts/{chave}.png``.
+- Os dados de entrada de cada chave também são gravados em disco
+  (``cache/graficos/<chave>.json``). Com vários workers do uvicorn, a página
+  e a imagem podem ser servidas por processos diferentes: o worker que não
+  conhece a chave renderiza a imagem a partir desse arquivo. O diretório
+  guarda no máximo ``limite_entradas`` arquivos: ao gravar uma entrada nova,
+  as de uso mais antigo são apagadas.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.responses import Response
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+DIRETORIO_GRAFICOS = Path('cache') / 'graficos'
+
+
+def _png(figura) -> bytes:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    FigureCanvasAgg(figura)
+    buffer = BytesIO()
+    figura.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def renderizar_pizza_status(dados: Dict[str, Any]) -> bytes:
+    """Pizza da distribuição de status: ``{'labels': [...], 'valores': [...]}``"""
+    from matplotlib.figure import Figure
+    figura = Figure(figsize=(10, 6))
+    ax = figura.add_subplot()
+    if sum(dados['valores']) > 0:
+        ax.pie(dados['valores'], labels=dados['labels'], autopct='%1.1f%%', startangle=90)
+        ax.set_title('Distribuição de Status')
+    else:
+        ax.text(0.5, 0.5, 'Sem dados disponíveis', horizontalalignment='center', verticalalignment='center')
+        ax.axis('off')
+    return _png(figura)
+
+
+def renderizar_barras_eficiencia(dados: Dict[str, Any]) -> bytes:
+    """Barras dos colaboradores mais eficientes: ``{'linhas': [{colaborador, grupo, eficiencia}]}``"""
+    import pandas as pd
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    figura = Figure(figsize=(12, 8))
+    ax = figura.add_subplot()
+    sns.barplot(x='colaborador', y='eficiencia', hue='grupo', data=pd.DataFrame(dados['linhas']), ax=ax)
+    ax.set_title('Top 10 Colaboradores por Eficiência')
+    ax.tick_params(axis='x', labelrotation=45)
+    figura.tight_layout()
+    return _png(figura)
+
+
+COLUNAS_STATUS = ['verificado', 'analise', 'pendente', 'prioridade',
+                  'prioridade_total', 'aprovado', 'apreendido', 'cancelado']
+LABELS_STATUS = ['Verificado', 'Análise', 'Pendente', 'Prioridade',
+                 'Prioridade Total', 'Aprovado', 'Apreendido', 'Cancelado']
+
+
+def dados_pizza_status(totais) -> Dict[str, Any]:
+    """Entrada da pizza a partir dos totais por status (NULL/NaN contam como 0)"""
+    import pandas as pd
+    valores = pd.Series({col: totais[col] for col in COLUNAS_STATUS}, dtype=float).fillna(0)
+    return {'labels': LABELS_STATUS, 'valores': valores.tolist()}
+
+
+def dados_barras_eficiencia(df_metricas, limite: int = 10) -> Optional[Dict[str, Any]]:
+    """
+    Entrada das barras com os ``limite`` colaboradores mais eficientes.
+
+    Retorna None quando nenhuma linha tem eficiência numérica (banco vazio ou
+    sem ``metricas_produtividade``).
+    """
+    import pandas as pd
+    if 'eficiencia' not in df_metricas.columns:
+        return None
+    eficiencia = pd.to_numeric(df_metricas['eficiencia'], errors='coerce')
+    df_top = df_metricas.assign(eficiencia=eficiencia).dropna(subset=['eficiencia']).nlargest(limite, 'eficiencia')
+    if df_top.empty:
+        return None
+    return {'linhas': df_top[['colaborador', 'grupo', 'eficiencia']].to_dict('records')}
+
+
+RENDERIZADORES: Dict[str, Callable[[Dict[str, Any]], bytes]] = {
+    'pizza_status': renderizar_pizza_status,
+    'barras_eficiencia': renderizar_barras_eficiencia,
+}
+
+
+def _renderizar(tipo: str, dados: Dict[str, Any]) -> bytes:
+    return RENDERIZADORES[tipo](dados)
+
+
+def chave_grafico(tipo: str, dados: Dict[str, Any]) -> str:
+    """Hash do tipo de gráfico e dos dados de entrada"""
+    conteudo = json.dumps([tipo, dados], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:32]
+
+
+class ServicoGraficos:
+    """
+    Pool de renderização com cache (LRU) das imagens por chave.
+
+    Com ``diretorio``, os dados de entrada de cada chave são gravados em disco
+    para que outro processo (ou esta instância, depois de descartar a chave)
+    consiga renderizar a imagem sob demanda. Sem ``diretorio`` só as chaves
+    solicitadas neste processo são conhecidas. O diretório mantém as
+    ``limite_entradas`` entradas usadas mais recentemente.
+    """
+
+    def __init__(self, max_workers: int = 2, limite_cache: int = 256, usar_processos: bool = True,
+                 diretorio=None, limite_entradas: int = 1024):
+        self.max_workers = max_workers
+        self.limite_cache = limite_cache
+        self.limite_entradas = limite_entradas
+        self.usar_processos = usar_processos
+        self.diretorio = Path(diretorio) if diretorio is not None else None
+        self._executor = None
+        self._cache: 'OrderedDict[str, Future]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _obter_executor(self):
+        if self._executor is None:
+            if self.usar_processos:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError) as e:
+                    print(f"Pool de processos indisponível, usando threads: {str(e)}")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='grafico')
+        return self._executor
+
+    def _submeter(self, tipo, dados) -> Future:
+        try:
+            return self._obter_executor().submit(_renderizar, tipo, dados)
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            print(f"Pool de gráficos indisponível, recriando com threads: {str(e)}")
+            self.usar_processos = False
+            self._executor = None
+            return self._obter_executor().submit(_renderizar, tipo, dados)
+
+    def solicitar(self, tipo: str, dados: Dict[str, Any]) -> str:
+        """
+        Agenda a renderização (se ainda não estiver em cache) e retorna a chave.
+
+        Não espera a imagem ficar pronta: quem a busca em ``/charts/{chave}.png``
+        aguarda a renderização.
+        """
+        if tipo not in RENDERIZADORES:
+            raise ValueError(f"Tipo de gráfico desconhecido: {tipo}")
+
+        chave = chave_grafico(tipo, dados)
+        with self._lock:
+            if chave in self._cache:
+                self._cache.move_to_end(chave)
+                return chave
+        self._gravar_entrada(chave, tipo, dados)
+        self._agendar(chave, tipo, dados)
+        return chave
+
+    def _agendar(self, chave: str, tipo: str, dados: Dict[str, Any]) -> Future:
+        with self._lock:
+            if chave in self._cache:
+                return self._cache[chave]
+            futuro = self._submeter(tipo, dados)
+            self._cache[chave] = futuro
+            self._descartar_excedentes()
+        futuro.add_done_callback(lambda f: self._descartar_falha(chave, f))
+        return futuro
+
+    def _arquivo_entrada(self, chave: str) -> Optional[Path]:
+        # A chave vem da URL: só hashes hexadecimais viram nomes de arquivo
+        if self.diretorio is None or not chave.isalnum():
+            return None
+        return self.diretorio / f'{chave}.json'
+
+    def _gravar_entrada(self, chave: str, tipo: str, dados: Dict[str, Any]):
+        arquivo = self._arquivo_entrada(chave)
+        if arquivo is None:
+            return
+        try:
+            if arquivo.exists():
+                # Entrada em uso: a data de modificação marca o último uso
+                os.utime(arquivo)
+                return
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            temporario = arquivo.with_name(f'{arquivo.name}.{os.getpid()}.tmp')
+            temporario.write_text(json.dumps({'tipo': tipo, 'dados': dados}, default=str, ensure_ascii=False),
+                                  encoding='utf-8')
+            os.replace(temporario, arquivo)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar a entrada do gráfico {chave}: {str(e)}")
+            return
+        self._descartar_entradas_antigas()
+
+    def _descartar_entradas_antigas(self):
+        # Apaga as entradas de uso mais antigo além de limite_entradas. Outro
+        # worker pode apagar o mesmo arquivo ao mesmo tempo, então erros de
+        # arquivo inexistente são ignorados.
+        entradas = []
+        for arquivo in self.diretorio.glob('*.json'):
+            try:
+                entradas.append((arquivo.stat().st_mtime_ns, arquivo))
+            except OSError:
+                pass
+        excedentes = len(entradas) - self.limite_entradas
+        if excedentes <= 0:
+            return
+        for _, arquivo in sorted(entradas)[:excedentes]:
+            try:
+                arquivo.unlink()
+            except OSError:
+                pass
+
+    def _ler_entrada(self, chave: str) -> Optional[Dict[str, Any]]:
+        arquivo = self._arquivo_entrada(chave)
+        if arquivo is None:
+            return None
+        try:
+            return json.loads(arquivo.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def _descartar_excedentes(self):
+        excedentes = len(self._cache) - self.limite_cache
+        for chave in [chave for chave, futuro in self._cache.items() if futuro.done()][:max(excedentes, 0)]:
+            del self._cache[chave]
+
+    def _descartar_falha(self, chave: str, futuro: Future):
+        # Uma renderização que falhou não fica em cache; a próxima solicitação tenta de novo
+        if futuro.exception() is not None:
+            with self._lock:
+                if self._cache.get(chave) is futuro:
+                    del self._cache[chave]
+
+    async def obter_png(self, chave: str) -> Optional[bytes]:
+        """Imagem da chave, aguardando a renderização sem bloquear o event loop"""
+        with self._lock:
+            futuro = self._cache.get(chave)
+        if futuro is None:
+            # Chave solicitada por outro worker (ou já descartada do LRU)
+            entrada = self._ler_entrada(chave)
+            if entrada is None or entrada.get('tipo') not in RENDERIZADORES:
+                return None
+            futuro = self._agendar(chave, entrada['tipo'], entrada['dados'])
+        return await asyncio.wrap_future(futuro)
+
+    def encerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+servico_graficos = ServicoGraficos(diretorio=DIRETORIO_GRAFICOS)
+
+
+async def resposta_grafico(chave: str, if_none_match: Optional[str] = None,
+                           servico: ServicoGraficos = None) -> Response:
+    """
+    Resposta de ``/charts/{chave}.png``.
+
+    Como a chave é o hash dos dados, a imagem de uma chave nunca muda: um
+    ``If-None-Match`` com a mesma ETag recebe 304 sem consultar o cache.
+    """
+    servico = servico or servico_graficos
+    etag = f'"{chave}"'
+    cabecalhos = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if if_none_match and etag in [valor.strip() for valor in if_none_match.split(',')]:
+        return Response(status_code=304, headers=cabecalhos)
+
+    try:
+        png = await servico.obter_png(chave)
+    except Exception as e:
+        return Response(content=f"Erro ao gerar gráfico: {str(e)}", status_code=500, media_type="text/plain")
+    if png is None:
+        return Response(content="Gráfico não encontrado", status_code=404, media_type="text/plain")
+    return Response(content=png, media_type="image/png", headers=cabecalhos)
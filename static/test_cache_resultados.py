@@ -0,0 +1,101 @@
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import cache_resultados
+from cache_resultados import CacheResultados, assinatura_banco
+
+
+class TestCacheResultados(unittest.TestCase):
+    def setUp(self):
+        self.cache = CacheResultados(ttl=60)
+        self.calculos = 0
+
+    def calcular(self):
+        self.calculos += 1
+        return {'totais': {'verificado': self.calculos}}
+
+    def test_reaproveita_ate_invalidar(self):
+        primeiro = self.cache.obter('dashboard', self.calcular)
+        self.assertIs(self.cache.obter('dashboard', self.calcular), primeiro)
+        self.assertEqual(self.calculos, 1)
+
+        self.cache.invalidar()
+        self.assertEqual(self.cache.obter('dashboard', self.calcular)['totais']['verificado'], 2)
+
+    def test_ttl_expirado_recalcula(self):
+        self.cache.ttl = 0.01
+        self.cache.obter('dashboard', self.calcular)
+        time.sleep(0.02)
+        self.cache.obter('dashboard', self.calcular)
+        self.assertEqual(self.calculos, 2)
+
+    def test_versao_diferente_recalcula(self):
+        self.cache.obter('dashboard', self.calcular, versao=(10, 1))
+        self.cache.obter('dashboard', self.calcular, versao=(10, 1))
+        self.cache.obter('dashboard', self.calcular, versao=(20, 2))
+        self.assertEqual(self.calculos, 2)
+
+    def test_requisicoes_concorrentes_calculam_uma_vez(self):
+        liberar = threading.Event()
+
+        def calcular_lento():
+            liberar.wait(5)
+            return self.calcular()
+
+        threads = [threading.Thread(target=self.cache.obter, args=('dashboard', calcular_lento)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        liberar.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(self.calculos, 1)
+
+    def test_invalidacao_durante_calculo_descarta_resultado(self):
+        def calcular_e_invalidar():
+            valor = self.calcular()
+            self.cache.invalidar()
+            return valor
+
+        self.cache.obter('dashboard', calcular_e_invalidar)
+        self.cache.obter('dashboard', self.calcular)
+        self.assertEqual(self.calculos, 2)
+
+
+class TestInvalidacaoNaImportacao(unittest.TestCase):
+    def test_importar_relatorio_invalida_cache(self):
+        # Carregado pelo caminho: a raiz do projeto tem outro analisar_dados_v5.py
+        spec = importlib.util.spec_from_file_location(
+            'static_analisar_dados_v5', os.path.join(current_dir, 'analisar_dados_v5.py'))
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        RelatorioDatabase = modulo.RelatorioDatabase
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'relatorio_dashboard.db')
+            relatorio = os.path.join(tmp, 'relatorio_completo.txt')
+            with open(relatorio, 'w', encoding='utf-8') as f:
+                f.write("Data de Geração: 01/03/2025\nGRUPO: JULIO\nAMANDA\n  VERIFICADO: 3\n  APROVADO: 2\n")
+
+            db = RelatorioDatabase(db_path)
+            versao = assinatura_banco(db_path)
+            cache_resultados.cache_dashboard.obter('dashboard', lambda: 'antigo', versao=versao)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(db.importar_relatorio_txt(relatorio))
+
+            # Mesmo que a assinatura do arquivo não mudasse, a importação descartou a entrada
+            self.assertEqual(cache_resultados.cache_dashboard.obter('dashboard', lambda: 'novo', versao=versao), 'novo')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
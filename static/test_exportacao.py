@@ -0,0 +1,90 @@
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+from openpyxl import load_workbook
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from exportacao import CONSULTAS_EXPORTACAO, abrir_consulta, gerar_csv, gerar_xlsx, resposta_exportacao
+
+
+def criar_banco(caminho, colaboradores=2500):
+    conn = sqlite3.connect(caminho)
+    conn.executescript('''
+        CREATE TABLE grupos (id INTEGER PRIMARY KEY, nome TEXT UNIQUE NOT NULL);
+        CREATE TABLE colaboradores (id INTEGER PRIMARY KEY, nome TEXT NOT NULL, grupo_id INTEGER NOT NULL);
+        CREATE TABLE metricas_produtividade (
+            id INTEGER PRIMARY KEY, colaborador_id INTEGER NOT NULL, data_relatorio DATE NOT NULL,
+            prod_diaria REAL DEFAULT 0, prod_horaria REAL DEFAULT 0, eficiencia REAL DEFAULT 0
+        );
+    ''')
+    conn.executemany('INSERT INTO grupos (id, nome) VALUES (?, ?)', [(1, 'JULIO'), (2, 'LEANDRO')])
+    conn.executemany('INSERT INTO colaboradores (id, nome, grupo_id) VALUES (?, ?, ?)',
+                     [(i, f'COLABORADOR, "{i}"', 1 + i % 2) for i in range(colaboradores)])
+    conn.executemany(
+        'INSERT INTO metricas_produtividade (colaborador_id, data_relatorio, prod_diaria, prod_horaria, eficiencia) '
+        'VALUES (?, ?, ?, ?, ?)',
+        [(i, '2025-03-01', i * 1.5, i / 8, None if i % 7 == 0 else 50.25) for i in range(colaboradores)])
+    conn.commit()
+    conn.close()
+
+
+class TestExportacao(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'relatorio_dashboard.db')
+        criar_banco(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        self.esperado = pd.read_sql_query(CONSULTAS_EXPORTACAO['metricas'][1], conn)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csv_em_pedacos_com_nomes_de_colunas(self):
+        conn, cursor, colunas = abrir_consulta(self.db_path, CONSULTAS_EXPORTACAO['metricas'][1])
+        pedacos = list(gerar_csv(conn, cursor, colunas, tamanho_lote=1000))
+
+        self.assertEqual(len(pedacos), 3)
+        obtido = pd.read_csv(io.BytesIO(b''.join(pedacos)))
+        pd.testing.assert_frame_equal(obtido, self.esperado)
+        # A conexão é fechada quando o gerador termina
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+
+    def test_xlsx_write_only(self):
+        conn, cursor, colunas = abrir_consulta(self.db_path, CONSULTAS_EXPORTACAO['metricas'][1])
+        conteudo = b''.join(gerar_xlsx(conn, cursor, colunas, nome_aba='metricas_produtividade'))
+
+        workbook = load_workbook(io.BytesIO(conteudo), read_only=True)
+        self.assertEqual(workbook.sheetnames, ['metricas_produtividade'])
+        obtido = pd.read_excel(io.BytesIO(conteudo))
+        pd.testing.assert_frame_equal(obtido, self.esperado)
+
+    def test_resposta_nao_grava_arquivos(self):
+        antes = set(os.listdir(current_dir))
+        resposta = resposta_exportacao(self.db_path, 'metricas', 'csv')
+        self.assertEqual(resposta.media_type, 'text/csv; charset=utf-8')
+        self.assertIn('metricas_produtividade_', resposta.headers['content-disposition'])
+        self.assertEqual(set(os.listdir(current_dir)), antes)
+
+    def test_tipo_ou_formato_invalido(self):
+        with self.assertRaises(ValueError):
+            resposta_exportacao(self.db_path, 'semanal', 'csv')
+        with self.assertRaises(ValueError):
+            resposta_exportacao(self.db_path, 'geral', 'pdf')
+
+    def test_erro_na_consulta_antes_de_iniciar_resposta(self):
+        # relatorio_diario não existe neste banco
+        with self.assertRaises(sqlite3.OperationalError):
+            resposta_exportacao(self.db_path, 'diario', 'csv')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,126 @@
+import contextlib
+import datetime
+import importlib.util
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from ingestao_banco import linha_relatorio
+
+
+def carregar_modulo(nome, caminho):
+    # Carregado pelo caminho: a raiz do projeto tem outro analisar_dados_v5.py
+    spec = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+analisar_dados_v5 = carregar_modulo('static_analisar_dados_v5', os.path.join(current_dir, 'analisar_dados_v5.py'))
+
+
+def metricas(status_counts):
+    total = sum(status_counts.values())
+    return {'total_registros': total, 'status_counts': status_counts, 'produtividade_hora': total / 8}
+
+
+class TestImportarDadosGrupos(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'relatorio_dashboard.db')
+        self.db = analisar_dados_v5.RelatorioDatabase(self.db_path)
+        self.dados_grupos = {
+            'julio': {'metricas': {
+                'AMANDA': metricas({'VERIFICADO': 3, 'APROVADO': 1}),
+                'IGOR': metricas({'PENDENTE': 2, 'QUITADO': 2}),
+            }},
+            'leandro': {'metricas': {'AMANDA': metricas({'CANCELADO': 5})}},
+        }
+        self.data = datetime.date(2025, 3, 1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def importar(self, dados_grupos):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.db.importar_dados_grupos(dados_grupos, self.data)
+
+    def consultar(self, sql):
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
+            return conn.execute(sql).fetchall()
+
+    def test_grava_todas_as_tabelas(self):
+        self.assertTrue(self.importar(self.dados_grupos))
+
+        self.assertEqual(self.consultar('SELECT nome FROM grupos ORDER BY nome'), [('JULIO',), ('LEANDRO',)])
+        relatorio = self.consultar('''
+            SELECT g.nome, c.nome, r.verificado, r.pendente, r.aprovado, r.cancelado, r.total, r.data_relatorio
+            FROM relatorio_geral r
+            JOIN colaboradores c ON c.id = r.colaborador_id
+            JOIN grupos g ON g.id = c.grupo_id
+            ORDER BY g.nome, c.nome
+        ''')
+        self.assertEqual(relatorio, [
+            ('JULIO', 'AMANDA', 3, 0, 1, 0, 4, '2025-03-01'),
+            # QUITADO não tem coluna: total é a soma das colunas da própria linha
+            ('JULIO', 'IGOR', 0, 2, 0, 0, 2, '2025-03-01'),
+            ('LEANDRO', 'AMANDA', 0, 0, 0, 5, 5, '2025-03-01'),
+        ])
+        produtividade = self.consultar('''
+            SELECT c.nome, m.prod_diaria, m.prod_horaria, m.eficiencia
+            FROM metricas_produtividade m JOIN colaboradores c ON c.id = m.colaborador_id
+            WHERE c.grupo_id = (SELECT id FROM grupos WHERE nome = 'JULIO')
+            ORDER BY c.nome
+        ''')
+        self.assertEqual(produtividade, [('AMANDA', 4.0, 0.5, 25.0), ('IGOR', 2.0, 0.25, 0.0)])
+
+    def test_reimportacao_atualiza_sem_duplicar(self):
+        self.importar(self.dados_grupos)
+        self.dados_grupos['julio']['metricas']['AMANDA'] = metricas({'APROVADO': 2})
+        self.assertTrue(self.importar(self.dados_grupos))
+
+        self.assertEqual(self.consultar('SELECT COUNT(*) FROM colaboradores'), [(3,)])
+        self.assertEqual(self.consultar('SELECT COUNT(*) FROM relatorio_geral'), [(3,)])
+        self.assertIn((2, 2), self.consultar('SELECT aprovado, total FROM relatorio_geral'))
+
+    def test_erro_desfaz_a_transacao(self):
+        self.dados_grupos['leandro']['metricas']['AMANDA'] = {'status_counts': {'APROVADO': 'muitos'}}
+        self.assertFalse(self.importar(self.dados_grupos))
+        for tabela in ('grupos', 'colaboradores', 'relatorio_geral', 'metricas_produtividade'):
+            self.assertEqual(self.consultar(f'SELECT COUNT(*) FROM {tabela}'), [(0,)])
+
+    def test_mesma_definicao_do_relatorio_txt(self):
+        colunas, metricas = linha_relatorio({'PENDENTE': 2, 'QUITADO': 2, 'APROVADO': 2})
+        self.assertEqual(colunas, [0, 0, 2, 0, 0, 2, 0, 0, 4])
+        self.assertEqual(metricas, (4.0, 0.5, 50.0))
+
+    def test_copia_de_relatoriotest_usa_a_mesma_gravacao(self):
+        relatoriotest = carregar_modulo('relatoriotest_analisar_dados_v5',
+                                        os.path.join(os.path.dirname(current_dir), 'relatoriotest', 'analisar_dados_v5.py'))
+        outro_db = os.path.join(self.tmp.name, 'relatoriotest.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(relatoriotest.RelatorioDatabase(outro_db).importar_dados_grupos(self.dados_grupos, self.data))
+        self.importar(self.dados_grupos)
+
+        consulta = 'SELECT * FROM relatorio_geral ORDER BY id'
+        with contextlib.closing(sqlite3.connect(outro_db)) as conn:
+            self.assertEqual(conn.execute(consulta).fetchall(), self.consultar(consulta))
+
+    def test_exportar_usa_dados_da_analise(self):
+        analisador = analisar_dados_v5.AnalisadorInteligente()
+        analisador.dados_grupos = self.dados_grupos
+        with mock.patch.object(analisar_dados_v5, 'RelatorioDatabase', return_value=self.db):
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(analisador.exportar_para_sqlite())
+        self.assertEqual(self.consultar('SELECT COUNT(*) FROM relatorio_geral'), [(3,)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
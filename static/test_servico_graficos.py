@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+import pandas as pd
+
+import servico_graficos
+from servico_graficos import (ServicoGraficos, chave_grafico, dados_barras_eficiencia, dados_pizza_status,
+                              resposta_grafico)
+
+PNG = b'\x89PNG\r\n\x1a\n'
+
+DADOS_PIZZA = {'labels': ['Verificado', 'Pendente', 'Aprovado'], 'valores': [10, 5, 3]}
+DADOS_BARRAS = {'linhas': [
+    {'colaborador': 'AMANDA', 'grupo': 'JULIO', 'eficiencia': 80.5},
+    {'colaborador': 'VITORIA', 'grupo': 'LEANDRO', 'eficiencia': 72.0},
+]}
+
+
+class TestServicoGraficos(unittest.TestCase):
+    def setUp(self):
+        self.servico = ServicoGraficos(max_workers=2, usar_processos=False)
+
+    def tearDown(self):
+        self.servico.encerrar()
+
+    def test_renderiza_pizza_e_barras_em_png(self):
+        for tipo, dados in [('pizza_status', DADOS_PIZZA), ('barras_eficiencia', DADOS_BARRAS)]:
+            chave = self.servico.solicitar(tipo, dados)
+            png = asyncio.run(self.servico.obter_png(chave))
+            self.assertTrue(png.startswith(PNG))
+
+    def test_mesmos_dados_renderizam_uma_vez(self):
+        with mock.patch.object(servico_graficos, '_renderizar', wraps=servico_graficos._renderizar) as renderizar:
+            chave = self.servico.solicitar('pizza_status', DADOS_PIZZA)
+            self.assertEqual(self.servico.solicitar('pizza_status', dict(DADOS_PIZZA)), chave)
+            asyncio.run(self.servico.obter_png(chave))
+        self.assertEqual(renderizar.call_count, 1)
+        self.assertNotEqual(chave_grafico('pizza_status', {**DADOS_PIZZA, 'valores': [10, 5, 4]}), chave)
+
+    def test_pool_de_processos(self):
+        servico = ServicoGraficos(max_workers=1)
+        try:
+            chave = servico.solicitar('pizza_status', DADOS_PIZZA)
+            self.assertTrue(asyncio.run(servico.obter_png(chave)).startswith(PNG))
+        finally:
+            servico.encerrar()
+
+    def test_falha_nao_fica_em_cache(self):
+        chave = self.servico.solicitar('pizza_status', {'labels': ['A'], 'valores': 'invalido'})
+        with self.assertRaises(Exception):
+            asyncio.run(self.servico.obter_png(chave))
+        self.assertIsNone(asyncio.run(self.servico.obter_png(chave)))
+
+    def test_tipo_desconhecido(self):
+        with self.assertRaises(ValueError):
+            self.servico.solicitar('linhas', {})
+
+
+class TestDadosGraficos(unittest.TestCase):
+    def test_pizza_com_totais_nulos(self):
+        totais = {col: None for col in servico_graficos.COLUNAS_STATUS}
+        totais.update(verificado=float('nan'), aprovado=3)
+        dados = dados_pizza_status(totais)
+        self.assertEqual(dados['valores'], [0, 0, 0, 0, 0, 3, 0, 0])
+
+        servico = ServicoGraficos(usar_processos=False)
+        try:
+            chave = servico.solicitar('pizza_status', dados_pizza_status({col: 0 for col in servico_graficos.COLUNAS_STATUS}))
+            self.assertTrue(asyncio.run(servico.obter_png(chave)).startswith(PNG))
+        finally:
+            servico.encerrar()
+
+    def test_barras_sem_eficiencia(self):
+        # LEFT JOIN sem metricas_produtividade: coluna toda NULL (dtype object)
+        vazio = pd.DataFrame({'colaborador': ['AMANDA'], 'grupo': ['JULIO'], 'eficiencia': [None]})
+        self.assertIsNone(dados_barras_eficiencia(vazio))
+        self.assertIsNone(dados_barras_eficiencia(pd.DataFrame()))
+
+    def test_barras_top_por_eficiencia(self):
+        df = pd.DataFrame({'colaborador': ['A', 'B', 'C'], 'grupo': ['JULIO'] * 3,
+                           'eficiencia': ['50.5', None, 80]})
+        dados = dados_barras_eficiencia(df, limite=2)
+        self.assertEqual([linha['colaborador'] for linha in dados['linhas']], ['C', 'A'])
+
+
+class TestVariosWorkers(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Dois workers do uvicorn: processos diferentes, mesmo diretório de trabalho
+        self.pagina = ServicoGraficos(usar_processos=False, diretorio=self.tmp.name)
+        self.imagens = ServicoGraficos(usar_processos=False, diretorio=self.tmp.name)
+
+    def tearDown(self):
+        self.pagina.encerrar()
+        self.imagens.encerrar()
+        self.tmp.cleanup()
+
+    def test_outro_worker_renderiza_a_partir_da_entrada(self):
+        chave = self.pagina.solicitar('barras_eficiencia', DADOS_BARRAS)
+        resposta = asyncio.run(resposta_grafico(chave, servico=self.imagens))
+        self.assertEqual(resposta.status_code, 200)
+        self.assertTrue(resposta.body.startswith(PNG))
+
+    def test_diretorio_limitado_as_entradas_mais_recentes(self):
+        servico = ServicoGraficos(usar_processos=False, diretorio=self.tmp.name, limite_entradas=3)
+        self.addCleanup(servico.encerrar)
+        chaves = []
+        for i, dados in enumerate([{'labels': ['A'], 'valores': [valor]} for valor in range(5)]):
+            chaves.append(servico.solicitar('pizza_status', dados))
+            # Datas de modificação distintas mesmo em sistemas de arquivos com pouca resolução
+            os.utime(servico._arquivo_entrada(chaves[-1]), ns=(i * 10**9, i * 10**9))
+        self.assertEqual(sorted(p.stem for p in Path(self.tmp.name).glob('*.json')), sorted(chaves[2:]))
+
+    def test_chave_sem_entrada_continua_404(self):
+        for chave in ['0' * 32, '..%2Fapp']:
+            resposta = asyncio.run(resposta_grafico(chave, servico=self.imagens))
+            self.assertEqual(resposta.status_code, 404)
+
+
+class TestRespostaGrafico(unittest.TestCase):
+    def setUp(self):
+        self.servico = ServicoGraficos(usar_processos=False)
+        self.chave = self.servico.solicitar('pizza_status', DADOS_PIZZA)
+
+    def tearDown(self):
+        self.servico.encerrar()
+
+    def test_png_com_etag(self):
+        resposta = asyncio.run(resposta_grafico(self.chave, servico=self.servico))
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.media_type, 'image/png')
+        self.assertEqual(resposta.headers['etag'], f'"{self.chave}"')
+        self.assertTrue(resposta.body.startswith(PNG))
+
+    def test_if_none_match_retorna_304(self):
+        resposta = asyncio.run(resposta_grafico(self.chave, f'"outra", "{self.chave}"', servico=self.servico))
+        self.assertEqual(resposta.status_code, 304)
+        self.assertEqual(resposta.body, b'')
+
+    def test_chave_desconhecida_retorna_404(self):
+        resposta = asyncio.run(resposta_grafico('0' * 32, servico=self.servico))
+        self.assertEqual(resposta.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
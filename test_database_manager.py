@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from database_manager import DatabaseManager, MIGRATIONS, SQL_GROUP_COMPARISON
+
+
+class TestDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'analise_historica.db')
+        self.db = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def registros(self, quantidade):
+        return [{
+            'colaborador': f'COLABORADOR {i}',
+            'grupo': 'Julio' if i % 2 else 'Leandro',
+            'data': datetime(2025, 3, 1),
+            'total_registros': i,
+            'taxa_eficiencia': i / 100,
+            'tendencia': 'estável'
+        } for i in range(quantidade)]
+
+    def test_wal_e_conexao_reutilizada(self):
+        conn = self.db._get_connection()
+        self.assertIs(self.db._get_connection(), conn)
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_conexao_por_thread(self):
+        conexoes = []
+        thread = threading.Thread(target=lambda: conexoes.append(self.db._get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(conexoes[0], self.db._get_connection())
+
+    def test_lote_em_uma_unica_transacao(self):
+        conn = self.db._get_connection()
+        comandos = []
+        conn.set_trace_callback(lambda sql: comandos.append(sql.strip().upper()))
+
+        self.assertTrue(self.db.store_metrics_batch(self.registros(50)))
+        conn.set_trace_callback(None)
+
+        self.assertEqual(comandos.count('COMMIT'), 1)
+        self.assertEqual(comandos.count('BEGIN'), 1)
+        self.assertEqual(len(self.db.get_metrics_history(limit=100)), 50)
+
+    def test_lote_invalido_nao_grava_nada(self):
+        registros = self.registros(3)
+        registros[2]['taxa_eficiencia'] = None
+        self.assertFalse(self.db.store_metrics_batch(registros))
+        self.assertEqual(self.db.get_metrics_history(limit=100), [])
+
+    def test_store_metrics_e_consultas(self):
+        self.assertTrue(self.db.store_metrics('AMANDA', 'Julio', datetime(2025, 3, 1), 10, 0.2, 'crescente'))
+        self.db.store_metrics_batch(self.registros(4))
+
+        historico = self.db.get_metrics_history(colaborador='AMANDA')
+        self.assertEqual(historico[0]['total_registros'], 10)
+
+        comparacao = self.db.get_group_comparison()
+        self.assertEqual(comparacao['total_records'], {'Julio': 14, 'Leandro': 2})
+
+        self.assertTrue(self.db.save_configuration('limites', {'eficiencia': 0.15}))
+        self.assertEqual(self.db.get_configuration('limites'), {'eficiencia': 0.15})
+
+    def test_close_reabre_sob_demanda(self):
+        self.db.store_metrics_batch(self.registros(2))
+        self.db.close()
+        self.assertEqual(len(self.db.get_metrics_history()), 2)
+
+
+
+class TestResumoDiario(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(os.path.join(self.tmp.name, 'analise_historica.db'))
+        self.hoje = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        self.ontem = self.hoje - timedelta(days=1)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def registro(self, colaborador, grupo, data, eficiencia, status, tempo=None):
+        return {
+            'colaborador': colaborador,
+            'grupo': grupo,
+            'data': data,
+            'total_registros': sum(status.values()),
+            'taxa_eficiencia': eficiencia,
+            'tendencia': 'estável',
+            'distribuicao_status': status,
+            'tempo_medio_resolucao': tempo
+        }
+
+    def popular(self):
+        self.db.store_metrics_batch([
+            self.registro('AMANDA', 'Julio', self.ontem, 0.2, {'PENDENTE': 6, 'QUITADO': 4}, tempo=3.0),
+            self.registro('NUNO', 'Leandro', self.ontem, 0.4, {'PENDENTE': 2}),
+        ])
+        self.db.store_metrics_batch([
+            self.registro('AMANDA', 'Julio', self.hoje, 0.3, {'PENDENTE': 4, 'QUITADO': 6}, tempo=2.0),
+        ])
+        self.db.store_metrics_batch([
+            self.registro('AMANDA', 'Julio', self.hoje + timedelta(hours=2), 0.5, {'PENDENTE': 2, 'QUITADO': 8}),
+        ])
+
+    def test_media_dos_snapshots_do_dia(self):
+        self.popular()
+        linhas = self.db.get_daily_rollup(days=7, colaborador='AMANDA')
+
+        self.assertEqual([linha['dia'] for linha in linhas], [self.ontem.date().isoformat(), self.hoje.date().isoformat()])
+        hoje = linhas[1]
+        self.assertEqual(hoje['amostras'], 2)
+        self.assertAlmostEqual(hoje['taxa_eficiencia'], 0.4)
+        self.assertAlmostEqual(hoje['casos_pendentes'], 3.0)
+        self.assertAlmostEqual(hoje['tempo_medio_resolucao'], 2.0)
+
+        status = self.db.get_daily_status_counts(days=7, colaborador='AMANDA')
+        quitado_hoje = [s for s in status if s['dia'] == hoje['dia'] and s['status'] == 'QUITADO']
+        self.assertAlmostEqual(quitado_hoje[0]['quantidade'], 7.0)
+
+    def test_filtro_de_grupo_sem_diferenciar_maiusculas(self):
+        self.popular()
+        self.assertEqual({linha['colaborador'] for linha in self.db.get_daily_rollup(days=7, grupo='LEANDRO')}, {'NUNO'})
+
+    def test_heatmap_e_tendencia(self):
+        self.popular()
+        heatmap = self.db.get_daily_heatmap('casos_pendentes', days=7)
+        self.assertEqual(heatmap['colaboradores'], ['AMANDA', 'NUNO'])
+        self.assertEqual(heatmap['values'], [[6.0, 3.0], [2.0, None]])
+
+        tendencia = self.db.get_daily_trend('taxa_eficiencia', days=7, by_group=True)
+        self.assertEqual(list(tendencia['series'].keys()), ['Julio', 'Leandro'])
+        self.assertAlmostEqual(tendencia['series']['Julio'][1], 0.4)
+
+        with self.assertRaises(ValueError):
+            self.db.get_daily_trend('score', days=7)
+
+    def test_periodo_ignora_dias_antigos(self):
+        antigo = self.hoje - timedelta(days=60)
+        self.db.store_metrics_batch([self.registro('AMANDA', 'Julio', antigo, 0.1, {'PENDENTE': 1})])
+        self.assertEqual(self.db.get_daily_rollup(days=30), [])
+        self.assertEqual(len(self.db.get_daily_rollup(days=90)), 1)
+
+
+class TestMigracoes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'analise_historica.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def indices(self, db):
+        linhas = db._get_connection().execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'metricas'")
+        return {linha[0] for linha in linhas}
+
+    def test_banco_novo_na_ultima_versao(self):
+        with DatabaseManager(self.db_path) as db:
+            self.assertEqual(db.schema_version(), MIGRATIONS[-1][0])
+            self.assertIn('idx_metricas_colaborador_data', self.indices(db))
+            self.assertIn('idx_metricas_grupo_data', self.indices(db))
+
+    def test_banco_antigo_sem_versao_e_atualizado(self):
+        # Banco criado pela versão anterior do DatabaseManager (user_version 0)
+        conn = sqlite3.connect(self.db_path)
+        for comando in MIGRATIONS[0][2]:
+            conn.execute(comando)
+        conn.execute("INSERT INTO metricas (colaborador, grupo, data, total_registros, taxa_eficiencia, tendencia) "
+                     "VALUES ('AMANDA', 'Julio', '2025-03-01T00:00:00', 5, 0.5, 'estável')")
+        conn.commit()
+        conn.close()
+
+        with DatabaseManager(self.db_path) as db:
+            self.assertEqual(db.schema_version(), MIGRATIONS[-1][0])
+            self.assertEqual(len(db.get_metrics_history()), 1)
+            self.assertIn('idx_metricas_grupo_data', self.indices(db))
+            # Histórico existente é carregado no resumo diário
+            resumo = db._get_connection().execute('SELECT dia, amostras, soma_registros FROM metricas_diarias').fetchall()
+            self.assertEqual([tuple(linha) for linha in resumo], [('2025-03-01', 1, 5)])
+
+    def test_migracao_ate_versao_alvo(self):
+        with DatabaseManager(self.db_path) as db:
+            conn = db._get_connection()
+            for indice in self.indices(db):
+                if indice.startswith('idx_'):
+                    conn.execute(f'DROP INDEX {indice}')
+            conn.execute('PRAGMA user_version = 1')
+
+            self.assertEqual(db.migrate(target_version=1), 1)
+            self.assertEqual(db.migrate(), MIGRATIONS[-1][0])
+            self.assertIn('idx_metricas_data', self.indices(db))
+
+    def test_comparacao_de_grupos_usa_indice_de_cobertura(self):
+        with DatabaseManager(self.db_path) as db:
+            plano = db._get_connection().execute('EXPLAIN QUERY PLAN ' + SQL_GROUP_COMPARISON).fetchall()
+            self.assertIn('COVERING INDEX idx_metricas_grupo_data', plano[0][3])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -12,12 +12,15 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
+import sys
 from collections import defaultdict, Counter
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+
 # Importações locais
 from debug_excel import AnalisadorExcel
+from graficos_situacao import dados_grafico_situacao, renderizar_graficos_situacao
+from transicoes import analisar_transicoes, transicoes_mais_comuns
 from analise_360 import Analise360
 from data_analysis_pipeline import DataAnalysisPipeline
 
@@ -58,10 +61,14 @@ def analisar_colaborador(df, nome_aba):
     Args:
         df (pandas.DataFrame): DataFrame com os dados do colaborador
         nome_aba (str): Nome do colaborador
+        
+    Returns:
+        dict: Dados do gráfico de situações, para ``renderizar_graficos``
+        (None se não houver)
     """
     if df is None or len(df) == 0:
         print(f"Não há dados para o colaborador {nome_aba}")
-        return
+        return None
     
     print(f"\n{'='*80}")
     print(f"ANÁLISE DETALHADA: {nome_aba}")
@@ -105,73 +112,39 @@ def analisar_colaborador(df, nome_aba):
                     print(f"  Período: {datas_validas.min().date()} a {datas_validas.max().date()}")
                     print(f"  Registros com data: {len(datas_validas)} ({len(datas_validas)/total_registros*100:.1f}%)")
                     
-                    # Análise de transições se houver SITUACAO
+                    # Transições e tempo em cada situação sobre uma única ordenação
                     if 'SITUACAO' in df.columns:
-                        df_ordenado = df.sort_values(by=col_data)
-                        
-                        # Verificar transições de estado
-                        transicoes = []
-                        situacao_anterior = None
-                        
-                        for idx, row in df_ordenado.iterrows():
-                            situacao_atual = row['SITUACAO']
-                            if pd.notna(situacao_anterior) and pd.notna(situacao_atual) and situacao_anterior != situacao_atual:
-                                transicoes.append((situacao_anterior, situacao_atual))
-                            situacao_anterior = situacao_atual
+                        analise = analisar_transicoes(df, col_data)
                         
-                        # Contar transições
-                        contagem_transicoes = Counter(transicoes)
-                        
-                        if contagem_transicoes:
+                        mais_comuns = transicoes_mais_comuns(analise.estados, analise.transicoes[0], limite=5)
+                        if mais_comuns:
                             print("\n  Transições de Estado mais comuns:")
-                            for (de, para), contagem in sorted(contagem_transicoes.items(), key=lambda x: x[1], reverse=True)[:5]:
+                            for de, para, contagem in mais_comuns:
                                 print(f"    {de} -> {para}: {contagem} ocorrências")
                         
-                        # Tempo médio em cada situação
-                        df_ordenado['data_anterior'] = df_ordenado[col_data].shift(1)
-                        df_ordenado['tempo_no_estado'] = (df_ordenado[col_data] - df_ordenado['data_anterior']).dt.days
-                        
-                        # Calcular tempo médio por situação
-                        tempos_por_situacao = df_ordenado.groupby('SITUACAO')['tempo_no_estado'].mean()
-                        
-                        if not tempos_por_situacao.empty:
+                        tempos_por_situacao = analise.tempos_medios()
+                        if tempos_por_situacao:
                             print("\n  Tempo Médio em cada Situação (dias):")
                             for situacao, tempo in sorted(tempos_por_situacao.items(), key=lambda x: x[1], reverse=True):
                                 print(f"    {situacao}: {tempo:.1f} dias")
             except Exception as e:
                 print(f"  Erro ao analisar coluna {col_data}: {str(e)}")
     
-    # Gerar visualização
-    try:
-        if 'SITUACAO' in df.columns:
-            plt.figure(figsize=(10, 6))
-            situacao_counts = df['SITUACAO'].value_counts()
-            sns.barplot(x=situacao_counts.index, y=situacao_counts.values)
-            plt.title(f'Distribuição de Situações - {nome_aba}')
-            plt.xlabel('Situação')
-            plt.ylabel('Quantidade')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            # Salvar gráfico
-            diretorio_graficos = 'graficos_situacao'
-            if not os.path.exists(diretorio_graficos):
-                try:
-                    os.makedirs(diretorio_graficos)
-                except FileExistsError:
-                    # Diretório já existe, podemos continuar
-                    pass
-            
-            # Garantir que o nome do arquivo seja único
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            nome_arquivo_grafico = f'situacao_{nome_aba.replace(" ", "_")}_{timestamp}.png'
-            grafico_path = os.path.join(diretorio_graficos, nome_arquivo_grafico)
-            plt.savefig(grafico_path)
-            plt.close()
-            
-            print(f"\nGráfico salvo em: {grafico_path}")
-    except Exception as e:
-        print(f"Erro ao gerar gráfico: {str(e)}")
+    # Dados do gráfico; a renderização é feita em lote por renderizar_graficos
+    if 'SITUACAO' in df.columns:
+        return dados_grafico_situacao(nome_aba, df['SITUACAO'].value_counts().to_dict())
+    return None
+
+def renderizar_graficos(graficos):
+    """
+    Gera os gráficos de situação de vários colaboradores de uma vez.
+    
+    Args:
+        graficos (list): Dados retornados por ``analisar_colaborador``
+    """
+    for caminho in renderizar_graficos_situacao(graficos):
+        if caminho:
+            print(f"Gráfico salvo em: {caminho}")
 
 def listar_colaboradores(nome_arquivo):
     """
@@ -240,7 +213,7 @@ def main():
                 if 0 <= indice < len(colaboradores):
                     nome_aba = colaboradores[indice]
                     df = carregar_dados_colaborador(arquivo_selecionado, nome_aba)
-                    analisar_colaborador(df, nome_aba)
+                    renderizar_graficos([analisar_colaborador(df, nome_aba)])
                 else:
                     print("Índice inválido!")
             except ValueError:
@@ -259,11 +232,16 @@ def main():
                 print("Opção inválida!")
                 continue
             
+            graficos = []
             for arquivo_selecionado, colaboradores in arquivos_selecionados:
                 print(f"\nAnalisando arquivo: {arquivo_selecionado}")
                 for nome_aba in colaboradores:
                     df = carregar_dados_colaborador(arquivo_selecionado, nome_aba)
-                    analisar_colaborador(df, nome_aba)
+                    graficos.append(analisar_colaborador(df, nome_aba))
+            
+            # Todos os gráficos de uma vez, depois da análise
+            print("\nGerando gráficos...")
+            renderizar_graficos(graficos)
         
         elif opcao == "3":
             print("Saindo...")